@@ -23,7 +23,19 @@ else
     touch /srv/logs/access.log
     tail -n 0 -f /srv/logs/*.log &
 
-    # Start Gunicorn processes
+    # Start Gunicorn processes, with Uvicorn workers when serving ASGI
+    if [ "$SERVER_INTERFACE" = "asgi" ] ; then
+        echo Starting Gunicorn with Uvicorn workers
+        exec gunicorn api.core.asgi:application \
+            --worker-class uvicorn.workers.UvicornWorker \
+            --bind 0.0.0.0:8000 \
+            --chdir /usr/src/app/src \
+            --workers 3 \
+            --log-level=info \
+            --log-file=/srv/logs/gunicorn.log \
+            --access-logfile=/srv/logs/access.log
+    fi
+
     echo Starting Gunicorn
     exec gunicorn core.wsgi \
         --bind 0.0.0.0:8000 \
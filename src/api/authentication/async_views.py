@@ -0,0 +1,139 @@
+from asgiref.sync import sync_to_async
+from django.http import HttpRequest, HttpResponse, JsonResponse
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.views import TokenViewBase
+
+from api.authentication import messages
+from api.core.helpers.async_views import async_api_view
+
+from .helpers.settings import api_settings
+from .helpers.throttling import (
+    ResetPasswordRequestCodeThrottle,
+    ResetPasswordThrottle,
+    ResetPasswordValidateCodeThrottle,
+    SigninThrottle,
+)
+from .helpers.tokens import JWTAuthentication
+from .serializers import (
+    RefreshTokenSerializer,
+    ResetPasswordRequestCodeSerializer,
+    ResetPasswordSerializer,
+    ResetPasswordValidateCodeRequestSerializer,
+    ResetPasswordValidateCodeResponseSerializer,
+    SignInSerializer,
+    SignOutSerializer,
+    TokenRefreshSerializer,
+)
+from .use_cases import (
+    ResetPasswordRequestCodeUseCase,
+    ResetPasswordUseCase,
+    ResetPasswordValidateCodeUseCase,
+    SigninUseCase,
+    SignoutUseCase,
+)
+
+
+@async_api_view(
+    ("POST",),
+    authentication_classes=(JWTAuthentication,),
+    throttle_classes=(SigninThrottle,),
+)
+async def signin(request: HttpRequest) -> HttpResponse:
+    """Return access and refresh token for the user if the user's email and password are correct"""
+    serializer = SignInSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    token_data = await SigninUseCase().aexecute(
+        email=serializer.validated_data["email"],
+        password=serializer.validated_data["password"],
+    )
+    return JsonResponse(
+        RefreshTokenSerializer(token_data).data, status=status.HTTP_200_OK
+    )
+
+
+@async_api_view(
+    ("POST",),
+    # Token errors get simplejwt's 401 and challenge instead of a 403
+    authenticate_header='{} realm="{}"'.format(
+        api_settings.AUTH_HEADER_TYPES[0], TokenViewBase.www_authenticate_realm
+    ),
+)
+async def token_refresh(request: HttpRequest) -> HttpResponse:
+    """
+    Takes a refresh type JSON web token and returns an access type JSON web
+    token if the refresh token is valid.
+    """
+    serializer = TokenRefreshSerializer(data=request.data)
+    try:
+        # Validating the token checks and updates the blacklist
+        await sync_to_async(serializer.is_valid)(raise_exception=True)
+    except TokenError as e:
+        raise InvalidToken(e.args[0])
+    return JsonResponse(serializer.validated_data, status=status.HTTP_200_OK)
+
+
+@async_api_view(
+    ("POST",),
+    authentication_classes=(JWTAuthentication,),
+    permission_classes=(IsAuthenticated,),
+)
+async def signout(request: HttpRequest) -> HttpResponse:
+    """Blocklist the refresh_token given in the payload"""
+    serializer = SignOutSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+
+    await SignoutUseCase().aexecute(serializer.data["refresh_token"])
+    return HttpResponse(status=status.HTTP_204_NO_CONTENT)
+
+
+@async_api_view(
+    ("POST",),
+    authentication_classes=(JWTAuthentication,),
+    throttle_classes=(ResetPasswordRequestCodeThrottle,),
+)
+async def reset_password_request_code(request: HttpRequest) -> HttpResponse:
+    """Send a reset password code through the application default messenger (Email/SMS)"""
+    serializer = ResetPasswordRequestCodeSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    await ResetPasswordRequestCodeUseCase().aexecute(
+        email=serializer.validated_data["email"]
+    )
+    return JsonResponse(messages.SUCCESS, status=status.HTTP_200_OK, safe=False)
+
+
+@async_api_view(
+    ("POST",),
+    authentication_classes=(JWTAuthentication,),
+    throttle_classes=(ResetPasswordValidateCodeThrottle,),
+)
+async def reset_password_validate_code(request: HttpRequest) -> HttpResponse:
+    """Return a reset password authentication token if the reset password code is valid"""
+    serializer = ResetPasswordValidateCodeRequestSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    uidb64, token = await ResetPasswordValidateCodeUseCase().aexecute(
+        email=serializer.validated_data["email"],
+        code=serializer.validated_data["code"],
+    )
+    return JsonResponse(
+        ResetPasswordValidateCodeResponseSerializer(
+            {"uidb64": uidb64, "token": token}
+        ).data,
+        status=status.HTTP_200_OK,
+    )
+
+
+@async_api_view(
+    ("POST",),
+    authentication_classes=(JWTAuthentication,),
+    throttle_classes=(ResetPasswordThrottle,),
+)
+async def reset_password(request: HttpRequest, uidb64: str, token: str) -> HttpResponse:
+    """Set a new password to the user if the token is valid"""
+    serializer = ResetPasswordSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    await ResetPasswordUseCase().aexecute(
+        uidb64=uidb64, token=token, password=serializer.validated_data["password"]
+    )
+    return JsonResponse(messages.SUCCESS, status=status.HTTP_200_OK, safe=False)
@@ -0,0 +1,94 @@
+import inspect
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import (
+    _clean_credentials,
+    backends,
+    get_backends,
+    get_user_model,
+)
+from django.contrib.auth.signals import user_login_failed
+from django.core.exceptions import PermissionDenied
+
+from .helpers import hashing
+
+UserModel = get_user_model()
+
+
+class ModelBackend(backends.ModelBackend):
+    """
+    `ModelBackend` that hashes passwords with the calibrated algorithm within
+    the hashing executor's bounds, in its pool when authenticating asynchronously
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return
+        try:
+            user = UserModel._default_manager.get_by_natural_key(username)
+        except UserModel.DoesNotExist:
+            # Run the default password hasher once to reduce the timing
+            # difference between an existing and a nonexistent user
+            hashing.make_password(password)
+        else:
+            if hashing.check_password(user, password) and self.user_can_authenticate(
+                user
+            ):
+                return user
+
+    async def aauthenticate(self, request, username=None, password=None, **kwargs):
+        """
+        Same as `authenticate`, the query runs in Django's sync thread and the
+        hashing is awaited without holding it
+        """
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return
+        try:
+            user = await sync_to_async(UserModel._default_manager.get_by_natural_key)(
+                username
+            )
+        except UserModel.DoesNotExist:
+            await hashing.amake_password(password)
+        else:
+            if await hashing.acheck_password(
+                user, password
+            ) and self.user_can_authenticate(user):
+                return user
+
+
+async def aauthenticate(request=None, **credentials):
+    """
+    Async counterpart of `django.contrib.auth.authenticate`. Backends without
+    `aauthenticate` run in Django's sync thread.
+    """
+    for backend in get_backends():
+        backend_path = f"{backend.__module__}.{backend.__class__.__name__}"
+        try:
+            inspect.getcallargs(backend.authenticate, request, **credentials)
+        except TypeError:
+            # This backend doesn't accept these credentials as arguments
+            continue
+
+        try:
+            if hasattr(backend, "aauthenticate"):
+                user = await backend.aauthenticate(request, **credentials)
+            else:
+                user = await sync_to_async(backend.authenticate)(request, **credentials)
+        except PermissionDenied:
+            # This backend says to stop in our tracks - this user should not
+            # be allowed in at all
+            break
+        if user is None:
+            continue
+        user.backend = backend_path
+        return user
+
+    await sync_to_async(user_login_failed.send)(
+        sender=__name__,
+        credentials=_clean_credentials(credentials),
+        request=request,
+    )
@@ -0,0 +1,33 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.checks import Tags, Warning, register
+
+# Cache backends whose entries aren't seen by the other processes
+PROCESS_LOCAL_CACHES = (LocMemCache, DummyCache)
+
+
+@register(Tags.caches)
+def check_auth_cache(app_configs, **kwargs):
+    """
+    Token revocations are invalidated in the AUTH_CACHE_ALIAS cache and the
+    auth throttling windows are counted there, so outside development and
+    testing it should be shared by every process. It's a warning and not an
+    error so deploys still running on the default locmem cache keep starting
+    """
+    if settings.ENVIRONMENT in ("development", "testing"):
+        return []
+
+    for alias in {settings.AUTH_CACHE_ALIAS, settings.AUTH_THROTTLE_CACHE_ALIAS}:
+        if isinstance(caches[alias], PROCESS_LOCAL_CACHES):
+            return [
+                Warning(
+                    f'The "{alias}" cache is local to each process, so revoked '
+                    "tokens could be accepted and rate limits multiplied by "
+                    "the number of workers.",
+                    hint="Set CACHE_URL to a shared cache, e.g. redis://host:6379/0",
+                    id="authentication.W001",
+                )
+            ]
+    return []
@@ -5,15 +5,32 @@ import pytest
 from django.contrib.auth import get_user_model
 from django.contrib.auth.hashers import make_password
 from django.contrib.auth.tokens import default_token_generator
+from django.core.cache import cache
 from django.utils.encoding import force_bytes
 from django.utils.http import urlsafe_base64_encode
 
+from api.authentication.helpers import user_cache, verified_tokens
+from api.authentication.helpers.blacklist_index import blacklist_index
+from api.authentication.helpers.throttling import rate_limiter
 from api.authentication.helpers.tokens import AccessToken, RefreshToken
 from api.authentication.models import Code
+from api.core.messenger import sms, smtp_pool
 
 User = get_user_model()
 
 
+@pytest.fixture(autouse=True)
+def clear_caches() -> None:
+    """Start every test with empty authentication caches"""
+    cache.clear()
+    user_cache.local_cache.clear()
+    verified_tokens.local_cache.clear()
+    blacklist_index.reset()
+    sms.clear_clients()
+    smtp_pool.pool.close()
+    rate_limiter.clear()
+
+
 @pytest.fixture()
 def make_user(db) -> Callable:
     def _make_user(
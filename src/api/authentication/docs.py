@@ -1,5 +1,5 @@
 from drf_spectacular.types import OpenApiTypes
-from drf_spectacular.utils import OpenApiExample
+from drf_spectacular.utils import OpenApiExample, OpenApiParameter
 from rest_framework import status
 
 from api.authentication import messages
@@ -68,6 +68,13 @@ RESET_PASSWORD_REQUEST_NOT_FOUND_RESPONSE = OpenApiExample(
     status_codes=["404"],
 )
 
+THROTTLED_RESPONSE = OpenApiExample(
+    "Throttled",
+    value={"detail": "Request was throttled. Expected available in 60 seconds."},
+    response_only=True,
+    status_codes=["429"],
+)
+
 
 signup = {
     "request": SignUpSerializer,
@@ -82,10 +89,11 @@ signin = {
     "responses": {
         status.HTTP_200_OK: RefreshTokenSerializer,
         status.HTTP_401_UNAUTHORIZED: OpenApiTypes.OBJECT,
+        status.HTTP_429_TOO_MANY_REQUESTS: OpenApiTypes.OBJECT,
     },
     "summary": "Sign in",
     "tags": [authentication_tag],
-    "examples": [WRONG_CREDENTIALS_RESPONSE],
+    "examples": [WRONG_CREDENTIALS_RESPONSE, THROTTLED_RESPONSE],
 }
 
 signout = {
@@ -100,6 +108,47 @@ signout = {
     "examples": [INVALID_ACCESS_TOKEN_RESPONSE],
 }
 
+signout_all = {
+    "methods": ["POST"],
+    "request": None,
+    "responses": {
+        status.HTTP_204_NO_CONTENT: None,
+        status.HTTP_401_UNAUTHORIZED: OpenApiTypes.OBJECT,
+    },
+    "summary": "Sign out of every session",
+    "tags": [authentication_tag],
+    "examples": [INVALID_ACCESS_TOKEN_RESPONSE],
+}
+
+jwks = {
+    "methods": ["GET"],
+    "responses": {status.HTTP_200_OK: OpenApiTypes.OBJECT},
+    "summary": "Public keys that verify the tokens, as a JSON Web Key Set",
+    "tags": [authentication_tag],
+}
+
+export = {
+    "methods": ["GET"],
+    "parameters": [
+        OpenApiParameter(
+            "dataset",
+            OpenApiTypes.STR,
+            OpenApiParameter.PATH,
+            enum=("users", "codes", "tokens"),
+        ),
+        OpenApiParameter(
+            "output", OpenApiTypes.STR, enum=("ndjson", "csv"), default="ndjson"
+        ),
+    ],
+    "responses": {
+        status.HTTP_200_OK: OpenApiTypes.STR,
+        status.HTTP_400_BAD_REQUEST: OpenApiTypes.OBJECT,
+        status.HTTP_403_FORBIDDEN: OpenApiTypes.OBJECT,
+    },
+    "summary": "Export users, reset codes or refresh tokens (staff only)",
+    "tags": [authentication_tag],
+}
+
 refresh = {
     "methods": ["POST"],
     "request": TokenRefreshSerializer,
@@ -118,12 +167,14 @@ reset_password_request_code = {
     "responses": {
         status.HTTP_200_OK: OpenApiTypes.STR,
         status.HTTP_404_NOT_FOUND: OpenApiTypes.OBJECT,
+        status.HTTP_429_TOO_MANY_REQUESTS: OpenApiTypes.OBJECT,
     },
     "summary": "Reset password request code",
     "tags": [authentication_tag],
     "examples": [
         SUCCESS_RESPONSE,
         NOT_FOUND_RESPONSE,
+        THROTTLED_RESPONSE,
     ],
 }
 
@@ -133,12 +184,14 @@ reset_password_validate_code = {
         status.HTTP_200_OK: ResetPasswordValidateCodeResponseSerializer,
         status.HTTP_403_FORBIDDEN: OpenApiTypes.OBJECT,
         status.HTTP_404_NOT_FOUND: OpenApiTypes.OBJECT,
+        status.HTTP_429_TOO_MANY_REQUESTS: OpenApiTypes.OBJECT,
     },
     "summary": "Reset password validate code",
     "tags": [authentication_tag],
     "examples": [
         INVALID_RESET_PASSWORD_CODE_RESPONSE,
         RESET_PASSWORD_REQUEST_NOT_FOUND_RESPONSE,
+        THROTTLED_RESPONSE,
     ],
 }
 
@@ -147,8 +200,9 @@ reset_password = {
     "responses": {
         status.HTTP_200_OK: OpenApiTypes.STR,
         status.HTTP_401_UNAUTHORIZED: OpenApiTypes.OBJECT,
+        status.HTTP_429_TOO_MANY_REQUESTS: OpenApiTypes.OBJECT,
     },
     "summary": "Reset password",
     "tags": [authentication_tag],
-    "examples": [SUCCESS_RESPONSE, WRONG_CREDENTIALS_RESPONSE],
+    "examples": [SUCCESS_RESPONSE, WRONG_CREDENTIALS_RESPONSE, THROTTLED_RESPONSE],
 }
@@ -0,0 +1,63 @@
+import functools
+import json
+from os.path import exists
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+
+@functools.lru_cache()
+def get_config() -> dict:
+    """
+    Load the hasher parameters written by the `calibrate_password_hashers`
+    command, an empty config keeps Django's defaults
+    """
+    if not exists(settings.PASSWORD_HASHERS_CONFIG):
+        return {}
+    with open(settings.PASSWORD_HASHERS_CONFIG) as config_file:
+        return json.load(config_file)
+
+
+def get_preferred_algorithm() -> str:
+    """Get the algorithm new passwords are hashed with"""
+    return get_config().get("algorithm", "default")
+
+
+@receiver(setting_changed)
+def reset_config(**kwargs):
+    if kwargs["setting"] == "PASSWORD_HASHERS_CONFIG":
+        get_config.cache_clear()
+        hashers.reset_hashers(setting="PASSWORD_HASHERS")
+
+
+class CalibratedHasherMixin:
+    """Overrides the hasher's cost parameters with the calibrated ones"""
+
+    calibrated_parameters = ()
+
+    def __init__(self):
+        super().__init__()
+        parameters = get_config().get("hashers", {}).get(self.algorithm, {})
+        for name in self.calibrated_parameters:
+            if name in parameters:
+                setattr(self, name, parameters[name])
+
+
+class CalibratedPBKDF2PasswordHasher(
+    CalibratedHasherMixin, hashers.PBKDF2PasswordHasher
+):
+    calibrated_parameters = ("iterations",)
+
+
+class CalibratedScryptPasswordHasher(
+    CalibratedHasherMixin, hashers.ScryptPasswordHasher
+):
+    calibrated_parameters = ("work_factor", "block_size", "parallelism", "maxmem")
+
+
+class CalibratedArgon2PasswordHasher(
+    CalibratedHasherMixin, hashers.Argon2PasswordHasher
+):
+    calibrated_parameters = ("time_cost", "memory_cost", "parallelism")
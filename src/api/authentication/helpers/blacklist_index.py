@@ -0,0 +1,145 @@
+import hashlib
+import math
+import threading
+import time
+from datetime import timedelta
+from typing import List
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+# Rows are polled past a high-water mark, but ids are handed out before their
+# transaction commits, so a row may become visible after a higher id did. The
+# mark only moves past rows older than this many seconds, younger ones are
+# polled again until no late commit can show up before them.
+SETTLE_WINDOW = 10
+LOAD_CHUNK_SIZE = 10000
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter of strings"""
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.size = max(
+            8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        )
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _get_positions(self, item: str) -> List[int]:
+        """Derive the item's bit positions from a single digest (double hashing)"""
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return [(first + i * second) % self.size for i in range(self.hash_count)]
+
+    def add(self, item: str) -> None:
+        for position in self._get_positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._get_positions(item)
+        )
+
+
+class BlacklistIndex:
+    """
+    Per-process index of blacklisted refresh token JTIs. A negative answer is
+    definitive, a positive one must be confirmed against the blacklist table.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._filter = None
+        self._settled_mark = 0
+        self._recent_ids = set()
+        self._polled_at = 0.0
+
+    def _get_rows(self, **filters):
+        return (
+            BlacklistedToken.objects.filter(**filters)
+            .order_by("id")
+            .values_list("id", "token__jti", "blacklisted_at")
+        )
+
+    def _add_rows(self, rows) -> None:
+        """
+        Add rows to the filter and move the high-water mark past every row that
+        can no longer be preceded by a late commit
+        """
+        settled_before = timezone.now() - timedelta(seconds=SETTLE_WINDOW)
+        for row_id, jti, blacklisted_at in rows:
+            if row_id not in self._recent_ids:
+                self._filter.add(jti)
+            if blacklisted_at < settled_before:
+                self._settled_mark = max(self._settled_mark, row_id)
+            else:
+                self._recent_ids.add(row_id)
+
+        self._recent_ids = {
+            row_id for row_id in self._recent_ids if row_id > self._settled_mark
+        }
+        self._polled_at = time.monotonic()
+
+    def _load(self) -> None:
+        """Build a new filter from the blacklisted tokens that haven't expired yet"""
+        rows = self._get_rows(token__expires_at__gt=timezone.now())
+        capacity = max(settings.BLACKLIST_INDEX_CAPACITY, rows.count() * 2)
+
+        self._filter = BloomFilter(capacity, settings.BLACKLIST_INDEX_ERROR_RATE)
+        self._settled_mark = 0
+        self._recent_ids = set()
+        self._add_rows(rows.iterator(chunk_size=LOAD_CHUNK_SIZE))
+
+    def _poll(self) -> None:
+        """Add the rows blacklisted since the last poll"""
+        self._add_rows(self._get_rows(id__gt=self._settled_mark))
+
+        # Rebuild once full, which also drops the tokens that expired since
+        if self._filter.count > self._filter.capacity:
+            self._load()
+
+    def _refresh(self) -> BloomFilter:
+        """Load the index on first use and poll for new rows once per interval"""
+        with self._lock:
+            if self._filter is None:
+                self._load()
+            elif (
+                time.monotonic() - self._polled_at
+                >= settings.BLACKLIST_INDEX_POLL_INTERVAL.total_seconds()
+            ):
+                self._poll()
+            return self._filter
+
+    def add(self, jti: str) -> None:
+        """
+        Add a token blacklisted by this process without waiting for the next poll
+        Params:
+            jti: The blacklisted token's id
+        """
+        with self._lock:
+            if self._filter is not None:
+                self._filter.add(jti)
+
+    def might_contain(self, jti: str) -> bool:
+        """
+        Check if the token may have been blacklisted
+        Params:
+            jti: The token's id
+        Returns: False if the token is certainly not blacklisted
+        """
+        return jti in self._refresh()
+
+    def reset(self) -> None:
+        """Drop the index, it's loaded again on next use"""
+        with self._lock:
+            self._filter = None
+
+
+blacklist_index = BlacklistIndex()
@@ -0,0 +1,68 @@
+from typing import Any, Iterable
+
+from django.contrib.auth import get_user_model
+
+from .settings import api_settings
+
+User = get_user_model()
+
+
+class ClaimsUser:
+    """
+    Lightweight, read-only user built from the claims embedded in a token by
+    `Token.for_user`, so it can be authenticated without any query
+    """
+
+    __slots__ = ("token", *api_settings.USER_CLAIM_FIELDS)
+
+    is_active = True
+    is_staff = False
+    is_superuser = False
+    is_anonymous = False
+    is_authenticated = True
+
+    def __init__(self, token: Any):
+        self.token = token
+        claims = token[api_settings.USER_CLAIM]
+        for field in api_settings.USER_CLAIM_FIELDS:
+            setattr(self, field, claims.get(field))
+
+        # Claims are serialized as strings, the id is restored to the model's type
+        id_field = User._meta.get_field(api_settings.USER_ID_FIELD)
+        setattr(
+            self,
+            api_settings.USER_ID_FIELD,
+            id_field.to_python(claims[api_settings.USER_ID_FIELD]),
+        )
+
+    def __str__(self):
+        return str(self.get_username())
+
+    def __eq__(self, other):
+        return isinstance(other, self.__class__) and self.pk == other.pk
+
+    def __hash__(self):
+        return hash(self.pk)
+
+    @property
+    def pk(self) -> Any:
+        return getattr(self, api_settings.USER_ID_FIELD)
+
+    def get_username(self) -> str:
+        return getattr(self, User.USERNAME_FIELD, None) or str(self.pk)
+
+    def has_perm(self, perm: str, obj: Any = None) -> bool:
+        "Claims don't carry permissions, so none is granted"
+        return False
+
+    def has_perms(self, perm_list: Iterable[str], obj: Any = None) -> bool:
+        return all(self.has_perm(perm, obj) for perm in perm_list)
+
+    def has_module_perms(self, app_label: str) -> bool:
+        return False
+
+    def save(self):
+        raise NotImplementedError("Token users have no DB representation")
+
+    def delete(self):
+        raise NotImplementedError("Token users have no DB representation")
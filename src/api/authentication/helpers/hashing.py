@@ -0,0 +1,276 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.contrib.auth.base_user import AbstractBaseUser
+from django.db import connection
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from api.authentication import messages
+from api.authentication.hashers import get_preferred_algorithm
+from api.core.helpers import metrics
+
+
+class HashingUnavailable(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = messages.HASHING_UNAVAILABLE
+    default_code = "hashing_unavailable"
+
+
+class HashingExecutor:
+    """
+    Bounds the password hashing of a process: at most `max_workers` hashes run
+    at once and `max_queue_size` more wait, the rest are rejected. Async views
+    hash in its thread pool, as hashlib's PBKDF2 and scrypt, as well as
+    argon2-cffi, release the GIL, so hashes don't block the event loop. Sync
+    views hash in their own thread within the same bounds, so a burst of
+    signins can't take every worker thread either.
+    """
+
+    def __init__(self, max_workers: int, max_queue_size: int):
+        self.max_workers = max_workers
+        self.max_queue_size = max_queue_size
+        self.reset()
+
+    def reset(self) -> None:
+        """Drop the pool and the counters, e.g. in a freshly forked process"""
+        self._executor = None
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.max_workers + self.max_queue_size)
+        self._workers = threading.BoundedSemaphore(self.max_workers)
+        self.queued = 0
+        self.running = 0
+        self.submitted = 0
+        self.rejected = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="password-hashing"
+                )
+            return self._executor
+
+    def _admit(self) -> float:
+        """
+        Take a slot for a hash, it's queued until a worker is free
+        Returns: When the hash was admitted
+        Raises: HashingUnavailable when the queue is full
+        """
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise HashingUnavailable()
+
+        with self._lock:
+            self.submitted += 1
+            self.queued += 1
+        return time.monotonic()
+
+    @contextmanager
+    def _running(self, admitted_at: float) -> Iterator[None]:
+        """Wait for a free worker, then hold it and the slot while hashing"""
+        self._workers.acquire()
+        wait_time = time.monotonic() - admitted_at
+        with self._lock:
+            self.queued -= 1
+            self.running += 1
+            self.wait_time_total += wait_time
+            self.wait_time_max = max(self.wait_time_max, wait_time)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.running -= 1
+            self._workers.release()
+            self._slots.release()
+
+    def submit(self, fn: Callable, *args: Any, **kwargs: Any) -> Future:
+        """
+        Schedule the hashing function in the pool
+        Params:
+            fn: The hashing function
+        Returns: The future of the function's result
+        Raises: HashingUnavailable when the queue is full
+        """
+        admitted_at = self._admit()
+
+        def run() -> Any:
+            with self._running(admitted_at):
+                return fn(*args, **kwargs)
+
+        try:
+            return self._get_executor().submit(run)
+        except Exception:
+            with self._lock:
+                self.queued -= 1
+            self._slots.release()
+            raise
+
+    def run(self, fn: Callable, *args: Any, **kwargs: Any) -> Any:
+        """
+        Run the hashing function in the calling thread, once a worker is free
+        Params:
+            fn: The hashing function
+        Returns: The function's result
+        Raises: HashingUnavailable when the queue is full
+        """
+        with self._running(self._admit()):
+            return fn(*args, **kwargs)
+
+    @property
+    def stats(self) -> dict:
+        """Get the pool's queue depth and wait time metrics"""
+        with self._lock:
+            started = self.submitted - self.queued
+            return {
+                "workers": self.max_workers,
+                "max_queue_size": self.max_queue_size,
+                "queued": self.queued,
+                "running": self.running,
+                "submitted": self.submitted,
+                "rejected": self.rejected,
+                "wait_time_avg_ms": (
+                    self.wait_time_total / started * 1000 if started else 0.0
+                ),
+                "wait_time_max_ms": self.wait_time_max * 1000,
+            }
+
+
+executor = HashingExecutor(
+    max_workers=settings.PASSWORD_HASHING_WORKERS,
+    max_queue_size=settings.PASSWORD_HASHING_QUEUE_SIZE,
+)
+
+# Pool threads don't survive a fork, e.g. gunicorn's --preload
+os.register_at_fork(after_in_child=executor.reset)
+metrics.register("password_hashing", lambda: executor.stats)
+
+
+def make_password(password: str) -> str:
+    """
+    Hash the password with the calibrated algorithm in the calling thread,
+    within the hashing executor's bounds
+    Params:
+        password: The raw password
+    Returns: The encoded password
+    """
+    return executor.run(
+        hashers.make_password, password, None, get_preferred_algorithm()
+    )
+
+
+async def amake_password(password: str) -> str:
+    """Same as `make_password`, awaiting the hashing executor"""
+    return await asyncio.wrap_future(
+        executor.submit(
+            hashers.make_password, password, None, get_preferred_algorithm()
+        )
+    )
+
+
+def set_password(user: AbstractBaseUser, raw_password: str) -> None:
+    """
+    Same as `AbstractBaseUser.set_password`, with the calibrated algorithm
+    Params:
+        user: The user that will have the password set
+        raw_password: The raw password
+    """
+    user.password = make_password(raw_password)
+    user._password = raw_password
+
+
+async def aset_password(user: AbstractBaseUser, raw_password: str) -> None:
+    """Same as `set_password`, awaiting the hashing executor"""
+    user.password = await amake_password(raw_password)
+    user._password = raw_password
+
+
+def _upgrade_password(user: AbstractBaseUser, encoded: str, raw_password: str) -> None:
+    """
+    Store a new hash of the password unless it was changed since it was checked
+    Params:
+        user: The user whose password is upgraded
+        encoded: The outdated hash
+        raw_password: The raw password
+    """
+    from api.authentication.helpers import user_cache
+    from api.authentication.helpers.settings import api_settings
+
+    try:
+        updated = (
+            type(user)
+            ._default_manager.filter(pk=user.pk, password=encoded)
+            .update(
+                password=hashers.make_password(
+                    raw_password, None, get_preferred_algorithm()
+                )
+            )
+        )
+        if updated:
+            user_cache.invalidate_user(getattr(user, api_settings.USER_ID_FIELD))
+    finally:
+        # Pool threads aren't request threads, nothing else closes their connection
+        connection.close()
+
+
+def _schedule_upgrade(user: AbstractBaseUser, raw_password: str) -> None:
+    """Upgrade the password hash in the background"""
+    try:
+        executor.submit(_upgrade_password, user, user.password, raw_password)
+    except HashingUnavailable:
+        # The signin isn't failed for it, the next one upgrades the hash
+        pass
+
+
+def check_password(user: AbstractBaseUser, raw_password: str) -> bool:
+    """
+    Same as `AbstractBaseUser.check_password`, within the hashing executor's
+    bounds. Hashes made with outdated parameters or algorithms are upgraded in
+    the background, so the request doesn't wait for the second hash.
+    Params:
+        user: The user whose password is checked
+        raw_password: The raw password
+    Returns: Whether the password is correct
+    """
+    must_update = []
+    is_correct = executor.run(
+        hashers.check_password,
+        raw_password,
+        user.password,
+        must_update.append,
+        get_preferred_algorithm(),
+    )
+
+    if is_correct and must_update:
+        _schedule_upgrade(user, raw_password)
+
+    return is_correct
+
+
+async def acheck_password(user: AbstractBaseUser, raw_password: str) -> bool:
+    """Same as `check_password`, awaiting the hashing executor"""
+    must_update = []
+    is_correct = await asyncio.wrap_future(
+        executor.submit(
+            hashers.check_password,
+            raw_password,
+            user.password,
+            must_update.append,
+            get_preferred_algorithm(),
+        )
+    )
+
+    if is_correct and must_update:
+        _schedule_upgrade(user, raw_password)
+
+    return is_correct
@@ -0,0 +1,109 @@
+import json
+import threading
+import time
+import urllib.request
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import jwt
+
+
+def fetch_jwks(url: str, timeout: float = 5.0) -> dict:
+    """Download a JSON Web Key Set"""
+    with urllib.request.urlopen(url, timeout=timeout) as response:
+        return json.load(response)
+
+
+class JWKSVerifier:
+    """
+    Verifies tokens locally with the public keys served by the JWKS endpoint.
+    Parsed keys are kept in memory and the key set is fetched again once it's
+    older than `max_age`, or when a token names an unknown `kid` (a key was
+    rotated in), at most once per `min_refresh_interval`. Only depends on
+    PyJWT and cryptography, so other services can vendor it.
+
+    Usage:
+        verifier = JWKSVerifier("https://api.example.com/auth/.well-known/jwks.json")
+        payload = verifier.verify(token)
+    """
+
+    def __init__(
+        self,
+        url: str,
+        max_age: float = 600,
+        min_refresh_interval: float = 30,
+        audience: Optional[str] = None,
+        issuer: Optional[str] = None,
+        leeway: float = 0,
+        fetch: Callable[[str], dict] = fetch_jwks,
+    ):
+        self.url = url
+        self.max_age = max_age
+        self.min_refresh_interval = min_refresh_interval
+        self.audience = audience
+        self.issuer = issuer
+        self.leeway = leeway
+        self._fetch = fetch
+        self._keys: Dict[str, Tuple[str, Any]] = {}
+        self._fetched_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def _refresh(self, force: bool = False) -> None:
+        """Fetch the key set if it's stale, or on `force` unless it was just fetched"""
+        with self._lock:
+            now = time.monotonic()
+            if self._fetched_at is not None:
+                age = now - self._fetched_at
+                if age < (self.min_refresh_interval if force else self.max_age):
+                    return
+
+            keys = {}
+            for jwk in self._fetch(self.url).get("keys", []):
+                try:
+                    keys[jwk["kid"]] = (jwk["alg"], jwt.PyJWK(jwk).key)
+                except (KeyError, jwt.PyJWKError, jwt.InvalidKeyError):
+                    # Keys of unsupported types can't verify anything, the
+                    # others are still usable
+                    continue
+            self._keys = keys
+            self._fetched_at = now
+
+    def get_key(self, kid: str) -> Tuple[str, Any]:
+        """
+        Get the parsed public key
+        Params:
+            kid: The key id
+        Returns: The key's algorithm and the key
+        Raises: InvalidTokenError if the key set doesn't have the key
+        """
+        self._refresh()
+        key = self._keys.get(kid)
+        if key is None:
+            self._refresh(force=True)
+            key = self._keys.get(kid)
+        if key is None:
+            raise jwt.InvalidTokenError(f"Unknown signing key '{kid}'")
+        return key
+
+    def verify(self, token: str) -> Dict[str, Any]:
+        """
+        Verify the token's signature and claims
+        Params:
+            token: The encoded token
+        Returns: The token's payload
+        Raises: InvalidTokenError if the token isn't valid
+        """
+        kid = jwt.get_unverified_header(token).get("kid")
+        if kid is None:
+            raise jwt.InvalidTokenError("Token has no key id")
+
+        algorithm, key = self.get_key(kid)
+        return jwt.decode(
+            token,
+            key,
+            # The algorithm is the key's, never the one the token claims
+            algorithms=[algorithm],
+            audience=self.audience,
+            issuer=self.issuer,
+            leeway=self.leeway,
+            options={"verify_aud": self.audience is not None},
+        )
@@ -0,0 +1,242 @@
+import functools
+import secrets
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Optional
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.db import connection, transaction
+from django.db.models import QuerySet
+from django.dispatch import receiver
+from django.utils import timezone
+from django.utils.crypto import constant_time_compare, salted_hmac
+from django.utils.module_loading import import_string
+from rest_framework.exceptions import NotFound, PermissionDenied
+
+from api.authentication.managers import email_iexact
+from api.authentication.messages import (
+    RESET_PASSWORD_REQUEST_NOT_FOUND,
+    RESET_PASSWORD_SUBMIT_INVALID_CODE,
+)
+from api.authentication.models import Code
+
+User = get_user_model()
+
+
+def _can_return_rows_from_update() -> bool:
+    """Check if the database supports UPDATE ... RETURNING"""
+    if connection.vendor == "postgresql":
+        return True
+    return connection.vendor == "sqlite" and sqlite3.sqlite_version_info >= (3, 35)
+
+
+class BaseResetCodeBackend(ABC):
+    @abstractmethod
+    def make_code(self, user: User) -> str:
+        """
+        Issue a reset password code for the user
+        Params:
+            user: The user that will have its password reseted
+        Returns: The six digit code
+        """
+        pass
+
+    @abstractmethod
+    def consume_code(self, email: str, code: str) -> User:
+        """
+        Check the reset password code of the user with the email
+        Params:
+            email: The email of the user that will have its password reseted
+            code: The code that was sent through Email / SMS
+        Returns: The user the code was issued to
+        Raises: NotFound when there's no such code and PermissionDenied when
+            it can't be used anymore
+        """
+        pass
+
+
+class ModelResetCodeBackend(BaseResetCodeBackend):
+    """Stores each code in a `Code` row that's used once"""
+
+    def make_code(self, user: User) -> str:
+        return Code.objects.create(
+            user=user, type=Code.RESET_PASSWORD_REQUEST_TYPE
+        ).code
+
+    def filter_requests(self, email: str, code: str) -> QuerySet:
+        """
+        Filter the reset password requests by their email, whatever its case,
+        and code, the lookup `Code`'s `code_lookup_idx` index covers
+        Params:
+            email: the reset password request user's email
+            code: the reset password request code
+        Returns: The Reset password requests with matching user and code, latest first
+        """
+        return Code.objects.filter(
+            email_iexact(email, "user__email"),
+            code=code,
+            type=Code.RESET_PASSWORD_REQUEST_TYPE,
+        )
+
+    def get_request(self, email: str, code: str) -> Code:
+        """
+        Get The reset password request by its email and code
+        Params:
+            email: the reset password request user's email
+            code: the reset password request code
+        Returns: The Reset password request with matching user and code
+        """
+        reset_password_request = self.filter_requests(email, code).first()
+        if not reset_password_request:
+            raise NotFound(RESET_PASSWORD_REQUEST_NOT_FOUND)
+        if not reset_password_request.is_eligible_for_reset:
+            raise PermissionDenied(RESET_PASSWORD_SUBMIT_INVALID_CODE)
+        return reset_password_request
+
+    def set_request_used(self, reset_password_request: Code) -> Code:
+        """
+        Set password request as used
+        Params:
+            reset_password_request: the reset password request
+        Returns: The updated reset_password_request instance
+        """
+        reset_password_request.was_used = True
+        reset_password_request.save(update_fields=("was_used", "modified"))
+        return reset_password_request
+
+    def consume_request(self, email: str, code: str) -> Optional[Any]:
+        """
+        Set the latest reset password request matching the email and code as used
+        if it's eligible for reset, in a single conditional UPDATE ... RETURNING so
+        concurrent requests can't both consume it
+        Params:
+            email: the reset password request user's email
+            code: the reset password request code
+        Returns: The id of the request's user or None when no eligible request was used
+        """
+        reset_password_requests = self.filter_requests(email, code)
+        if not _can_return_rows_from_update():
+            with transaction.atomic():
+                reset_password_request = (
+                    reset_password_requests.select_for_update().first()
+                )
+                if (
+                    reset_password_request is None
+                    or not reset_password_request.is_eligible_for_reset
+                ):
+                    return None
+                self.set_request_used(reset_password_request)
+                return reset_password_request.user_id
+
+        latest_request = reset_password_requests.values("pk")[:1]
+        latest_sql, latest_params = latest_request.query.sql_with_params()
+        quote_name = connection.ops.quote_name
+        field_columns = {
+            field: quote_name(Code._meta.get_field(field).column)
+            for field in ("id", "user", "was_used", "created", "modified")
+        }
+        sql = (
+            f"UPDATE {quote_name(Code._meta.db_table)} "
+            f"SET {field_columns['was_used']} = %s, {field_columns['modified']} = %s "
+            f"WHERE {field_columns['id']} = ({latest_sql}) "
+            f"AND {field_columns['was_used']} = %s AND {field_columns['created']} > %s "
+            f"RETURNING {field_columns['user']}"
+        )
+        now = timezone.now()
+        params = (
+            True,
+            connection.ops.adapt_datetimefield_value(now),
+            *latest_params,
+            False,
+            connection.ops.adapt_datetimefield_value(
+                now - settings.FORGOT_TIME_EXPIRATION_TIME
+            ),
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            row = cursor.fetchone()
+        return row[0] if row else None
+
+    def consume_code(self, email: str, code: str) -> User:
+        user_id = self.consume_request(email, code)
+        if user_id is None:
+            # Tell a missing code from a used or expired one
+            self.get_request(email, code)
+            raise PermissionDenied(RESET_PASSWORD_SUBMIT_INVALID_CODE)
+        return User.objects.get(pk=user_id)
+
+
+class HMACResetCodeBackend(BaseResetCodeBackend):
+    """
+    Derives the code from an HMAC over the user's id, password hash, last login,
+    a nonce and a time bucket of `FORGOT_TIME_EXPIRATION_TIME`, like Django's
+    `default_token_generator`, so no row is written to issue or check one.
+    The nonce is kept in the auth cache until the code expires and is dropped
+    once the code is used, so only the latest requested code is accepted, once.
+    """
+
+    key_salt = "api.authentication.helpers.reset_codes.HMACResetCodeBackend"
+    nonce_key = "auth:reset-code-nonce:{}"
+
+    def _get_cache(self):
+        return caches[settings.AUTH_CACHE_ALIAS]
+
+    def _get_bucket(self, timestamp: float) -> int:
+        return int(timestamp // settings.FORGOT_TIME_EXPIRATION_TIME.total_seconds())
+
+    def _make_code(self, user: User, nonce: str, bucket: int) -> str:
+        login_timestamp = (
+            ""
+            if user.last_login is None
+            else user.last_login.replace(microsecond=0, tzinfo=None)
+        )
+        value = f"{user.pk}{user.password}{login_timestamp}{user.email}{nonce}{bucket}"
+        digest = salted_hmac(self.key_salt, value, algorithm="sha256").digest()
+        return f"{int.from_bytes(digest[:8], 'big') % 10 ** 6:06d}"
+
+    def make_code(self, user: User) -> str:
+        nonce = secrets.token_hex(16)
+        self._get_cache().set(
+            self.nonce_key.format(user.pk),
+            nonce,
+            timeout=settings.FORGOT_TIME_EXPIRATION_TIME.total_seconds(),
+        )
+        return self._make_code(user, nonce, self._get_bucket(time.time()))
+
+    def consume_code(self, email: str, code: str) -> User:
+        try:
+            user = User.objects.get_by_email(email)
+        except User.DoesNotExist:
+            raise NotFound(RESET_PASSWORD_REQUEST_NOT_FOUND)
+
+        cache = self._get_cache()
+        nonce_key = self.nonce_key.format(user.pk)
+        nonce = cache.get(nonce_key)
+        if nonce is not None:
+            # The code's bucket is the current one or, across a bucket boundary,
+            # the previous one
+            current_bucket = self._get_bucket(time.time())
+            for bucket in (current_bucket, current_bucket - 1):
+                # Deleting the nonce tells which of concurrent requests used it
+                if constant_time_compare(
+                    self._make_code(user, nonce, bucket), code
+                ) and cache.delete(nonce_key):
+                    return user
+        # Expired or used codes can't be told from wrong ones
+        raise NotFound(RESET_PASSWORD_REQUEST_NOT_FOUND)
+
+
+@functools.lru_cache()
+def get_reset_code_backend() -> BaseResetCodeBackend:
+    """Get the configured `RESET_PASSWORD_CODE_BACKEND`"""
+    return import_string(settings.RESET_PASSWORD_CODE_BACKEND)()
+
+
+@receiver(setting_changed)
+def _reset_backend(setting: str, **kwargs: Any) -> None:
+    if setting == "RESET_PASSWORD_CODE_BACKEND":
+        get_reset_code_backend.cache_clear()
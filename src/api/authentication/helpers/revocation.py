@@ -0,0 +1,126 @@
+from typing import Any, Iterable, Optional, Tuple
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+
+from .settings import api_settings
+
+# Whether the user's tokens are revoked, and the watermark before which they are
+REVOCATION_KEY = "auth:revocation:v2:{}"
+
+# The revocation state of a user, as (revoked, tokens valid after timestamp)
+RevocationState = Tuple[bool, Optional[float]]
+
+User = get_user_model()
+
+
+def _get_cache():
+    return caches[settings.AUTH_CACHE_ALIAS]
+
+
+def _get_timeout() -> float:
+    """
+    Get how long a revocation state can be cached: it's invalidated on every
+    change, this only bounds how long an entry missed by an invalidation lives
+    """
+    return (
+        api_settings.REFRESH_TOKEN_LIFETIME + api_settings.ACCESS_TOKEN_LIFETIME
+    ).total_seconds()
+
+
+def invalidate_user(user_id: Any) -> None:
+    """
+    Drop the user's cached revocation state, e.g. when the user is deactivated,
+    deleted or signed out everywhere
+    Params:
+        user_id: The value of the user's `USER_ID_FIELD`
+    """
+    invalidate_users([user_id])
+
+
+def invalidate_users(user_ids: Iterable[Any]) -> None:
+    """
+    Drop the cached revocation state of many users in a single cache round trip
+    Params:
+        user_ids: The values of the users' `USER_ID_FIELD`
+    """
+    _get_cache().delete_many([REVOCATION_KEY.format(user_id) for user_id in user_ids])
+
+
+def _load_state(user_id: Any) -> RevocationState:
+    """
+    Read the user's revocation state from the database. The user cache isn't
+    used, its per-process tier could still hold the user as it was before a
+    deactivation, which would then be cached here for the whole timeout.
+    Params:
+        user_id: The value of the user's `USER_ID_FIELD`
+    Returns: The revocation state, revoked when the user doesn't exist
+    """
+    row = (
+        User.objects.filter(**{api_settings.USER_ID_FIELD: user_id})
+        .values_list("is_active", "tokens_valid_after")
+        .first()
+    )
+    if row is None:
+        return True, None
+
+    is_active, tokens_valid_after = row
+    return (
+        not is_active,
+        tokens_valid_after.timestamp() if tokens_valid_after else None,
+    )
+
+
+def get_state(user_id: Any) -> RevocationState:
+    """
+    Get the user's revocation state, reading it from the user row when it isn't
+    cached, so a missing or evicted entry never lets a revoked token through
+    Params:
+        user_id: The value of the user's `USER_ID_FIELD`
+    Returns: The revocation state
+    """
+    cache = _get_cache()
+    key = REVOCATION_KEY.format(user_id)
+    state = cache.get(key)
+    if state is None:
+        state = _load_state(user_id)
+        # Added rather than set, so a state read before a concurrent change
+        # can't overwrite the one cached after it
+        cache.add(key, state, timeout=_get_timeout())
+    return state
+
+
+def was_issued_before(token: Any, valid_after: Optional[float]) -> bool:
+    """
+    Compare the token's issue time with a revocation watermark
+    Params:
+        token: The validated token
+        valid_after: The watermark timestamp, if any
+    Returns: Whether the token was issued before the watermark
+    """
+    if valid_after is None:
+        return False
+
+    # "iat" is in whole seconds, so a token issued during the same second as
+    # the watermark is revoked too
+    issued_at = token.get("iat")
+    return issued_at is None or issued_at < valid_after
+
+
+def is_token_revoked(token: Any) -> bool:
+    """
+    Check whether the token's user was deactivated or deleted, or had its tokens
+    revoked after the token was issued. It's a single cache round trip unless
+    the user's state isn't cached.
+    Params:
+        token: The validated token
+    Returns: Whether the token was revoked
+    """
+    try:
+        user_id = token[api_settings.USER_CLAIM][api_settings.USER_ID_FIELD]
+    except KeyError:
+        return False
+
+    revoked, valid_after = get_state(user_id)
+    return revoked or was_issued_before(token, valid_after)
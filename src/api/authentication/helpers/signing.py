@@ -0,0 +1,216 @@
+import json
+import threading
+from typing import Dict, List, Optional
+
+import jwt
+from cryptography.hazmat.primitives.asymmetric import ec
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.translation import gettext_lazy as _
+from jwt.algorithms import get_default_algorithms
+from jwt.utils import base64url_encode
+from rest_framework_simplejwt import state
+from rest_framework_simplejwt.backends import TokenBackend
+from rest_framework_simplejwt.exceptions import TokenBackendError
+
+from .settings import api_settings
+
+ASYMMETRIC_ALGORITHMS = ("RS256", "RS384", "RS512", "ES256", "ES384", "EdDSA")
+EC_CURVES = {"secp256r1": "P-256", "secp384r1": "P-384", "secp521r1": "P-521"}
+
+
+def _get_ec_jwk(public_key: ec.EllipticCurvePublicKey) -> dict:
+    """PyJWT 2.1 can't export EC keys as JSON Web Keys"""
+    numbers = public_key.public_numbers()
+    size = (public_key.curve.key_size + 7) // 8
+    return {
+        "kty": "EC",
+        "crv": EC_CURVES[public_key.curve.name],
+        "x": base64url_encode(numbers.x.to_bytes(size, "big")).decode(),
+        "y": base64url_encode(numbers.y.to_bytes(size, "big")).decode(),
+    }
+
+
+class SigningKey:
+    """A key of the keyring, with its private part only while it can sign"""
+
+    def __init__(
+        self,
+        kid: str,
+        algorithm: str,
+        private_key: Optional[str] = None,
+        public_key: Optional[str] = None,
+    ):
+        if algorithm not in ASYMMETRIC_ALGORITHMS:
+            raise TokenBackendError(
+                _("Unrecognized algorithm type '{}'").format(algorithm)
+            )
+        if not private_key and not public_key:
+            raise TokenBackendError(_("Key '{}' has no key material").format(kid))
+
+        self.kid = kid
+        self.algorithm = algorithm
+        self._algorithm = get_default_algorithms()[algorithm]
+        self.private_key = (
+            self._algorithm.prepare_key(private_key) if private_key else None
+        )
+        self.public_key = (
+            self._algorithm.prepare_key(public_key)
+            if public_key
+            else self.private_key.public_key()
+        )
+
+    def to_jwk(self) -> dict:
+        """Get the public key as a JSON Web Key"""
+        if isinstance(self.public_key, ec.EllipticCurvePublicKey):
+            jwk = _get_ec_jwk(self.public_key)
+        else:
+            jwk = json.loads(self._algorithm.to_jwk(self.public_key))
+        jwk.update({"kid": self.kid, "alg": self.algorithm, "use": "sig"})
+        return jwk
+
+
+class KeyringTokenBackend(TokenBackend):
+    """
+    Signs tokens with the active key of the keyring, adding its id as the `kid`
+    header, and verifies them with the key their `kid` names. Keys stay in the
+    keyring after being rotated out, so tokens they signed remain valid until
+    they expire. Tokens without a `kid` were signed with the HMAC `SIGNING_KEY`.
+    """
+
+    def __init__(
+        self,
+        keys: List[SigningKey],
+        active_key_id: Optional[str] = None,
+        hmac_key: Optional[str] = None,
+        audience=None,
+        issuer=None,
+        leeway=0,
+    ):
+        self.keys: Dict[str, SigningKey] = {key.kid: key for key in keys}
+        self.active_key = self.keys.get(active_key_id)
+        if self.active_key is None or self.active_key.private_key is None:
+            raise TokenBackendError(_("The active signing key must have a private key"))
+
+        self.algorithm = self.active_key.algorithm
+        self.signing_key = self.active_key.private_key
+        self.verifying_key = None
+        self.hmac_key = hmac_key
+        self.audience = audience
+        self.issuer = issuer
+        self.jwks_client = None
+        self.leeway = leeway
+
+    def encode(self, payload: dict) -> str:
+        """
+        Returns an encoded token for the given payload dictionary, signed with
+        the active key.
+        """
+        jwt_payload = payload.copy()
+        if self.audience is not None:
+            jwt_payload["aud"] = self.audience
+        if self.issuer is not None:
+            jwt_payload["iss"] = self.issuer
+
+        return jwt.encode(
+            jwt_payload,
+            self.active_key.private_key,
+            algorithm=self.active_key.algorithm,
+            headers={"kid": self.active_key.kid},
+        )
+
+    def decode(self, token: str, verify: bool = True) -> dict:
+        """
+        Performs a validation of the given token with the key named by its `kid`
+        header and returns its payload dictionary.
+        """
+        try:
+            kid = jwt.get_unverified_header(token).get("kid")
+        except jwt.InvalidTokenError:
+            raise TokenBackendError(_("Token is invalid or expired"))
+
+        if kid is None:
+            if not self.hmac_key:
+                raise TokenBackendError(_("Token is invalid or expired"))
+            key, algorithm = self.hmac_key, api_settings.ALGORITHM
+        else:
+            try:
+                signing_key = self.keys[kid]
+            except KeyError:
+                raise TokenBackendError(_("Token is invalid or expired"))
+            key, algorithm = signing_key.public_key, signing_key.algorithm
+
+        try:
+            return jwt.decode(
+                token,
+                key,
+                algorithms=[algorithm],
+                audience=self.audience,
+                issuer=self.issuer,
+                leeway=self.leeway,
+                options={
+                    "verify_aud": self.audience is not None,
+                    "verify_signature": verify,
+                },
+            )
+        except jwt.InvalidAlgorithmError as ex:
+            raise TokenBackendError(_("Invalid algorithm specified")) from ex
+        except jwt.InvalidTokenError:
+            raise TokenBackendError(_("Token is invalid or expired"))
+
+    def get_jwks(self) -> dict:
+        """Get the public keys of the keyring as a JSON Web Key Set"""
+        return {"keys": [key.to_jwk() for key in self.keys.values()]}
+
+
+_lock = threading.Lock()
+_token_backend = None
+
+
+def _build_token_backend() -> TokenBackend:
+    """Build the keyring from the settings, or simplejwt's HMAC backend without it"""
+    if not settings.JWT_SIGNING_KEYS:
+        return state.token_backend
+
+    keys = [SigningKey(**key) for key in settings.JWT_SIGNING_KEYS]
+    return KeyringTokenBackend(
+        keys,
+        active_key_id=settings.JWT_ACTIVE_SIGNING_KEY_ID
+        or next((key.kid for key in keys if key.private_key is not None), None),
+        hmac_key=(
+            api_settings.SIGNING_KEY if settings.JWT_ACCEPT_HMAC_TOKENS else None
+        ),
+        audience=api_settings.AUDIENCE,
+        issuer=api_settings.ISSUER,
+        leeway=api_settings.LEEWAY,
+    )
+
+
+def get_token_backend() -> TokenBackend:
+    """Get the token backend, the keys are parsed once per process"""
+    global _token_backend
+    if _token_backend is None:
+        with _lock:
+            if _token_backend is None:
+                _token_backend = _build_token_backend()
+    return _token_backend
+
+
+def get_jwks() -> dict:
+    """Get the public keys that verify the tokens, none while they're HMAC signed"""
+    token_backend = get_token_backend()
+    if isinstance(token_backend, KeyringTokenBackend):
+        return token_backend.get_jwks()
+    return {"keys": []}
+
+
+@receiver(setting_changed)
+def reset_token_backend(**kwargs):
+    global _token_backend
+    if kwargs["setting"] in (
+        "JWT_SIGNING_KEYS",
+        "JWT_ACTIVE_SIGNING_KEY_ID",
+        "JWT_ACCEPT_HMAC_TOKENS",
+    ):
+        _token_backend = None
@@ -0,0 +1,212 @@
+import hashlib
+import threading
+import time
+from typing import List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.request import Request
+from rest_framework.throttling import BaseThrottle
+
+from api.core.helpers import metrics
+from api.core.helpers.cache import LRUCache
+
+THROTTLE_CACHE_KEY = "auth:throttle:{}:{}"
+
+PERIODS = {"s": 1, "m": 60, "h": 60 * 60, "d": 24 * 60 * 60}
+
+
+def parse_rate(rate: str) -> Tuple[int, int]:
+    """
+    Parse a rate like DRF's throttles do
+    Params:
+        rate: The number of requests per period, e.g. "5/min" or "100/hour"
+    Returns: The number of requests and the period in seconds
+    """
+    num, period = rate.split("/")
+    return int(num), PERIODS[period[0]]
+
+
+class TokenBucket:
+    """Allows `limit` requests per `period`, refilled continuously"""
+
+    def __init__(self, limit: int, period: int):
+        self.capacity = limit
+        self.refill_rate = limit / period
+        self.tokens = float(limit)
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def take(self) -> float:
+        """
+        Take a token if there's one left
+        Returns: 0 when a token was taken, otherwise the seconds until there's one
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.capacity,
+                self.tokens + (now - self.updated_at) * self.refill_rate,
+            )
+            self.updated_at = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0
+            return (1 - self.tokens) / self.refill_rate
+
+
+class RateLimiter:
+    """
+    Limits requests per key with a sliding window shared by every worker
+    through the cache. Each process keeps a token bucket per key in front of
+    it: a process never sees more requests than all of them together, so a
+    key it already refuses is refused without a cache round trip.
+    Params:
+        max_size: The most token buckets kept by the process
+    """
+
+    def __init__(self, max_size: int):
+        self.buckets = LRUCache(max_size=max_size)
+        self._lock = threading.Lock()
+        self.allowed = 0
+        self.rejected_locally = 0
+        self.rejected = 0
+
+    def _get_bucket(self, key: str, limit: int, period: int) -> TokenBucket:
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            with self._lock:
+                bucket = self.buckets.get(key)
+                if bucket is None:
+                    bucket = TokenBucket(limit, period)
+                    # Idle buckets are full again after a period
+                    self.buckets.set(key, bucket, timeout=period)
+        return bucket
+
+    def _hit_window(self, key: str, limit: int, period: int) -> float:
+        """
+        Count the request in the shared window, weighting the previous window
+        by how much of it still overlaps the last `period` seconds
+        Returns: 0 when the request is allowed, otherwise the seconds to wait
+        """
+        cache = caches[settings.AUTH_THROTTLE_CACHE_ALIAS]
+        now = time.time()
+        window = int(now // period)
+        elapsed = now / period - window
+
+        current_key = THROTTLE_CACHE_KEY.format(key, window)
+        # add() doesn't overwrite, so concurrent first hits don't reset the count
+        cache.add(current_key, 0, timeout=period * 2)
+        try:
+            current = cache.incr(current_key)
+        except ValueError:
+            # Expired between add() and incr()
+            cache.set(current_key, 1, timeout=period * 2)
+            current = 1
+        previous = cache.get(THROTTLE_CACHE_KEY.format(key, window - 1), 0)
+
+        if previous * (1 - elapsed) + current <= limit:
+            return 0
+        if previous and current <= limit:
+            # Wait until enough of the previous window slides out
+            return ((previous + current - limit) / previous - elapsed) * period
+        return (1 - elapsed) * period
+
+    def hit(self, key: str, rate: str) -> float:
+        """
+        Count a request for the key
+        Params:
+            key: What the requests are limited by, e.g. the scope and client IP
+            rate: The allowed requests, e.g. "5/min"
+        Returns: 0 when the request is allowed, otherwise the seconds to wait
+        """
+        limit, period = parse_rate(rate)
+        wait = self._get_bucket(f"{key}:{rate}", limit, period).take()
+        if wait:
+            with self._lock:
+                self.rejected_locally += 1
+            return wait
+
+        wait = self._hit_window(key, limit, period)
+        with self._lock:
+            if wait:
+                self.rejected += 1
+            else:
+                self.allowed += 1
+        return wait
+
+    def clear(self) -> None:
+        """Forget the process' token buckets"""
+        self.buckets.clear()
+
+    @property
+    def stats(self) -> dict:
+        """Get how many requests were allowed and rejected"""
+        with self._lock:
+            return {
+                "buckets": len(self.buckets),
+                "allowed": self.allowed,
+                "rejected_locally": self.rejected_locally,
+                "rejected": self.rejected,
+            }
+
+
+rate_limiter = RateLimiter(max_size=settings.AUTH_THROTTLE_LOCAL_MAX_SIZE)
+metrics.register("auth_throttling", lambda: rate_limiter.stats)
+
+
+class AuthRateThrottle(BaseThrottle):
+    """
+    Limits the requests to an endpoint per client IP and per email in the
+    payload, with the rates of `AUTH_THROTTLE_RATES[scope]`
+    """
+
+    scope: Optional[str] = None
+
+    def get_idents(self, request: Request) -> List[Tuple[str, str]]:
+        """
+        Get what the requests are limited by. The client IP is REMOTE_ADDR
+        unless `NUM_PROXIES` proxies are trusted to set X-Forwarded-For.
+        Returns: The kind of each identity, as in the rates, and its value
+        """
+        idents = [("ip", self.get_ident(request))]
+        email = request.data.get("email") if hasattr(request.data, "get") else None
+        if isinstance(email, str) and email:
+            idents.append(("email", email.strip().lower()))
+        return idents
+
+    def allow_request(self, request: Request, view) -> bool:
+        self.wait_time = 0
+        if not settings.AUTH_THROTTLE_ENABLED:
+            return True
+
+        rates = settings.AUTH_THROTTLE_RATES.get(self.scope, {})
+        for kind, ident in self.get_idents(request):
+            if kind not in rates:
+                continue
+            digest = hashlib.blake2b(ident.encode(), digest_size=16).hexdigest()
+            self.wait_time = rate_limiter.hit(
+                f"{self.scope}:{kind}:{digest}", rates[kind]
+            )
+            if self.wait_time:
+                return False
+        return True
+
+    def wait(self) -> Optional[float]:
+        return self.wait_time or None
+
+
+class SigninThrottle(AuthRateThrottle):
+    scope = "signin"
+
+
+class ResetPasswordRequestCodeThrottle(AuthRateThrottle):
+    scope = "reset_password_request_code"
+
+
+class ResetPasswordValidateCodeThrottle(AuthRateThrottle):
+    scope = "reset_password_validate_code"
+
+
+class ResetPasswordThrottle(AuthRateThrottle):
+    scope = "reset_password"
@@ -0,0 +1,155 @@
+import functools
+import hmac
+import json
+import operator
+import os
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from jwt.algorithms import HMACAlgorithm, get_default_algorithms
+from jwt.utils import base64url_encode
+from rest_framework_simplejwt.backends import TokenBackend
+from rest_framework_simplejwt.utils import aware_utcnow, datetime_to_epoch
+
+from . import signing
+from .settings import api_settings
+
+
+@functools.lru_cache()
+def get_claim_extractor(fields: Tuple[str, ...]) -> Callable[[Any], Dict[str, str]]:
+    """
+    Compile the function that builds the user claim, once per set of fields
+    Params:
+        fields: The user fields copied into the claim
+    Returns: A function that builds the claim from a user
+    """
+    if not fields:
+        return lambda user: {}
+
+    getter = operator.attrgetter(*fields)
+    if len(fields) == 1:
+        return lambda user: {fields[0]: str(getter(user))}
+    return lambda user: dict(zip(fields, map(str, getter(user))))
+
+
+def get_user_claim(user) -> Dict[str, str]:
+    """Build the user claim from the configured `USER_CLAIM_FIELDS`"""
+    return get_claim_extractor(tuple(api_settings.USER_CLAIM_FIELDS))(user)
+
+
+class TokenFactory:
+    """
+    Encodes tokens for a token backend. The JOSE header segment and the
+    prepared signing key only depend on the backend, so they're computed once
+    instead of on every encode.
+    """
+
+    _json_encoder = json.JSONEncoder(separators=(",", ":"))
+
+    def __init__(self, token_backend: TokenBackend):
+        self.token_backend = token_backend
+
+        headers = {"typ": "JWT"}
+        if isinstance(token_backend, signing.KeyringTokenBackend):
+            key = token_backend.active_key.private_key
+            algorithm = token_backend.active_key.algorithm
+            headers.update(alg=algorithm, kid=token_backend.active_key.kid)
+        else:
+            key = token_backend.signing_key
+            algorithm = token_backend.algorithm
+            headers.update(alg=algorithm)
+
+        self._algorithm = get_default_algorithms()[algorithm]
+        self._key = self._algorithm.prepare_key(key)
+        self._header_segment = base64url_encode(self._dumps(headers))
+        # HMAC keys are hashed into the inner and outer pads once, each
+        # signature only copies that state
+        self._hmac = (
+            hmac.new(self._key, digestmod=self._algorithm.hash_alg)
+            if isinstance(self._algorithm, HMACAlgorithm)
+            else None
+        )
+        self._refresh_lifetime = int(
+            api_settings.REFRESH_TOKEN_LIFETIME.total_seconds()
+        )
+        self._access_lifetime = int(api_settings.ACCESS_TOKEN_LIFETIME.total_seconds())
+
+        self._extra_claims = {}
+        if token_backend.audience is not None:
+            self._extra_claims["aud"] = token_backend.audience
+        if token_backend.issuer is not None:
+            self._extra_claims["iss"] = token_backend.issuer
+
+    def _dumps(self, value: dict) -> bytes:
+        return self._json_encoder.encode(value).encode()
+
+    def _sign(self, signing_input: bytes) -> bytes:
+        if self._hmac is None:
+            return self._algorithm.sign(signing_input, self._key)
+        signature = self._hmac.copy()
+        signature.update(signing_input)
+        return signature.digest()
+
+    def encode(self, payload: dict) -> str:
+        """
+        Same as `TokenBackend.encode`, reusing the header segment and key
+        Params:
+            payload: The token's claims
+        Returns: The encoded token
+        """
+        if self._extra_claims:
+            payload = {**payload, **self._extra_claims}
+
+        signing_input = b".".join(
+            (self._header_segment, base64url_encode(self._dumps(payload)))
+        )
+        signature = self._sign(signing_input)
+        return b".".join((signing_input, base64url_encode(signature))).decode()
+
+    def build_pair(
+        self, user, current_time: Optional[datetime] = None
+    ) -> Tuple[dict, dict]:
+        """
+        Build the payloads of a refresh token and of the access token created
+        from it, with the same claims `RefreshToken.for_user(user).access_token`
+        would have.
+        Params:
+            user: The user the tokens are issued to
+            current_time: The time the tokens are issued at
+        Returns: The refresh and access token payloads
+        """
+        if current_time is None:
+            current_time = aware_utcnow()
+
+        # Lifetimes are whole seconds, so the epochs only need one conversion
+        issued_at = datetime_to_epoch(current_time)
+        claims = {
+            "iat": issued_at,
+            api_settings.USER_CLAIM: get_user_claim(user),
+        }
+        refresh = {
+            api_settings.TOKEN_TYPE_CLAIM: "refresh",
+            "exp": issued_at + self._refresh_lifetime,
+            api_settings.JTI_CLAIM: os.urandom(16).hex(),
+            **claims,
+        }
+        access = {
+            api_settings.TOKEN_TYPE_CLAIM: "access",
+            "exp": issued_at + self._access_lifetime,
+            api_settings.JTI_CLAIM: os.urandom(16).hex(),
+            **claims,
+        }
+        return refresh, access
+
+
+_token_factory = None
+
+
+def get_token_factory() -> TokenFactory:
+    """Get the factory of the current token backend"""
+    global _token_factory
+    token_backend = signing.get_token_backend()
+    token_factory = _token_factory
+    if token_factory is None or token_factory.token_backend is not token_backend:
+        token_factory = _token_factory = TokenFactory(token_backend)
+    return token_factory
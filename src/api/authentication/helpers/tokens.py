@@ -1,15 +1,47 @@
+from datetime import datetime
+
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.utils.translation import gettext_lazy as _
 from drf_spectacular.extensions import OpenApiAuthenticationExtension
 from rest_framework_simplejwt import authentication, tokens
-from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.exceptions import (
+    AuthenticationFailed,
+    InvalidToken,
+    TokenError,
+)
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+from rest_framework_simplejwt.utils import (
+    aware_utcnow,
+    datetime_from_epoch,
+    datetime_to_epoch,
+)
 
+from . import revocation, signing, user_cache, verified_tokens
+from .blacklist_index import blacklist_index
+from .claims import ClaimsUser
 from .settings import api_settings
+from .token_factory import get_token_factory, get_user_claim
 
 User = get_user_model()
 
 
 class JWTAuthentication(authentication.JWTAuthentication):
+    def get_validated_token(self, raw_token):
+        """
+        Validates an encoded JSON web token and returns a validated token
+        wrapper object. Tokens already verified by this process are returned
+        from the verified token cache until they expire.
+        """
+        if not settings.VERIFIED_TOKEN_CACHE_ENABLED:
+            return super().get_validated_token(raw_token)
+
+        validated_token = verified_tokens.get_token(raw_token)
+        if validated_token is None:
+            validated_token = super().get_validated_token(raw_token)
+            verified_tokens.set_token(raw_token, validated_token)
+        return validated_token
+
     def get_user(self, validated_token):
         """
         Attempts to find and return a user using the given validated token.
@@ -21,19 +53,57 @@ class JWTAuthentication(authentication.JWTAuthentication):
         except KeyError:
             raise InvalidToken(_("Token contained no recognizable user identification"))
 
-        try:
-            user = self.user_model.objects.get(**{api_settings.USER_ID_FIELD: user_id})
-        except self.user_model.DoesNotExist:
-            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        user = user_cache.get_user(user_id) if settings.USER_CACHE_ENABLED else None
+        if user is None:
+            try:
+                user = self.user_model.objects.get(
+                    **{api_settings.USER_ID_FIELD: user_id}
+                )
+            except self.user_model.DoesNotExist:
+                raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+            if settings.USER_CACHE_ENABLED:
+                user_cache.set_user(user)
 
         if not user.is_active:
             raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
 
+        if user.tokens_valid_after and revocation.was_issued_before(
+            validated_token, user.tokens_valid_after.timestamp()
+        ):
+            raise AuthenticationFailed(
+                _("Token has been revoked"), code="token_revoked"
+            )
+
         return user
 
 
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    Authenticates the user straight from the token's user claim, without
+    querying the user unless its revocation state isn't cached. Opt in per view,
+    on endpoints that don't need the full user instance.
+    """
+
+    def get_user(self, validated_token):
+        """
+        Builds a claims-only user from the given validated token.
+        """
+        claims = validated_token.get(api_settings.USER_CLAIM, {})
+        if api_settings.USER_ID_FIELD not in claims:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        if revocation.is_token_revoked(validated_token):
+            raise AuthenticationFailed(
+                _("Token has been revoked"), code="token_revoked"
+            )
+
+        return ClaimsUser(validated_token)
+
+
 class JWTAuthenticationScheme(OpenApiAuthenticationExtension):
     target_class = JWTAuthentication
+    match_subclasses = True
     name = "JWT"
 
     def get_security_definition(self, auto_schema):
@@ -45,24 +115,119 @@ class JWTAuthenticationScheme(OpenApiAuthenticationExtension):
 
 
 class Token(tokens.Token):
+    # Encoded form of the payload, kept by tokens minted through the factory
+    # and dropped on any change to the payload
+    _encoded = None
+
+    def get_token_backend(self):
+        return signing.get_token_backend()
+
+    @classmethod
+    def from_payload(cls, payload: dict, current_time: datetime) -> tokens.Token:
+        """
+        Returns a new token wrapping an already built payload.
+        """
+        token = cls.__new__(cls)
+        token.token = None
+        token.current_time = current_time
+        token.payload = payload
+        return token
+
     @classmethod
     def for_user(cls, user: User) -> tokens.Token:
         """
         Returns an authorization token for the given user that will be provided
         after authenticating the user's credentials.
         """
-        user_dict = user.__dict__
         token = cls()
-        token[api_settings.USER_CLAIM] = {
-            key: str(user_dict[key])
-            for key in user_dict.keys()
-            if key in api_settings.USER_CLAIM_FIELDS
-        }
+        token["iat"] = datetime_to_epoch(token.current_time)
+        token[api_settings.USER_CLAIM] = get_user_claim(user)
 
         return token
 
+    def __str__(self):
+        """
+        Signs and returns a token as a base64 encoded string.
+        """
+        if self._encoded is None:
+            return get_token_factory().encode(self.payload)
+        return self._encoded
+
+    def __setitem__(self, key, value):
+        self._encoded = None
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self._encoded = None
+        super().__delitem__(key)
+
+    def set_jti(self):
+        self._encoded = None
+        super().set_jti()
+
+    def set_exp(self, *args, **kwargs):
+        self._encoded = None
+        super().set_exp(*args, **kwargs)
+
 
 class RefreshToken(tokens.RefreshToken, Token):
+    # Access token minted together with this token by `for_user`
+    _access_token = None
+
+    @classmethod
+    def for_user(cls, user: User) -> tokens.Token:
+        """
+        Returns a refresh token for the given user, minted in a single pass
+        with its access token, and adds it to the outstanding token list.
+        """
+        current_time = aware_utcnow()
+        token_factory = get_token_factory()
+        refresh_payload, access_payload = token_factory.build_pair(user, current_time)
+
+        token = cls.from_payload(refresh_payload, current_time)
+        token._encoded = token_factory.encode(refresh_payload)
+        access_token = AccessToken.from_payload(access_payload, current_time)
+        access_token._encoded = token_factory.encode(access_payload)
+        token._access_token = access_token
+
+        OutstandingToken.objects.create(
+            user=user,
+            jti=refresh_payload[api_settings.JTI_CLAIM],
+            token=token._encoded,
+            created_at=current_time,
+            expires_at=datetime_from_epoch(refresh_payload["exp"]),
+        )
+
+        return token
+
+    def verify(self, *args, **kwargs):
+        """
+        Also rejects tokens issued before their user's tokens were revoked.
+        """
+        super().verify(*args, **kwargs)
+
+        if revocation.is_token_revoked(self):
+            raise TokenError(_("Token has been revoked"))
+
+    def check_blacklist(self):
+        """
+        Checks the token against the in-memory blacklist index first, only
+        possible hits are confirmed through the blacklist table.
+        """
+        jti = self.payload[api_settings.JTI_CLAIM]
+        if settings.BLACKLIST_INDEX_ENABLED and not blacklist_index.might_contain(jti):
+            return
+
+        super().check_blacklist()
+
+    def blacklist(self):
+        """
+        Adds the token to the blacklist and to this process' blacklist index.
+        """
+        blacklisted = super().blacklist()
+        blacklist_index.add(self.payload[api_settings.JTI_CLAIM])
+        return blacklisted
+
     @property
     def access_token(self):
         """
@@ -70,6 +235,9 @@ class RefreshToken(tokens.RefreshToken, Token):
         claims present in this refresh token to the new access token except
         those claims listed in the `no_copy_claims` attribute.
         """
+        if self._encoded is not None and self._access_token is not None:
+            return self._access_token
+
         access = AccessToken()
 
         # Use instantiation time of refresh token as relative timestamp for
@@ -0,0 +1,109 @@
+from typing import Any, Iterable, Optional
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS
+
+from api.core.helpers.cache import LRUCache
+
+from .settings import api_settings
+
+User = get_user_model()
+
+# Versioned, entries from before the field list are ignored
+USER_CACHE_KEY = "auth:user:v2:{}"
+
+# What authenticating and authorizing a request reads. The password hash and
+# anything else stays out of the caches and is loaded on access.
+USER_CACHE_FIELDS = (
+    "id",
+    "email",
+    "full_name",
+    "is_active",
+    "is_staff",
+    "is_superuser",
+    "tokens_valid_after",
+)
+
+local_cache = LRUCache(max_size=settings.USER_CACHE_LOCAL_MAX_SIZE)
+
+
+def _get_shared_cache():
+    return caches[settings.AUTH_CACHE_ALIAS]
+
+
+def _get_key(user_id: Any) -> str:
+    return USER_CACHE_KEY.format(user_id)
+
+
+def _get_timeout() -> float:
+    """
+    Get the shared cache timeout, always shorter than the access token lifetime
+    so a cached user never outlives the tokens that resolved it
+    """
+    return min(
+        settings.USER_CACHE_TIMEOUT, api_settings.ACCESS_TOKEN_LIFETIME / 2
+    ).total_seconds()
+
+
+def _get_local_timeout() -> float:
+    return min(
+        settings.USER_CACHE_LOCAL_TIMEOUT, settings.USER_CACHE_TIMEOUT
+    ).total_seconds()
+
+
+def get_user(user_id: Any) -> Optional[User]:
+    """
+    Get a cached user, looking at the process cache before the shared one
+    Params:
+        user_id: The value of the user's `USER_ID_FIELD`
+    Returns: The cached user, with the other fields deferred, or None when it
+        isn't cached
+    """
+    key = _get_key(user_id)
+    values = local_cache.get(key)
+    if values is None:
+        values = _get_shared_cache().get(key)
+        if values is None:
+            return None
+        local_cache.set(key, values, timeout=_get_local_timeout())
+
+    # Each request gets its own instance so changes made while handling it
+    # never leak into the cached values. Saving it only writes loaded fields.
+    return User.from_db(DEFAULT_DB_ALIAS, USER_CACHE_FIELDS, values)
+
+
+def set_user(user: User) -> None:
+    """
+    Store the user in both cache tiers
+    Params:
+        user: The user that is going to be cached
+    """
+    key = _get_key(getattr(user, api_settings.USER_ID_FIELD))
+    values = tuple(getattr(user, field) for field in USER_CACHE_FIELDS)
+    _get_shared_cache().set(key, values, timeout=_get_timeout())
+    local_cache.set(key, values, timeout=_get_local_timeout())
+
+
+def invalidate_user(user_id: Any) -> None:
+    """
+    Remove the user from both cache tiers
+    Params:
+        user_id: The value of the user's `USER_ID_FIELD`
+    """
+    key = _get_key(user_id)
+    _get_shared_cache().delete(key)
+    local_cache.delete(key)
+
+
+def invalidate_users(user_ids: Iterable[Any]) -> None:
+    """
+    Remove many users from both cache tiers, e.g. after a bulk update
+    Params:
+        user_ids: The values of the users' `USER_ID_FIELD`
+    """
+    keys = [_get_key(user_id) for user_id in user_ids]
+    _get_shared_cache().delete_many(keys)
+    for key in keys:
+        local_cache.delete(key)
@@ -0,0 +1,48 @@
+import hashlib
+import time
+from typing import Optional
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from rest_framework_simplejwt.tokens import Token
+
+from api.core.helpers import metrics
+from api.core.helpers.cache import LRUCache
+
+local_cache = LRUCache(max_size=settings.VERIFIED_TOKEN_CACHE_MAX_SIZE)
+metrics.register("verified_tokens", lambda: local_cache.stats)
+
+
+def _get_key(raw_token: bytes) -> bytes:
+    return hashlib.blake2b(raw_token, digest_size=16).digest()
+
+
+def get_token(raw_token: bytes) -> Optional[Token]:
+    """
+    Get the validated token of an encoded token that was already verified
+    Params:
+        raw_token: The encoded token
+    Returns: The validated token, shared between requests and not to be
+        changed, or None when it isn't cached
+    """
+    return local_cache.get(_get_key(raw_token))
+
+
+def set_token(raw_token: bytes, token: Token) -> None:
+    """
+    Cache a validated token until it expires
+    Params:
+        raw_token: The encoded token
+        token: The token validated from it
+    """
+    timeout = token["exp"] - time.time()
+    if timeout > 0:
+        local_cache.set(_get_key(raw_token), token, timeout=timeout)
+
+
+@receiver(setting_changed)
+def clear_verified_tokens(**kwargs):
+    # Tokens verified with a key that's no longer trusted must be checked again
+    if kwargs["setting"] in ("JWT_SIGNING_KEYS", "JWT_ACCEPT_HMAC_TOKENS"):
+        local_cache.clear()
@@ -0,0 +1,78 @@
+import time
+from typing import Callable
+
+import boto3
+from django.core.management.base import BaseCommand
+
+from api.core.messenger import sms
+from api.core.messenger.local_sns import LocalSNSServer
+
+CREDENTIALS = {
+    "region_name": "us-east-1",
+    "aws_access_key_id": "benchmark",
+    "aws_secret_access_key": "benchmark",
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare sending SMS through a new SNS client per message with the "
+        "process' cached client, against a local SNS stand-in."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--messages",
+            type=int,
+            default=200,
+            help="SMS sent per client strategy (default: 200)",
+        )
+        parser.add_argument(
+            "--latency",
+            type=float,
+            default=0,
+            help="Seconds the stand-in takes per call (default: 0)",
+        )
+
+    def handle(self, *args, **options):
+        server = LocalSNSServer(latency=options["latency"]).start()
+        try:
+            credentials = {**CREDENTIALS, "endpoint_url": server.endpoint_url}
+
+            def send_with_new_client() -> None:
+                boto3.client("sns", **credentials).publish(
+                    PhoneNumber="+15555550100", Message="Benchmark", Subject="SMS"
+                )
+
+            def send_with_cached_client() -> None:
+                sms.get_client(**credentials).publish(
+                    PhoneNumber="+15555550100", Message="Benchmark", Subject="SMS"
+                )
+
+            sms.clear_clients()
+            for name, send in (
+                ("new client", send_with_new_client),
+                ("cached client", send_with_cached_client),
+            ):
+                connections = server.connections
+                per_second = self._benchmark(send, options["messages"])
+                self.stdout.write(
+                    f"{name}: {per_second:,.0f} SMS/s, "
+                    f"{server.connections - connections} connections opened"
+                )
+        finally:
+            sms.clear_clients()
+            server.stop()
+
+    def _benchmark(self, send: Callable[[], None], messages: int) -> float:
+        """
+        Time the sending function
+        Params:
+            send: Sends an SMS
+            messages: How many SMS are sent
+        Returns: The SMS sent per second
+        """
+        started_at = time.perf_counter()
+        for _ in range(messages):
+            send()
+        return messages / (time.perf_counter() - started_at)
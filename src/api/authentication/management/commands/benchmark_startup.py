@@ -0,0 +1,87 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+# Run in a fresh interpreter, like a gunicorn worker booting the application
+# and loading the URLconf to serve its first request. "eager" also imports
+# every registered messenger, as the application did before they were lazy.
+WORKER_SCRIPT = """
+import json, resource, sys, time
+
+started_at = time.perf_counter()
+from django.core.wsgi import get_wsgi_application
+from django.urls import get_resolver
+
+get_wsgi_application()
+get_resolver().url_patterns
+if sys.argv[1] == "eager":
+    from django.conf import settings
+    from django.utils.module_loading import import_string
+
+    for path in settings.MESSENGERS.values():
+        import_string(path)
+elapsed = time.perf_counter() - started_at
+
+print(json.dumps({
+    "seconds": elapsed,
+    "rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    "boto3": "boto3" in sys.modules,
+}))
+"""
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the startup time and memory of a worker that imports every "
+        "messenger with one that only imports them on first use."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--runs",
+            type=int,
+            default=5,
+            help="Workers started per mode, the median is reported (default: 5)",
+        )
+
+    def handle(self, *args, **options):
+        results = {
+            mode: [self._start_worker(mode) for _ in range(options["runs"])]
+            for mode in ("eager", "lazy")
+        }
+
+        for mode, runs in results.items():
+            seconds = statistics.median(run["seconds"] for run in runs)
+            rss_mb = statistics.median(run["rss_kb"] for run in runs) / 1024
+            self.stdout.write(
+                f"{mode}: {seconds * 1000:,.0f} ms, {rss_mb:,.1f} MB RSS, "
+                f"boto3 {'loaded' if runs[0]['boto3'] else 'not loaded'}"
+            )
+
+    def _start_worker(self, mode: str) -> dict:
+        """
+        Boot the application in a new interpreter
+        Params:
+            mode: "eager" to import every messenger, "lazy" otherwise
+        Returns: The worker's startup time, peak RSS and whether boto3 was loaded
+        """
+        env = {
+            **os.environ,
+            "DJANGO_SETTINGS_MODULE": os.environ.get(
+                "DJANGO_SETTINGS_MODULE", "api.core.settings"
+            ),
+        }
+        output = subprocess.run(
+            [sys.executable, "-c", WORKER_SCRIPT, mode],
+            check=True,
+            capture_output=True,
+            cwd=os.path.dirname(settings.BASE_DIR),
+            env=env,
+            text=True,
+        ).stdout
+        return json.loads(output.strip().splitlines()[-1])
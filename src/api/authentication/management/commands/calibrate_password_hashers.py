@@ -0,0 +1,277 @@
+import json
+import math
+import platform
+import secrets
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from api.authentication.hashers import (
+    CalibratedArgon2PasswordHasher,
+    CalibratedPBKDF2PasswordHasher,
+    CalibratedScryptPasswordHasher,
+)
+
+# Strongest first, the first one meeting Django's default cost is preferred
+ALGORITHMS = ("argon2", "scrypt", "pbkdf2_sha256")
+SCRYPT_BLOCK_SIZE = 8
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the password hashers on this host and write the parameters "
+        "that meet the target latency to PASSWORD_HASHERS_CONFIG. Costs are never "
+        "written below Django's defaults, as existing hashes would be downgraded "
+        "to them on signin."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--target-ms",
+            type=float,
+            default=250.0,
+            help="Latency a single hash may take at the percentile (default: 250)",
+        )
+        parser.add_argument(
+            "--percentile",
+            type=float,
+            default=99.0,
+            help="Latency percentile compared to the target (default: 99)",
+        )
+        parser.add_argument(
+            "--samples",
+            type=int,
+            default=30,
+            help="Hashes timed per measurement (default: 30)",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=settings.PASSWORD_HASHING_WORKERS,
+            help="Hashes run at once, defaults to PASSWORD_HASHING_WORKERS",
+        )
+        parser.add_argument(
+            "--algorithm",
+            choices=ALGORITHMS,
+            action="append",
+            help="Calibrate only the given algorithm, can be repeated",
+        )
+        parser.add_argument(
+            "--output",
+            default=settings.PASSWORD_HASHERS_CONFIG,
+            help="Where the config is written, defaults to PASSWORD_HASHERS_CONFIG",
+        )
+
+    def handle(self, *args, **options):
+        self.target = options["target_ms"] / 1000
+        self.percentile = options["percentile"]
+        self.samples = options["samples"]
+        self.concurrency = options["concurrency"]
+
+        calibrations = {
+            "argon2": self._calibrate_argon2,
+            "scrypt": self._calibrate_scrypt,
+            "pbkdf2_sha256": self._calibrate_pbkdf2,
+        }
+        parameters = {}
+        preferred = None
+        for algorithm in ALGORITHMS:
+            if options["algorithm"] and algorithm not in options["algorithm"]:
+                continue
+            if not self._is_available(algorithm):
+                self.stdout.write(f"{algorithm}: skipped, library not installed")
+                continue
+
+            parameters[algorithm], latency, is_strong = calibrations[algorithm]()
+            self.stdout.write(
+                f"{algorithm}: {parameters[algorithm]} "
+                f"(p{self.percentile:g} {latency * 1000:.1f}ms)"
+            )
+            if not is_strong:
+                self.stdout.write(
+                    self.style.WARNING(
+                        f"{algorithm}: Django's default cost is over the target, "
+                        "it's kept anyway"
+                    )
+                )
+            if preferred is None and is_strong:
+                preferred = algorithm
+
+        if not parameters:
+            raise CommandError("No password hasher available to calibrate")
+        if preferred is None:
+            # None meets the target at Django's default cost, the weakest one
+            # calibrated is the fastest at it
+            preferred = list(parameters)[-1]
+
+        config = {
+            "algorithm": preferred,
+            "hashers": parameters,
+            "target_ms": options["target_ms"],
+            "percentile": self.percentile,
+            "host": platform.node(),
+            "calibrated_at": timezone.now().isoformat(),
+        }
+        with open(options["output"], "w") as config_file:
+            json.dump(config, config_file, indent=2)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Wrote {options['output']}, preferring {preferred}")
+        )
+
+    def _is_available(self, algorithm: str) -> bool:
+        hasher = hashers.get_hasher(algorithm)
+        if hasher.library is None:
+            return True
+        try:
+            hasher._load_library()
+        except ValueError:
+            return False
+        return True
+
+    def _measure(self, hasher: hashers.BasePasswordHasher) -> float:
+        """
+        Time the hasher under the configured concurrency
+        Params:
+            hasher: The hasher with the parameters being measured
+        Returns: The latency at the configured percentile, in seconds
+        """
+        password = secrets.token_urlsafe(12)
+
+        def run(_) -> float:
+            started_at = time.perf_counter()
+            hasher.encode(password, hasher.salt())
+            return time.perf_counter() - started_at
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            latencies = sorted(pool.map(run, range(self.samples)))
+
+        index = math.ceil(self.percentile / 100 * len(latencies)) - 1
+        return latencies[max(0, min(index, len(latencies) - 1))]
+
+    def _calibrate_linear(
+        self, make_hasher: Callable[[int], hashers.BasePasswordHasher], start: int
+    ) -> Optional[tuple]:
+        """
+        Find the highest cost meeting the target for a hasher whose latency grows
+        linearly with it. The cost is doubled until the latency is long enough to
+        extrapolate from, then scaled to the target and stepped down until it fits.
+        Params:
+            make_hasher: Builds the hasher for a cost
+            start: The lowest cost
+        Returns: The cost and its latency, None if even the lowest cost is too slow
+        """
+        cost = start
+        latency = self._measure(make_hasher(cost))
+        if latency > self.target:
+            return None
+
+        while latency < self.target / 4:
+            cost *= 2
+            latency = self._measure(make_hasher(cost))
+
+        while True:
+            cost = max(start, int(cost * self.target / latency * 0.95))
+            latency = self._measure(make_hasher(cost))
+            if latency <= self.target or cost == start:
+                return cost, latency
+
+    def _calibrate_pbkdf2(self) -> tuple:
+        def make_hasher(iterations: int) -> hashers.BasePasswordHasher:
+            hasher = CalibratedPBKDF2PasswordHasher()
+            hasher.iterations = iterations
+            return hasher
+
+        iterations, latency = self._calibrate_linear(
+            make_hasher, 1000
+        ) or self._fallback(make_hasher, 1000)
+        # Rounded so the calibration stays stable across runs
+        iterations = max(1000, iterations // 1000 * 1000)
+        is_strong = iterations >= hashers.PBKDF2PasswordHasher.iterations
+        if not is_strong:
+            iterations = hashers.PBKDF2PasswordHasher.iterations
+            latency = self._measure(make_hasher(iterations))
+        return {"iterations": iterations}, latency, is_strong
+
+    def _calibrate_argon2(self) -> tuple:
+        memory_cost = hashers.Argon2PasswordHasher.memory_cost
+        while True:
+
+            def make_hasher(time_cost: int) -> hashers.BasePasswordHasher:
+                hasher = CalibratedArgon2PasswordHasher()
+                hasher.time_cost = time_cost
+                hasher.memory_cost = memory_cost
+                return hasher
+
+            result = self._calibrate_linear(make_hasher, 1)
+            if result or memory_cost <= 8 * hashers.Argon2PasswordHasher.parallelism:
+                break
+            # Memory is what makes Argon2 costly to attack, but even a single
+            # pass over it exceeds the target, so it is halved
+            memory_cost //= 2
+
+        time_cost, latency = result or self._fallback(make_hasher, 1)
+        is_strong = (
+            time_cost >= hashers.Argon2PasswordHasher.time_cost
+            and memory_cost >= hashers.Argon2PasswordHasher.memory_cost
+        )
+        if not is_strong:
+            time_cost = max(time_cost, hashers.Argon2PasswordHasher.time_cost)
+            memory_cost = max(memory_cost, hashers.Argon2PasswordHasher.memory_cost)
+            latency = self._measure(make_hasher(time_cost))
+        return (
+            {
+                "time_cost": time_cost,
+                "memory_cost": memory_cost,
+                "parallelism": hashers.Argon2PasswordHasher.parallelism,
+            },
+            latency,
+            is_strong,
+        )
+
+    def _calibrate_scrypt(self) -> tuple:
+        def make_hasher(work_factor: int) -> hashers.BasePasswordHasher:
+            hasher = CalibratedScryptPasswordHasher()
+            hasher.work_factor = work_factor
+            hasher.block_size = SCRYPT_BLOCK_SIZE
+            hasher.maxmem = self._get_scrypt_maxmem(work_factor)
+            return hasher
+
+        # The work factor must be a power of two, it's doubled while it fits
+        work_factor = 2**10
+        latency = self._measure(make_hasher(work_factor))
+        while True:
+            next_latency = self._measure(make_hasher(work_factor * 2))
+            if next_latency > self.target:
+                break
+            work_factor, latency = work_factor * 2, next_latency
+
+        is_strong = work_factor >= hashers.ScryptPasswordHasher.work_factor
+        if not is_strong:
+            work_factor = hashers.ScryptPasswordHasher.work_factor
+            latency = self._measure(make_hasher(work_factor))
+        return (
+            {
+                "work_factor": work_factor,
+                "block_size": SCRYPT_BLOCK_SIZE,
+                "parallelism": 1,
+                "maxmem": self._get_scrypt_maxmem(work_factor),
+            },
+            latency,
+            is_strong,
+        )
+
+    def _get_scrypt_maxmem(self, work_factor: int) -> int:
+        """OpenSSL's default 32MB limit is below the memory scrypt needs past 2**14"""
+        return 2 * 128 * work_factor * SCRYPT_BLOCK_SIZE
+
+    def _fallback(
+        self, make_hasher: Callable[[int], hashers.BasePasswordHasher], cost: int
+    ) -> tuple:
+        """The lowest cost is used when it's already above the target"""
+        return cost, self._measure(make_hasher(cost))
@@ -0,0 +1,44 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from api.authentication.helpers.export import DATASETS, OUTPUT_FORMATS, export
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream the users, or their reset codes or refresh tokens, as NDJSON or "
+        "CSV. Rows are read in chunks, so memory use doesn't grow with the table."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dataset",
+            choices=tuple(DATASETS),
+            default="users",
+            help="What is exported (default: users)",
+        )
+        parser.add_argument(
+            "--output",
+            choices=OUTPUT_FORMATS,
+            default="ndjson",
+            help="Output format (default: ndjson)",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=settings.EXPORT_CHUNK_SIZE,
+            help="Rows fetched at a time (default: EXPORT_CHUNK_SIZE)",
+        )
+        parser.add_argument(
+            "--file", help="File the export is written to (default: stdout)"
+        )
+
+    def handle(self, *args, dataset, output, chunk_size, file, **options):
+        chunks = export(dataset, output, chunk_size)
+        if not file:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending="")
+            return
+
+        with open(file, "w", newline="") as stream:
+            stream.writelines(chunks)
@@ -0,0 +1,274 @@
+import csv
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from typing import IO, Iterator, List, Optional, Set, Tuple
+
+from django.contrib.auth import get_user_model, hashers
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError, transaction
+from django.db.models.functions import Lower
+from rest_framework.validators import UniqueValidator
+
+from api.authentication.hashers import get_preferred_algorithm
+from api.authentication.serializers import SignUpSerializer
+
+User = get_user_model()
+
+FORMATS = ("csv", "ndjson")
+
+# A row of the input with its line number
+Row = Tuple[int, dict]
+
+
+def hash_passwords(passwords: List[str], algorithm: str) -> List[str]:
+    """
+    Hash the passwords in a pool process
+    Params:
+        passwords: The raw passwords
+        algorithm: The hasher algorithm, resolved by the parent process
+    Returns: The encoded passwords, in the same order
+    """
+    return [hashers.make_password(password, None, algorithm) for password in passwords]
+
+
+class Command(BaseCommand):
+    help = (
+        "Import users from a CSV or NDJSON file with email, full_name and "
+        "password columns. Passwords are hashed in a process pool and users are "
+        "inserted in batches, rows that can't be imported are reported."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help='Input file, or "-" for stdin')
+        parser.add_argument(
+            "--format",
+            choices=FORMATS,
+            help="Input format (default: from the file extension, else csv)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Users inserted at a time (default: 1000)",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count(),
+            help="Password hashing processes (default: the number of CPUs)",
+        )
+        parser.add_argument(
+            "--hashed",
+            action="store_true",
+            help="Passwords are already encoded by a Django hasher, e.g. from "
+            "another deployment, and are stored as they are",
+        )
+        parser.add_argument(
+            "--rejects",
+            help="File the rejected rows are written to as NDJSON (default: stderr)",
+        )
+
+    def handle(self, *args, path, batch_size, workers, hashed, rejects, **options):
+        if batch_size < 1 or workers < 1:
+            raise CommandError("--batch-size and --workers must be positive")
+        input_format = options["format"] or (
+            "ndjson" if path.endswith((".ndjson", ".jsonl")) else "csv"
+        )
+
+        self.imported = 0
+        self.rejected = 0
+        started_at = time.monotonic()
+        stream = sys.stdin if path == "-" else open(path, newline="", encoding="utf-8")
+        rejects_file = open(rejects, "w", encoding="utf-8") if rejects else None
+        self.rejects = rejects_file or self.stderr
+        # Pool processes are forked from this one whatever the platform default,
+        # so Django is already set up in them. They only hash and exit with
+        # os._exit(), so the inherited database connection is left alone
+        pool = (
+            None
+            if hashed
+            else ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("fork")
+            )
+        )
+        try:
+            rows = self._read(stream, input_format)
+            pending = None
+            while True:
+                batch = list(islice(rows, batch_size))
+                # The next batch is hashed while the previous one is inserted
+                prepared = (
+                    self._prepare(batch, pool, workers, hashed) if batch else None
+                )
+                if pending:
+                    self._write(*pending)
+                if not prepared:
+                    break
+                pending = prepared
+        finally:
+            if pool:
+                pool.shutdown(cancel_futures=True)
+            if stream is not sys.stdin:
+                stream.close()
+            if rejects_file:
+                rejects_file.close()
+
+        elapsed = time.monotonic() - started_at
+        self.stdout.write(
+            f"Imported {self.imported} users, rejected {self.rejected} rows "
+            f"in {elapsed:.1f}s ({self.imported / elapsed if elapsed else 0:,.0f} users/s)"
+        )
+
+    def _read(self, stream: IO, input_format: str) -> Iterator[Row]:
+        """
+        Stream the rows of the input
+        Params:
+            stream: The input file
+            input_format: "csv" or "ndjson"
+        Returns: The rows with their line numbers
+        """
+        if input_format == "csv":
+            reader = csv.DictReader(stream)
+            for row in reader:
+                yield reader.line_num, row
+            return
+
+        for line_number, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as error:
+                self._reject((line_number, {}), {"non_field_errors": [str(error)]})
+                continue
+            if not isinstance(row, dict):
+                self._reject(
+                    (line_number, {}), {"non_field_errors": ["Expected an object."]}
+                )
+                continue
+            yield line_number, row
+
+    def _reject(self, row: Row, errors: dict) -> None:
+        """Report a row that wasn't imported, without its password"""
+        line_number, data = row
+        data = {key: value for key, value in data.items() if key != "password"}
+        self.rejects.write(
+            json.dumps({"line": line_number, "row": data, "errors": errors}) + "\n"
+        )
+        self.rejected += 1
+
+    def _prepare(
+        self,
+        batch: List[Row],
+        pool: Optional[ProcessPoolExecutor],
+        workers: int,
+        hashed: bool,
+    ) -> Tuple[List[Row], List[User], List[Future]]:
+        """
+        Validate a batch like signup does and schedule its password hashing
+        Params:
+            batch: The input rows
+            pool: The hashing process pool, None when passwords are hashed
+            workers: The number of pool processes
+            hashed: Whether the passwords are already encoded
+        Returns: The valid rows, their unsaved users and the hashing futures
+        """
+        rows, users, emails = [], [], set()
+        for row in batch:
+            serializer = SignUpSerializer(data=row[1])
+            if not serializer.is_valid():
+                self._reject(row, serializer.errors)
+                continue
+
+            data = serializer.validated_data
+            email = User.objects.normalize_email(data["email"])
+            # Emails are unique whatever their case
+            if email.lower() in emails:
+                self._reject(row, {"email": [str(UniqueValidator.message)]})
+                continue
+            if hashed and not self._is_encoded(data["password"]):
+                self._reject(row, {"password": ["Unknown password hashing algorithm."]})
+                continue
+
+            emails.add(email.lower())
+            rows.append(row)
+            users.append(
+                User(
+                    email=email, full_name=data["full_name"], password=data["password"]
+                )
+            )
+
+        futures = []
+        if pool and users:
+            algorithm = get_preferred_algorithm()
+            passwords = [user.password for user in users]
+            # One chunk per process keeps the pickling overhead per batch low
+            chunk_size = -(-len(passwords) // workers)
+            futures = [
+                pool.submit(
+                    hash_passwords, passwords[start : start + chunk_size], algorithm
+                )
+                for start in range(0, len(passwords), chunk_size)
+            ]
+        return rows, users, futures
+
+    def _is_encoded(self, password: str) -> bool:
+        try:
+            hashers.identify_hasher(password)
+        except ValueError:
+            return False
+        return True
+
+    def _write(self, rows: List[Row], users: List[User], futures: List[Future]) -> None:
+        """
+        Insert the users of a batch, rejecting the ones whose email is taken
+        Params:
+            rows: The valid rows
+            users: Their unsaved users
+            futures: The password hashing futures, in order
+        """
+        if futures:
+            passwords = [password for future in futures for password in future.result()]
+            for user, password in zip(users, passwords):
+                user.password = password
+
+        while True:
+            existing = self._existing_emails(users)
+            new_rows, new_users = [], []
+            for row, user in zip(rows, users):
+                if user.email.lower() in existing:
+                    self._reject(row, {"email": [str(UniqueValidator.message)]})
+                else:
+                    new_rows.append(row)
+                    new_users.append(user)
+            try:
+                with transaction.atomic():
+                    User.objects.bulk_create(new_users)
+            except IntegrityError:
+                # A user signed up with one of the emails since the lookup, the
+                # batch is rolled back and the next lookup rejects the email
+                if not self._existing_emails(new_users):
+                    raise
+                rows, users = new_rows, new_users
+                continue
+            break
+        self.imported += len(new_users)
+
+    def _existing_emails(self, users: List[User]) -> Set[str]:
+        """
+        Find the emails of the users that are already taken, in a single lookup
+        instead of one per user
+        Params:
+            users: The unsaved users
+        Returns: The lowercased emails already in use
+        """
+        return set(
+            User.objects.annotate(email_lower=Lower("email"))
+            .filter(email_lower__in=[user.email.lower() for user in users])
+            .values_list("email_lower", flat=True)
+        )
@@ -0,0 +1,127 @@
+import time
+from typing import Callable, List
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Q, QuerySet
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+
+from api.authentication.models import Code
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete expired outstanding and blacklisted tokens and used or expired "
+        "codes in keyset-paginated batches"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Rows deleted per batch (default: 1000)",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=0.0,
+            help="Seconds to wait between batches (default: 0)",
+        )
+        parser.add_argument(
+            "--only",
+            choices=("tokens", "codes"),
+            help="Purge only one kind of rows",
+        )
+        parser.add_argument(
+            "--after-id",
+            type=int,
+            default=0,
+            help="Resume after the given primary key, as reported in the progress "
+            "output. Tokens and codes have their own keys, so it needs --only",
+        )
+
+    def handle(self, *args, **options):
+        if options["after_id"] and not options["only"]:
+            raise CommandError(
+                "--after-id needs --only, tokens and codes have their own keys"
+            )
+        now = timezone.now()
+
+        if options["only"] != "codes":
+            self._purge(
+                "tokens",
+                OutstandingToken.objects.filter(expires_at__lte=now),
+                self._delete_tokens,
+                **options,
+            )
+
+        if options["only"] != "tokens":
+            self._purge(
+                "codes",
+                Code.objects.filter(
+                    Q(was_used=True)
+                    | Q(created__lte=now - settings.FORGOT_TIME_EXPIRATION_TIME)
+                ),
+                self._delete_codes,
+                **options,
+            )
+
+    def _purge(
+        self,
+        label: str,
+        queryset: QuerySet,
+        delete: Callable[[List[int]], int],
+        batch_size: int,
+        sleep: float,
+        after_id: int,
+        **options,
+    ) -> None:
+        """
+        Delete the rows of the queryset in batches walking its primary key
+        Params:
+            label: The name reported in the progress output
+            queryset: The rows that are going to be deleted
+            delete: Deletes the rows with the given primary keys, returning how many were deleted
+            batch_size: The maximum amount of rows deleted per batch
+            sleep: Seconds to wait between batches
+            after_id: The primary key after which the purge starts
+        """
+        last_id = after_id
+        deleted = 0
+        while True:
+            ids = list(
+                queryset.filter(pk__gt=last_id)
+                .order_by("pk")
+                .values_list("pk", flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+
+            deleted += delete(ids)
+            last_id = ids[-1]
+            self.stdout.write(f"{label}: deleted {deleted} rows (last id {last_id})")
+
+            if len(ids) < batch_size:
+                break
+            if sleep:
+                time.sleep(sleep)
+
+        self.stdout.write(self.style.SUCCESS(f"{label}: done, deleted {deleted} rows"))
+
+    def _delete_tokens(self, ids: List[int]) -> int:
+        """Delete the outstanding tokens and their blacklist entries"""
+        with transaction.atomic():
+            blacklisted, _ = BlacklistedToken.objects.filter(token_id__in=ids).delete()
+            outstanding, _ = OutstandingToken.objects.filter(pk__in=ids).delete()
+        return blacklisted + outstanding
+
+    def _delete_codes(self, ids: List[int]) -> int:
+        """Delete the codes"""
+        deleted, _ = Code.objects.filter(pk__in=ids).delete()
+        return deleted
@@ -1,15 +1,40 @@
 from typing import Any
 
 from django.contrib.auth.base_user import BaseUserManager
+from django.db.models import Value
+from django.db.models.functions import Lower
+from django.db.models.lookups import Exact
 from django.utils.translation import gettext_lazy as _
 
+from .helpers import hashing
+
+
+def email_iexact(email: str, field: str = "email") -> Exact:
+    """
+    Match an email case-insensitively as LOWER(field) = LOWER(email), the
+    expression of the `user_email_lower_uniq` index. Unlike `__iexact`, which
+    PostgreSQL runs as UPPER(field::text), the lookup is served by the index.
+    Params:
+        email: The email
+        field: The email field, e.g. "user__email" from a related model
+    Returns: The filter expression
+    """
+    return Exact(Lower(field), Lower(Value(email)))
+
 
 class UserManager(BaseUserManager):
     use_in_migrations = True
 
+    def get_by_email(self, email: str):
+        """Get the user whose email matches, whatever its case"""
+        return self.get(email_iexact(email))
+
+    def get_by_natural_key(self, username: str):
+        return self.get_by_email(username)
+
     def create_user(self, email: str, password: str = None, **extra_fields: Any):
         user = self.model(email=self.normalize_email(email), **extra_fields)
-        user.set_password(password)
+        hashing.set_password(user, password)
         user.save(using=self._db)
         return user
 
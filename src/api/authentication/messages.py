@@ -9,3 +9,4 @@ RESET_PASSWORD_REQUEST_NOT_FOUND = _("Password request was not found")
 RESET_PASSWORD_SUBMIT_INVALID_CODE = _("The code is expired or has already been used")
 USER_NOT_FOUND = _("User not found")
 SUCCESS = _("Success")
+HASHING_UNAVAILABLE = _("The server is busy, please try again later.")
@@ -0,0 +1,20 @@
+# Generated by Django 4.0.2 on 2026-10-17 23:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("authentication", "0002_code"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="tokens_valid_after",
+            field=models.DateTimeField(
+                blank=True, null=True, verbose_name="Tokens valid after"
+            ),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 4.0.2 on 2026-10-18 00:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("authentication", "0003_user_tokens_valid_after"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="code",
+            index=models.Index(
+                fields=["user", "type", "code", "-created"], name="code_lookup_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,19 @@
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    Creating the pg_trgm extension needs the CREATE privilege on the database,
+    and superuser before PostgreSQL 13, where it isn't a trusted extension.
+    Without it, have an administrator run CREATE EXTENSION pg_trgm first. It's
+    a migration of its own, so a failure leaves nothing half applied.
+    """
+
+    dependencies = [
+        ("authentication", "0004_code_lookup_index"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+    ]
@@ -0,0 +1,40 @@
+from django.db import migrations
+
+# The admin searches users with icontains, which PostgreSQL runs as
+# UPPER("column"::text) LIKE UPPER('%term%'), the expression these index
+INDEXES = {
+    "user_email_trgm_idx": "email",
+    "user_full_name_trgm_idx": "full_name",
+}
+
+
+def create_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name, column in INDEXES.items():
+        schema_editor.execute(
+            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} "
+            f'ON "authentication_user" USING gin (UPPER("{column}"::text) gin_trgm_ops)'
+        )
+
+
+def drop_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name in INDEXES:
+        schema_editor.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+
+    # The indexes are built without locking the table against writes, which
+    # can't be done in a transaction
+    atomic = False
+
+    dependencies = [
+        ("authentication", "0005_trigram_extension"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes, elidable=False),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 4.0.2 on 2026-10-18 00:31
+
+import logging
+
+from django.db import migrations, models
+from django.db.models import Count, F
+from django.db.models.functions import Lower
+
+# Appended to the emails of the duplicate accounts, under the reserved
+# .invalid TLD so they can't be delivered or signed in with
+DUPLICATE_SUFFIX = ".duplicate-{}.invalid"
+
+logger = logging.getLogger(__name__)
+
+
+def deduplicate_emails(apps, schema_editor):
+    """
+    Keep one account per email regardless of case, the one signed in to last,
+    else the oldest. The others are deactivated and their email is renamed,
+    so their data stays around for support. The affected ids are logged.
+    """
+    User = apps.get_model("authentication", "User")
+    users = User.objects.annotate(email_lower=Lower("email"))
+    duplicates = list(
+        users.values("email_lower")
+        .annotate(count=Count("pk"))
+        .filter(count__gt=1)
+        .values_list("email_lower", flat=True)
+    )
+    for email in duplicates:
+        accounts = users.filter(email_lower=email).order_by(
+            F("last_login").desc(nulls_last=True), "pk"
+        )
+        kept, *others = accounts
+        for user in others:
+            suffix = DUPLICATE_SUFFIX.format(user.pk)
+            max_length = User._meta.get_field("email").max_length - len(suffix)
+            user.email = f"{user.email[:max_length]}{suffix}"
+            user.is_active = False
+            user.save(update_fields=("email", "is_active"))
+        logger.warning(
+            "Kept user %s, deactivated and renamed the emails of its duplicates: %s",
+            kept.pk,
+            ", ".join(str(user.pk) for user in others),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("authentication", "0006_user_search_trigram_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            deduplicate_emails, migrations.RunPython.noop, elidable=False
+        ),
+        migrations.AddConstraint(
+            model_name="user",
+            constraint=models.UniqueConstraint(
+                Lower("email"),
+                name="user_email_lower_uniq",
+            ),
+        ),
+    ]
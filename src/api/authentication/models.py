@@ -1,6 +1,7 @@
 from django.conf import settings
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin
 from django.db import models
+from django.db.models.functions import Lower
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from django_extensions.db.models import TimeStampedModel
@@ -21,12 +22,22 @@ class User(AbstractBaseUser, PermissionsMixin):
 
     # Meta
     date_joined = models.DateTimeField(_("Date joined"), auto_now_add=True)
+    tokens_valid_after = models.DateTimeField(
+        _("Tokens valid after"), null=True, blank=True
+    )
 
     objects = UserManager()
 
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = []
 
+    class Meta:
+        constraints = [
+            # Emails keep their case but are unique and looked up regardless of
+            # it, see managers.email_iexact
+            models.UniqueConstraint(Lower("email"), name="user_email_lower_uniq"),
+        ]
+
     def __str__(self):
         return self.email
 
@@ -73,3 +84,11 @@ class Code(TimeStampedModel):
     class Meta:
         verbose_name = _("Code")
         ordering = ("-created",)
+        indexes = [
+            # Covers the validate code lookup, which filters on the user, type
+            # and code and takes the latest one
+            models.Index(
+                fields=("user", "type", "code", "-created"),
+                name="code_lookup_idx",
+            )
+        ]
@@ -1,6 +1,5 @@
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
-from rest_framework.validators import UniqueValidator
 from rest_framework_simplejwt import serializers as simplejwt_serializers
 
 from .helpers.tokens import refresh_token
@@ -19,16 +18,10 @@ class UserSerializer(serializers.ModelSerializer):
 
 
 class SignUpSerializer(serializers.Serializer):
-    email = serializers.EmailField(
-        validators=[UniqueValidator(queryset=User.objects.all())],
-    )
+    email = serializers.EmailField()
     full_name = serializers.CharField()
     password = serializers.CharField(trim_whitespace=False)
 
-    def create(self, validated_data):
-        user = User.objects.create_user(**validated_data)
-        return user
-
 
 class SignInSerializer(serializers.Serializer):
     email = serializers.EmailField()
@@ -0,0 +1,33 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .helpers import revocation, user_cache
+from .helpers.settings import api_settings
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=User, dispatch_uid="invalidate_cached_user_on_save")
+@receiver(post_delete, sender=User, dispatch_uid="invalidate_cached_user_on_delete")
+def invalidate_cached_user(sender, instance: User, **kwargs) -> None:
+    """
+    Drop the cached copy of a user whenever it changes. It's dropped once the
+    change is committed, otherwise a concurrent request could cache the row as
+    it was before the change until the entry expires.
+    """
+    user_id = getattr(instance, api_settings.USER_ID_FIELD)
+    transaction.on_commit(lambda: user_cache.invalidate_user(user_id))
+
+
+@receiver(post_save, sender=User, dispatch_uid="sync_user_revocation_on_save")
+@receiver(post_delete, sender=User, dispatch_uid="revoke_user_on_delete")
+def invalidate_user_revocation(sender, instance: User, **kwargs) -> None:
+    """
+    Drop the cached revocation state of a user whenever it changes, e.g. on
+    deactivation or deletion, once the change is committed. The next token
+    check reads the state from the user row again.
+    """
+    user_id = getattr(instance, api_settings.USER_ID_FIELD)
+    transaction.on_commit(lambda: revocation.invalidate_user(user_id))
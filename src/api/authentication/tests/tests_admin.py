@@ -0,0 +1,147 @@
+from typing import Callable
+
+import pytest
+from django.contrib import admin
+from django.db import connection
+from django.test import override_settings
+from django.test.client import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from pytest_mock.plugin import MockerFixture
+from rest_framework import status
+
+from api.authentication.models import Code, User
+from dashboard.admin.pagination import EstimatedCountPaginator
+
+
+@pytest.fixture
+def admin_client(client: Client, make_user: Callable, settings) -> Client:
+    # The admin pages are rendered without running collectstatic
+    settings.STATICFILES_STORAGE = (
+        "django.contrib.staticfiles.storage.StaticFilesStorage"
+    )
+    user = make_user(email="admin@example.com")
+    user.is_staff = user.is_superuser = True
+    user.save()
+    client.force_login(user)
+    return client
+
+
+def get_changelist(client: Client, model: str, **params: str):
+    return client.get(reverse(f"admin:authentication_{model}_changelist"), data=params)
+
+
+def test_code_changelist_queries_dont_grow_with_rows(
+    admin_client: Client, make_user: Callable
+) -> None:
+    """Check if the users of the listed codes are fetched in the same query"""
+
+    def count_queries() -> int:
+        with CaptureQueriesContext(connection) as queries:
+            response = get_changelist(admin_client, "code")
+        assert response.status_code == status.HTTP_200_OK
+        return len(queries)
+
+    Code.objects.create(user=make_user(email="user0@example.com"))
+    queries = count_queries()
+    for index in range(1, 5):
+        Code.objects.create(user=make_user(email=f"user{index}@example.com"))
+
+    assert count_queries() == queries
+
+
+def test_user_changelist_counts_filtered_rows_once(admin_client: Client) -> None:
+    """Check if a search doesn't count the whole table again"""
+    with CaptureQueriesContext(connection) as queries:
+        response = get_changelist(admin_client, "user", q="admin")
+
+    assert response.status_code == status.HTTP_200_OK
+    counts = [query for query in queries if "COUNT(" in query["sql"].upper()]
+    assert len(counts) == 1
+
+
+def test_estimated_count_paginator(make_user: Callable, mocker: MockerFixture) -> None:
+    """Check if the estimate is used only above the threshold"""
+    make_user()
+    paginator = EstimatedCountPaginator(User.objects.order_by("pk"), 10)
+    mocker.patch.object(paginator, "_get_estimate", return_value=5)
+
+    with override_settings(ADMIN_ESTIMATED_COUNT_THRESHOLD=10):
+        assert paginator.count == 1
+
+    paginator = EstimatedCountPaginator(User.objects.order_by("pk"), 10)
+    mocker.patch.object(paginator, "_get_estimate", return_value=500)
+    with override_settings(ADMIN_ESTIMATED_COUNT_THRESHOLD=10):
+        assert paginator.count == 500
+
+
+def test_estimated_count_skips_filtered_changelists(make_user: Callable) -> None:
+    """Check if filtered querysets are counted exactly"""
+    make_user()
+    paginator = EstimatedCountPaginator(User.objects.filter(is_staff=False), 10)
+
+    assert paginator._get_estimate() is None
+    assert paginator.count == 1
+
+
+@pytest.mark.skipif(
+    connection.vendor != "postgresql", reason="The estimate is read from pg_class"
+)
+def test_estimated_count_from_pg_class(make_user: Callable) -> None:
+    """Check if the estimate is read once the table is analyzed"""
+    for index in range(3):
+        make_user(email=f"user{index}@example.com")
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE "authentication_user"')
+
+    paginator = EstimatedCountPaginator(User.objects.order_by("pk"), 10)
+    assert paginator._get_estimate() == 3
+
+
+@override_settings(ADMIN_KEYSET_PAGINATION=True)
+def test_user_changelist_keyset_pagination(
+    admin_client: Client, make_user: Callable, monkeypatch
+) -> None:
+    """Check if the keyset changelist pages by email with next page links"""
+    monkeypatch.setattr(admin.site._registry[User], "list_per_page", 2)
+    for index in range(3):
+        make_user(email=f"user{index}@example.com")
+
+    response = get_changelist(admin_client, "user")
+    cl = response.context["cl"]
+    assert [user.email for user in cl.result_list] == [
+        "admin@example.com",
+        "user0@example.com",
+    ]
+    assert cl.next_page_url == "?after=user0%40example.com"
+    assert cl.next_page_url in response.content.decode().replace("&amp;", "&")
+
+    response = get_changelist(admin_client, "user", after="user0@example.com")
+    cl = response.context["cl"]
+    assert [user.email for user in cl.result_list] == [
+        "user1@example.com",
+        "user2@example.com",
+    ]
+    assert cl.next_page_url is None
+    assert cl.first_page_url == "?"
+
+
+@override_settings(ADMIN_KEYSET_PAGINATION=True)
+def test_code_changelist_keyset_pagination_with_filters(
+    admin_client: Client, make_user: Callable, monkeypatch
+) -> None:
+    """Check if the keyset changelist lists the newest codes first and keeps filters"""
+    monkeypatch.setattr(admin.site._registry[Code], "list_per_page", 1)
+    user = make_user()
+    codes = [Code.objects.create(user=user) for _ in range(3)]
+    Code.objects.filter(pk=codes[1].pk).update(was_used=True)
+
+    response = get_changelist(admin_client, "code", was_used__exact="0")
+    cl = response.context["cl"]
+    assert cl.result_list == [codes[2]]
+    assert cl.next_page_url == f"?after={codes[2].pk}&was_used__exact=0"
+
+    response = get_changelist(
+        admin_client, "code", was_used__exact="0", after=str(codes[2].pk)
+    )
+    assert response.context["cl"].result_list == [codes[0]]
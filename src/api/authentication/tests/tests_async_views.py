@@ -0,0 +1,149 @@
+import importlib
+import json
+from typing import Callable, Iterator
+
+import pytest
+from django.core import mail
+from django.test import override_settings
+from django.test.client import Client
+from django.urls import clear_url_caches, reverse
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+from api.authentication import async_views, messages
+from api.authentication import urls as auth_urls
+from api.authentication.models import Code
+from api.core import urls as core_urls
+
+PASSWORD = "123456"
+
+
+def reload_urls() -> None:
+    importlib.reload(auth_urls)
+    importlib.reload(core_urls)
+    clear_url_caches()
+
+
+@pytest.fixture(autouse=True)
+def use_async_views() -> Iterator[None]:
+    """Route the authentication endpoints to the async views"""
+    with override_settings(AUTH_ASYNC_VIEWS=True):
+        reload_urls()
+        yield
+    reload_urls()
+
+
+def post(client: Client, name: str, data: dict, **kwargs) -> Response:
+    return client.post(
+        path=reverse(name, kwargs=kwargs.pop("url_kwargs", None)),
+        data=json.dumps(data),
+        content_type="application/json",
+        **kwargs,
+    )
+
+
+def test_endpoints_are_routed_to_async_views() -> None:
+    """Check if the setting routes the endpoints to the async views"""
+    assert auth_urls.auth_views is async_views
+
+
+def test_async_signin(client: Client, make_user: Callable) -> None:
+    """Check if the async signin returns the tokens of valid credentials only"""
+    user = make_user(password=PASSWORD)
+
+    response = post(client, "auth:signin", {"email": user.email, "password": PASSWORD})
+    assert response.status_code == status.HTTP_200_OK
+    assert set(response.json()) == {"access_token", "refresh_token"}
+
+    response = post(client, "auth:signin", {"email": user.email, "password": "wrong"})
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    response = post(client, "auth:signin", {"email": "not-an-email"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert set(response.json()) == {"email", "password"}
+
+
+def test_async_signin_rejects_other_methods(client: Client) -> None:
+    """Check if the async views only accept their methods"""
+    response = client.get(reverse("auth:signin"))
+
+    assert response.status_code == status.HTTP_405_METHOD_NOT_ALLOWED
+    assert response.json() == {"detail": 'Method "GET" not allowed.'}
+
+
+def test_async_refresh_and_signout(
+    client: Client, make_user: Callable, make_refresh_token: Callable
+) -> None:
+    """Check if the async refresh rotates the token and signout blacklists it"""
+    user = make_user()
+    refresh_token = make_refresh_token(user)
+
+    response = post(client, "auth:token-refresh", {"refresh": str(refresh_token)})
+    assert response.status_code == status.HTTP_200_OK
+    tokens = response.json()
+
+    # Like simplejwt's view, with its challenge
+    response = post(client, "auth:token-refresh", {"refresh": str(refresh_token)})
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert response["WWW-Authenticate"] == 'Bearer realm="api"'
+
+    response = post(client, "auth:signout", {"refresh_token": tokens["refresh"]})
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert response["WWW-Authenticate"].startswith("Bearer")
+
+    response = post(
+        client,
+        "auth:signout",
+        {"refresh_token": tokens["refresh"]},
+        HTTP_AUTHORIZATION=f"Bearer {tokens['access']}",
+    )
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    assert BlacklistedToken.objects.count() == 2
+
+
+@override_settings(DEFAULT_MESSENGER="EMAIL")
+def test_async_reset_password(client: Client, make_user: Callable) -> None:
+    """Check if the async reset password flow sets the new password"""
+    user = make_user()
+
+    response = post(client, "auth:reset-password-request-code", {"email": user.email})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == messages.SUCCESS
+    code = Code.objects.get(user=user)
+    assert code.code in mail.outbox[0].body
+
+    response = post(
+        client,
+        "auth:reset-password-validate-code",
+        {"email": user.email, "code": code.code},
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+    response = post(
+        client,
+        "auth:reset-password",
+        {"password": "new-password"},
+        url_kwargs=response.json(),
+    )
+    assert response.status_code == status.HTTP_200_OK
+    user.refresh_from_db()
+    assert user.check_password("new-password")
+
+    response = post(
+        client, "auth:reset-password-request-code", {"email": "nobody@example.com"}
+    )
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert response.json() == {"detail": messages.USER_NOT_FOUND}
+
+
+@override_settings(AUTH_THROTTLE_RATES={"signin": {"email": "1/min"}})
+def test_async_signin_throttled(client: Client, make_user: Callable) -> None:
+    """Check if the async signin refuses an email past its rate"""
+    user = make_user(password=PASSWORD)
+    data = {"email": user.email, "password": PASSWORD}
+
+    assert post(client, "auth:signin", data).status_code == status.HTTP_200_OK
+    response = post(client, "auth:signin", data)
+    assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+    assert "Retry-After" in response
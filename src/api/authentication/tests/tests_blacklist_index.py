@@ -0,0 +1,85 @@
+from datetime import timedelta
+from typing import Callable
+
+import pytest
+from django.test import override_settings
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+
+from api.authentication.helpers.blacklist_index import BloomFilter, blacklist_index
+from api.authentication.helpers.tokens import RefreshToken
+
+
+def test_bloom_filter_contains_added_items() -> None:
+    """Check if the bloom filter never gives false negatives"""
+    bloom_filter = BloomFilter(capacity=1000, error_rate=0.001)
+    items = [f"jti-{i}" for i in range(1000)]
+    for item in items:
+        bloom_filter.add(item)
+
+    assert all(item in bloom_filter for item in items)
+    assert sum(f"other-{i}" in bloom_filter for i in range(1000)) < 10
+
+
+def test_refresh_token_not_blacklisted_skips_the_blacklist_table(
+    make_user: Callable,
+    make_refresh_token: Callable,
+    django_assert_num_queries: Callable,
+) -> None:
+    """Check if a token missing from the index is verified without any query"""
+    user = make_user()
+    blacklist_index.might_contain("")
+    refresh_token = make_refresh_token(user)
+    # Caches the user's revocation state
+    RefreshToken(str(refresh_token))
+
+    with django_assert_num_queries(0):
+        RefreshToken(str(refresh_token))
+
+
+def test_refresh_token_blacklisted_by_this_process_is_rejected(
+    make_user: Callable, make_refresh_token: Callable
+) -> None:
+    """Check if a token blacklisted after the index was loaded is rejected"""
+    user = make_user()
+    blacklist_index.might_contain("")
+    refresh_token = make_refresh_token(user)
+
+    refresh_token.blacklist()
+
+    with pytest.raises(TokenError):
+        RefreshToken(str(refresh_token))
+
+
+@override_settings(BLACKLIST_INDEX_POLL_INTERVAL=timedelta(0))
+def test_refresh_token_blacklisted_by_another_process_is_rejected(
+    make_user: Callable, make_refresh_token: Callable
+) -> None:
+    """Check if tokens blacklisted elsewhere are picked up by polling"""
+    user = make_user()
+    blacklist_index.might_contain("")
+    refresh_token = make_refresh_token(user)
+
+    BlacklistedToken.objects.create(
+        token=OutstandingToken.objects.get(jti=refresh_token["jti"])
+    )
+
+    with pytest.raises(TokenError):
+        RefreshToken(str(refresh_token))
+
+
+def test_refresh_token_blacklisted_before_loading_is_rejected(
+    make_user: Callable, make_refresh_token: Callable
+) -> None:
+    """Check if the index is loaded from the blacklist table"""
+    user = make_user()
+    refresh_token = make_refresh_token(user)
+    refresh_token.blacklist()
+    blacklist_index.reset()
+
+    assert blacklist_index.might_contain(refresh_token["jti"])
+    with pytest.raises(TokenError):
+        RefreshToken(str(refresh_token))
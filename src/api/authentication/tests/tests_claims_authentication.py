@@ -0,0 +1,129 @@
+from typing import Callable
+
+import pytest
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.decorators import (
+    api_view,
+    authentication_classes,
+    permission_classes,
+)
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+
+from api.authentication.helpers.claims import ClaimsUser
+from api.authentication.helpers.tokens import AccessToken, ClaimsJWTAuthentication
+
+
+@api_view(("GET",))
+@authentication_classes((ClaimsJWTAuthentication,))
+@permission_classes((IsAuthenticated,))
+def claims_view(request: Request) -> Response:
+    return Response({"id": request.user.id, "email": request.user.email})
+
+
+def test_claims_authentication_builds_user_without_queries(
+    make_user: Callable,
+    make_access_token: Callable,
+    django_assert_num_queries: Callable,
+) -> None:
+    """Check if the claims-only user is built from the token without any query"""
+    user = make_user()
+    access_token = AccessToken(str(make_access_token(user)))
+    # Caches the user's revocation state
+    ClaimsJWTAuthentication().get_user(access_token)
+
+    with django_assert_num_queries(0):
+        token_user = ClaimsJWTAuthentication().get_user(access_token)
+
+    assert isinstance(token_user, ClaimsUser)
+    assert token_user.id == user.id
+    assert token_user.pk == user.pk
+    assert token_user.email == user.email
+    assert token_user.full_name == user.full_name
+    assert token_user.is_authenticated
+    assert not token_user.has_perm("authentication.view_user")
+
+
+def test_claims_authentication_on_view(
+    make_user: Callable,
+    make_access_token: Callable,
+    django_assert_num_queries: Callable,
+) -> None:
+    """Check if a view opting in the claims-only authentication doesn't query the user"""
+    user = make_user()
+    access_token = make_access_token(user)
+    request = APIRequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {access_token}")
+    claims_view(request)
+
+    with django_assert_num_queries(0):
+        response = claims_view(request)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data == {"id": user.id, "email": user.email}
+
+
+def test_claims_authentication_rejects_deactivated_user(
+    make_user: Callable,
+    make_access_token: Callable,
+    django_capture_on_commit_callbacks: Callable,
+) -> None:
+    """Check if tokens of deactivated users are rejected"""
+    user = make_user()
+    access_token = AccessToken(str(make_access_token(user)))
+    ClaimsJWTAuthentication().get_user(access_token)
+
+    user.is_active = False
+    with django_capture_on_commit_callbacks(execute=True):
+        user.save()
+
+    with pytest.raises(AuthenticationFailed):
+        ClaimsJWTAuthentication().get_user(access_token)
+
+    user.is_active = True
+    with django_capture_on_commit_callbacks(execute=True):
+        user.save()
+
+    assert ClaimsJWTAuthentication().get_user(access_token).id == user.id
+
+
+def test_claims_authentication_rejects_deleted_user(
+    make_user: Callable, make_access_token: Callable
+) -> None:
+    """Check if tokens of deleted users are rejected"""
+    user = make_user()
+    access_token = AccessToken(str(make_access_token(user)))
+
+    user.delete()
+
+    with pytest.raises(AuthenticationFailed):
+        ClaimsJWTAuthentication().get_user(access_token)
+
+
+def test_claims_authentication_rejects_deactivated_user_without_cached_state(
+    make_user: Callable, make_access_token: Callable
+) -> None:
+    """Check if a deactivation is enforced even when the revocation state isn't cached"""
+    user = make_user()
+    access_token = AccessToken(str(make_access_token(user)))
+
+    user.is_active = False
+    user.save()
+    cache.clear()
+
+    with pytest.raises(AuthenticationFailed):
+        ClaimsJWTAuthentication().get_user(access_token)
+
+
+def test_claims_authentication_rejects_token_without_user_claim(
+    make_user: Callable, make_access_token: Callable
+) -> None:
+    """Check if a token without the user's id in its claim is rejected"""
+    access_token = AccessToken(str(make_access_token(make_user())))
+    del access_token["user"]["id"]
+
+    with pytest.raises(InvalidToken):
+        ClaimsJWTAuthentication().get_user(access_token)
@@ -0,0 +1,151 @@
+import json
+import smtplib
+from typing import Callable, List, Tuple
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.test import override_settings
+from django.test.client import Client
+from django.urls import reverse
+from rest_framework import status
+
+from api.core.messenger.base import Message
+from api.core.messenger.email import Email
+from api.core.messenger.smtp_pool import pool
+
+User = get_user_model()
+
+
+class FakeSMTP:
+    def __init__(self):
+        self.alive = True
+        self.drop_next_send = False
+
+    def noop(self) -> Tuple[int, bytes]:
+        if not self.alive:
+            raise smtplib.SMTPServerDisconnected()
+        return 250, b"OK"
+
+
+class PooledEmailBackend(EmailBackend):
+    """Delivers to `mail.outbox` through a fake SMTP connection"""
+
+    connections: List[FakeSMTP] = []
+
+    def open(self) -> bool:
+        if getattr(self, "connection", None) is not None:
+            return False
+        self.connection = FakeSMTP()
+        self.connections.append(self.connection)
+        return True
+
+    def close(self) -> None:
+        self.connection = None
+
+    def send_messages(self, messages) -> int:
+        if self.connection.drop_next_send:
+            self.connection.drop_next_send = False
+            raise smtplib.SMTPServerDisconnected()
+        for message in messages:
+            if message.to[0].endswith("@refused.example.com"):
+                raise smtplib.SMTPRecipientsRefused({message.to[0]: (550, b"")})
+        return super().send_messages(messages)
+
+
+def send(count: int = 1) -> None:
+    for index in range(count):
+        Email().send(
+            recipient=f"user{index}@example.com", message="Hi", subject="Hello"
+        )
+
+
+@override_settings(EMAIL_BACKEND=f"{__name__}.PooledEmailBackend")
+def test_emails_reuse_pooled_connections(client: Client, make_user: Callable) -> None:
+    """Check if every email is sent through the same open connection"""
+    PooledEmailBackend.connections.clear()
+    users = [make_user(email=f"user{index}@example.com") for index in range(3)]
+
+    for user in users:
+        response = client.post(
+            path=reverse("auth:reset-password-request-code"),
+            data=json.dumps({"email": user.email}),
+            content_type="application/json",
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+    assert len(mail.outbox) == 3
+    assert len(PooledEmailBackend.connections) == 1
+    stats = pool.stats
+    assert stats["opened"] == 1
+    assert [connection["messages_sent"] for connection in stats["connections"]] == [3]
+
+
+@override_settings(
+    EMAIL_BACKEND=f"{__name__}.PooledEmailBackend", EMAIL_POOL_IDLE_TIMEOUT=-1
+)
+def test_idle_connections_are_closed() -> None:
+    """Check if connections idle for longer than the timeout aren't reused"""
+    PooledEmailBackend.connections.clear()
+    send(2)
+
+    assert len(PooledEmailBackend.connections) == 2
+    assert pool.stats["open"] == 1
+
+
+@override_settings(
+    EMAIL_BACKEND=f"{__name__}.PooledEmailBackend",
+    EMAIL_POOL_HEALTH_CHECK_INTERVAL=-1,
+)
+def test_dead_connections_are_replaced() -> None:
+    """Check if a connection failing its health check is replaced"""
+    PooledEmailBackend.connections.clear()
+    send()
+    PooledEmailBackend.connections[0].alive = False
+    send()
+
+    assert len(PooledEmailBackend.connections) == 2
+    assert len(mail.outbox) == 2
+    assert pool.stats["open"] == 1
+
+
+@override_settings(EMAIL_BACKEND=f"{__name__}.PooledEmailBackend")
+def test_disconnected_sends_are_retried() -> None:
+    """Check if an email is sent again through a new connection when the server hung up"""
+    PooledEmailBackend.connections.clear()
+    send()
+    PooledEmailBackend.connections[0].drop_next_send = True
+    send()
+
+    assert len(PooledEmailBackend.connections) == 2
+    assert len(mail.outbox) == 2
+    assert pool.stats["reconnects"] == 1
+
+
+@override_settings(EMAIL_BACKEND=f"{__name__}.PooledEmailBackend")
+def test_send_many_reports_each_email() -> None:
+    """Check if a batch is sent over one connection with a result per email"""
+    PooledEmailBackend.connections.clear()
+    messages = [
+        Message(recipient="user1@example.com", subject="Hello", message="Hi"),
+        Message(recipient="user2@refused.example.com", subject="Hello", message="Hi"),
+        Message(recipient="user3@example.com", subject="Hello", message="Hi"),
+        Message(recipient="user4@example.com", subject="Hello", message="Hi"),
+    ]
+
+    results = Email().send_many(messages)
+
+    assert [result.message for result in results] == messages
+    assert [result.sent for result in results] == [True, False, True, True]
+    assert isinstance(results[1].error, smtplib.SMTPRecipientsRefused)
+    assert [email.to[0] for email in mail.outbox] == [
+        "user1@example.com",
+        "user3@example.com",
+        "user4@example.com",
+    ]
+    # The connection that refused a recipient is replaced, not the batch's
+    assert len(PooledEmailBackend.connections) == 2
+    assert (
+        sum(connection["messages_sent"] for connection in pool.stats["connections"])
+        == 2
+    )
@@ -0,0 +1,75 @@
+import importlib
+from typing import Callable
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, connection
+from django.db.migrations.executor import MigrationExecutor
+from django.utils import timezone
+
+from api.authentication.managers import email_iexact
+
+User = get_user_model()
+
+deduplication = importlib.import_module(
+    "api.authentication.migrations.0007_user_email_lower_uniq"
+)
+
+
+def test_email_lookup_uses_the_lower_email_index(make_user: Callable) -> None:
+    """Check if the case-insensitive lookup is planned with the functional index"""
+    for index in range(3):
+        make_user(email=f"User{index}@example.com")
+
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            # Small tables are scanned, only check that the index can serve it
+            cursor.execute("SET LOCAL enable_seqscan = off")
+        plan = User.objects.filter(email_iexact("USER1@example.com")).explain()
+
+    assert "user_email_lower_uniq" in plan
+    assert User.objects.get_by_email("USER1@example.com").email == "User1@example.com"
+
+
+def test_emails_are_unique_whatever_their_case(make_user: Callable) -> None:
+    """Check if an email can't be registered again in another case"""
+    make_user(email="john.doe@example.com")
+
+    with pytest.raises(IntegrityError):
+        make_user(email="John.Doe@example.com")
+
+
+@pytest.mark.django_db(transaction=True)
+def test_migration_deduplicates_emails(caplog: pytest.LogCaptureFixture) -> None:
+    """Check if the migration keeps the account signed in to last per email"""
+    executor = MigrationExecutor(connection)
+    executor.migrate([("authentication", "0006_user_search_trigram_indexes")])
+    try:
+        old, last_signed_in, other = (
+            User.objects.create(email=email, last_login=last_login)
+            for email, last_login in (
+                ("john@example.com", None),
+                ("John@Example.com", timezone.now()),
+                ("jane@example.com", None),
+            )
+        )
+        never_signed_in = User.objects.create(email="JANE@example.com")
+    finally:
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    for user in (old, last_signed_in, other, never_signed_in):
+        user.refresh_from_db()
+    assert last_signed_in.email == "John@Example.com" and last_signed_in.is_active
+    assert other.email == "jane@example.com" and other.is_active
+    for duplicate in (old, never_signed_in):
+        suffix = deduplication.DUPLICATE_SUFFIX.format(duplicate.pk)
+        assert duplicate.email.endswith(suffix)
+        assert not duplicate.is_active
+    messages = [record.getMessage() for record in caplog.records]
+    assert any(
+        message.startswith(f"Kept user {last_signed_in.pk},")
+        and message.endswith(f"duplicates: {old.pk}")
+        for message in messages
+    )
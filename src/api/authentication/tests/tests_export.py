@@ -0,0 +1,136 @@
+import csv
+import json
+from io import StringIO
+from pathlib import Path
+from typing import Callable
+
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+from django.test.client import AsyncRequestFactory, Client
+from django.urls import reverse
+from rest_framework import status
+
+from api.authentication import views
+from api.authentication.helpers import export
+from api.authentication.helpers.tokens import RefreshToken
+
+export_endpoint = pytest.mark.skipif(
+    settings.AUTH_ASYNC_VIEWS, reason="The export is only served by the sync views"
+)
+
+
+def get_export(client: Client, token: str, dataset: str, **params: str):
+    return client.get(
+        reverse("auth:export", kwargs={"dataset": dataset}),
+        data=params,
+        HTTP_AUTHORIZATION=f"Bearer {token}",
+    )
+
+
+def test_export_users_command(make_user: Callable) -> None:
+    """Check if the command streams every user as NDJSON without passwords"""
+    users = [make_user(email=f"user{index}@example.com") for index in range(5)]
+    stdout = StringIO()
+
+    call_command("export_users", "--chunk-size=2", stdout=stdout)
+
+    rows = [json.loads(line) for line in stdout.getvalue().splitlines()]
+    assert [row["email"] for row in rows] == [user.email for user in users]
+    assert set(rows[0]) == set(export.DATASETS["users"].columns)
+    assert "password" not in rows[0]
+
+
+def test_export_tokens_command_to_csv(make_user: Callable, tmp_path: Path) -> None:
+    """Check if the refresh tokens are written to a CSV file with their blacklisting"""
+    user = make_user()
+    RefreshToken.for_user(user)
+    RefreshToken.for_user(user).blacklist()
+    path = tmp_path / "tokens.csv"
+
+    call_command("export_users", "--dataset=tokens", "--output=csv", f"--file={path}")
+
+    with open(path, newline="") as stream:
+        rows = list(csv.DictReader(stream))
+    assert [row["user_id"] for row in rows] == [str(user.pk)] * 2
+    assert rows[0]["blacklisted_at"] == ""
+    assert rows[1]["blacklisted_at"] != ""
+    assert "token" not in rows[0]
+
+
+def test_export_chunks_are_buffered(make_user: Callable, monkeypatch) -> None:
+    """Check if the lines are joined into chunks of about the buffer size"""
+    for index in range(3):
+        make_user(email=f"user{index}@example.com")
+    monkeypatch.setattr(export, "BUFFER_SIZE", 100)
+
+    chunks = list(export.export("users", "csv", chunk_size=1))
+
+    assert 1 < len(chunks) < 4
+    assert "".join(chunks).count("\n") == 4
+
+
+@export_endpoint
+def test_export_endpoint_is_restricted_to_staff(
+    client: Client, make_user: Callable, make_access_token: Callable
+) -> None:
+    """Check if only staff users can export"""
+    user = make_user()
+
+    response = get_export(client, make_access_token(user), "users")
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@export_endpoint
+def test_export_endpoint_streams_csv(
+    client: Client, make_user: Callable, make_access_token: Callable
+) -> None:
+    """Check if the endpoint streams the dataset in the requested format"""
+    user = make_user()
+    user.is_staff = True
+    user.save()
+
+    response = get_export(client, make_access_token(user), "users", output="csv")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.streaming
+    assert response["Content-Type"] == "text/csv"
+    assert response["Content-Disposition"] == 'attachment; filename="users.csv"'
+    content = b"".join(response.streaming_content).decode()
+    rows = list(csv.DictReader(StringIO(content)))
+    assert [row["email"] for row in rows] == [user.email]
+
+
+@export_endpoint
+def test_export_endpoint_rejects_unknown_dataset_and_output(
+    client: Client, make_user: Callable, make_access_token: Callable
+) -> None:
+    """Check if unknown datasets are not found and unknown outputs are rejected"""
+    user = make_user()
+    user.is_staff = True
+    user.save()
+    token = make_access_token(user)
+
+    response = get_export(client, token, "passwords")
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    response = get_export(client, token, "users", output="xml")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json() == {"output": ["Must be one of: ndjson, csv."]}
+
+
+def test_export_endpoint_is_not_served_under_asgi(
+    make_user: Callable, make_access_token: Callable
+) -> None:
+    """Check if the export isn't streamed where its queries would fail"""
+    user = make_user()
+    user.is_staff = True
+    user.save()
+    # Extra arguments are sent as ASGI headers
+    request = AsyncRequestFactory().get(
+        "/", authorization=f"Bearer {make_access_token(user)}"
+    )
+
+    response = views.export_dataset(request, dataset="users")
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,218 @@
+import json
+import threading
+import time
+from io import StringIO
+from pathlib import Path
+from typing import Callable
+
+import pytest
+from django.contrib.auth import authenticate, get_user_model
+from django.contrib.auth.hashers import (
+    PBKDF2PasswordHasher,
+    check_password,
+    get_hasher,
+    make_password,
+)
+from django.core.management import call_command
+from django.test import override_settings
+from django.test.client import Client
+from django.urls import reverse
+from rest_framework import status
+
+from api.authentication.helpers import hashing
+from api.authentication.helpers.hashing import HashingExecutor, HashingUnavailable
+
+User = get_user_model()
+
+PASSWORD = "123456"
+
+
+def test_hashing_executor_rejects_when_the_queue_is_full() -> None:
+    """Check if hashes over the pool and queue size are rejected"""
+    executor = HashingExecutor(max_workers=1, max_queue_size=1)
+    release = threading.Event()
+
+    running = executor.submit(release.wait)
+    queued = executor.submit(release.wait)
+    with pytest.raises(HashingUnavailable):
+        executor.submit(release.wait)
+
+    assert executor.stats["queued"] + executor.stats["running"] == 2
+    release.set()
+    running.result()
+    queued.result()
+
+    stats = executor.stats
+    assert stats["submitted"] == 2
+    assert stats["rejected"] == 1
+    assert stats["queued"] == 0
+    assert stats["running"] == 0
+    assert stats["wait_time_max_ms"] > 0
+    assert executor.submit(sum, (1, 2)).result() == 3
+
+
+def test_sync_hashes_share_the_executor_bounds() -> None:
+    """Check if hashes run in the calling thread count against the pool's bounds"""
+    executor = HashingExecutor(max_workers=1, max_queue_size=0)
+    release = threading.Event()
+
+    running = executor.submit(release.wait)
+    with pytest.raises(HashingUnavailable):
+        executor.run(sum, (1, 2))
+
+    release.set()
+    running.result()
+    assert executor.run(threading.get_ident) == threading.get_ident()
+    assert executor.stats["rejected"] == 1
+
+
+def test_sync_hashing_is_bounded_by_the_executor(make_user: Callable) -> None:
+    """Check if sync callers hash within the executor's bounds"""
+    user = make_user()
+    submitted = hashing.executor.stats["submitted"]
+
+    user.password = hashing.make_password(PASSWORD)
+    assert hashing.check_password(user, PASSWORD)
+    assert not hashing.check_password(user, "wrong-password")
+
+    assert hashing.executor.stats["submitted"] == submitted + 3
+
+
+def wait_for(condition: Callable[[], bool], timeout: float = 5.0) -> bool:
+    """Poll the condition until it's true or the timeout expires"""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+@pytest.mark.django_db(transaction=True)
+def test_authenticate_upgrades_outdated_password_hash_in_background(
+    make_user: Callable,
+) -> None:
+    """Check if a hash made with outdated parameters is upgraded after signin"""
+    user = make_user()
+    outdated = PBKDF2PasswordHasher().encode(PASSWORD, "salt", iterations=1000)
+    user.password = outdated
+    user.save()
+
+    assert authenticate(email=user.email, password=PASSWORD) == user
+
+    assert wait_for(lambda: User.objects.get(pk=user.pk).password != outdated)
+    user.refresh_from_db()
+    assert not get_hasher().must_update(user.password)
+    assert authenticate(email=user.email, password=PASSWORD) == user
+
+
+@pytest.mark.django_db(transaction=True)
+def test_password_upgrade_skips_changed_passwords(make_user: Callable) -> None:
+    """Check if the upgrade doesn't overwrite a password changed meanwhile"""
+    user = make_user()
+    outdated = PBKDF2PasswordHasher().encode(PASSWORD, "salt", iterations=1000)
+    User.objects.filter(pk=user.pk).update(password=make_password("new-password"))
+
+    hashing._upgrade_password(user, outdated, PASSWORD)
+
+    user.refresh_from_db()
+    assert user.check_password("new-password")
+
+
+def test_hashers_use_the_calibrated_parameters(tmp_path: Path) -> None:
+    """Check if the calibrated algorithm and parameters hash new passwords"""
+    config = tmp_path / "password_hashers.json"
+    config.write_text(
+        json.dumps(
+            {
+                "algorithm": "scrypt",
+                "hashers": {
+                    "pbkdf2_sha256": {"iterations": 2000},
+                    "scrypt": {"work_factor": 2**10, "block_size": 8},
+                },
+            }
+        )
+    )
+
+    with override_settings(PASSWORD_HASHERS_CONFIG=str(config)):
+        assert get_hasher().iterations == 2000
+        encoded = hashing.make_password(PASSWORD)
+        assert encoded.startswith(f"scrypt${2 ** 10}$")
+        assert check_password(PASSWORD, encoded)
+
+    assert get_hasher().iterations == PBKDF2PasswordHasher.iterations
+
+
+def test_calibrate_password_hashers(tmp_path: Path) -> None:
+    """Check if the calibration writes parameters within the target"""
+    config = tmp_path / "password_hashers.json"
+    output = StringIO()
+
+    call_command(
+        "calibrate_password_hashers",
+        "--algorithm=pbkdf2_sha256",
+        "--target-ms=20",
+        "--samples=3",
+        f"--output={config}",
+        stdout=output,
+    )
+
+    calibration = json.loads(config.read_text())
+    assert calibration["algorithm"] == "pbkdf2_sha256"
+    assert calibration["target_ms"] == 20
+    assert calibration["hashers"]["pbkdf2_sha256"]["iterations"] >= 1000
+    assert "preferring pbkdf2_sha256" in output.getvalue()
+
+
+def test_calibrate_password_hashers_keeps_django_default_cost(tmp_path: Path) -> None:
+    """Check if a target too low for Django's default cost doesn't weaken it"""
+    config = tmp_path / "password_hashers.json"
+    output = StringIO()
+
+    call_command(
+        "calibrate_password_hashers",
+        "--algorithm=pbkdf2_sha256",
+        "--target-ms=0.001",
+        "--samples=1",
+        f"--output={config}",
+        stdout=output,
+    )
+
+    calibration = json.loads(config.read_text())
+    assert calibration["hashers"]["pbkdf2_sha256"]["iterations"] == (
+        PBKDF2PasswordHasher.iterations
+    )
+    assert "default cost is over the target" in output.getvalue()
+
+
+def test_authenticate_with_wrong_password(make_user: Callable) -> None:
+    """Check if a wrong password is rejected"""
+    user = make_user()
+
+    assert authenticate(email=user.email, password="wrong-password") is None
+    assert authenticate(email="unknown@example.com", password=PASSWORD) is None
+
+
+def test_metrics_are_restricted_to_staff(
+    client: Client,
+    make_user: Callable,
+    make_access_token: Callable,
+    django_capture_on_commit_callbacks: Callable,
+) -> None:
+    """Check if only staff users can read the worker metrics"""
+    user = make_user()
+
+    response = client.get(
+        reverse("metrics"), HTTP_AUTHORIZATION=f"Bearer {make_access_token(user)}"
+    )
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    with django_capture_on_commit_callbacks(execute=True):
+        user.is_staff = True
+        user.save()
+
+    response = client.get(
+        reverse("metrics"), HTTP_AUTHORIZATION=f"Bearer {make_access_token(user)}"
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert "password_hashing" in response.json()
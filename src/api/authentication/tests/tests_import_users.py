@@ -0,0 +1,117 @@
+import json
+from io import StringIO
+from pathlib import Path
+from typing import Callable
+from unittest import mock
+
+from django.contrib.auth import get_user_model, hashers
+from django.core.management import call_command
+
+from api.authentication.management.commands.import_users import Command
+
+User = get_user_model()
+
+PASSWORD = "123456"
+
+
+def import_users(*args: str) -> tuple:
+    """
+    Run the import_users command
+    Returns: The command output and the rejected rows
+    """
+    stdout, stderr = StringIO(), StringIO()
+    call_command("import_users", *args, stdout=stdout, stderr=stderr)
+    rejects = [json.loads(line) for line in stderr.getvalue().splitlines()]
+    return stdout.getvalue(), rejects
+
+
+def test_import_users_from_csv(tmp_path: Path, make_user: Callable) -> None:
+    """Check if valid rows are imported in batches and the others are reported"""
+    make_user(email="taken@example.com")
+    path = tmp_path / "users.csv"
+    path.write_text(
+        "email,full_name,password\n"
+        "john@example.com,John Doe,123456\n"
+        "jane@EXAMPLE.com,Jane Doe,123456\n"
+        "invalid-email,Invalid,123456\n"
+        "taken@example.com,Taken,123456\n"
+        "john@example.com,John Again,123456\n"
+        "bob@example.com,Bob,\n"
+    )
+
+    output, rejects = import_users(str(path), "--batch-size=2", "--workers=2")
+
+    assert "Imported 2 users, rejected 4 rows" in output
+    assert {reject["line"]: reject["errors"] for reject in rejects} == {
+        4: {"email": ["Enter a valid email address."]},
+        5: {"email": ["This field must be unique."]},
+        6: {"email": ["This field must be unique."]},
+        7: {"password": ["This field may not be blank."]},
+    }
+    assert all("password" not in reject["row"] for reject in rejects)
+
+    user = User.objects.get(email="jane@example.com")
+    assert user.full_name == "Jane Doe"
+    assert user.check_password(PASSWORD)
+    assert User.objects.get(email="john@example.com").full_name == "John Doe"
+
+
+def test_import_users_from_ndjson(tmp_path: Path, db) -> None:
+    """Check if NDJSON rows are imported and malformed lines are reported"""
+    path = tmp_path / "users.ndjson"
+    path.write_text(
+        json.dumps({"email": "john@example.com", "full_name": "John", "password": "1"})
+        + "\n\nnot json\n[]\n"
+    )
+    rejects_path = tmp_path / "rejects.ndjson"
+
+    output, _ = import_users(str(path), "--workers=1", f"--rejects={rejects_path}")
+
+    assert "Imported 1 users, rejected 2 rows" in output
+    rejects = [json.loads(line) for line in rejects_path.read_text().splitlines()]
+    assert [reject["line"] for reject in rejects] == [3, 4]
+    assert User.objects.get(email="john@example.com").check_password("1")
+
+
+def test_import_users_with_hashed_passwords(tmp_path: Path, db) -> None:
+    """Check if encoded passwords are stored as they are"""
+    encoded = hashers.make_password(PASSWORD)
+    path = tmp_path / "users.csv"
+    path.write_text(
+        "email,full_name,password\n"
+        f"john@example.com,John,{encoded}\n"
+        "jane@example.com,Jane,plain-password\n"
+    )
+
+    output, rejects = import_users(str(path), "--hashed")
+
+    assert "Imported 1 users, rejected 1 rows" in output
+    assert rejects[0]["errors"] == {"password": ["Unknown password hashing algorithm."]}
+    assert User.objects.get(email="john@example.com").password == encoded
+
+
+def test_import_users_rejects_emails_taken_during_the_batch(
+    tmp_path: Path, make_user: Callable
+) -> None:
+    """Check if a signup racing the batch insert rejects its row, not the import"""
+    path = tmp_path / "users.csv"
+    path.write_text(
+        "email,full_name,password\n"
+        "john@example.com,John,123456\n"
+        "jane@example.com,Jane,123456\n"
+    )
+    existing_emails = Command._existing_emails
+
+    def signup_after_lookup(command: Command, users: list) -> set:
+        emails = existing_emails(command, users)
+        if not User.objects.filter(email__iexact="jane@example.com").exists():
+            make_user(email="JANE@example.com", full_name="Jane Signup")
+        return emails
+
+    with mock.patch.object(Command, "_existing_emails", signup_after_lookup):
+        output, rejects = import_users(str(path), "--workers=1")
+
+    assert "Imported 1 users, rejected 1 rows" in output
+    assert [reject["line"] for reject in rejects] == [3]
+    assert User.objects.get(email="john@example.com").full_name == "John"
+    assert User.objects.get(email__iexact="jane@example.com").full_name == "Jane Signup"
@@ -0,0 +1,151 @@
+import json
+from datetime import timedelta
+from typing import Callable
+
+import pytest
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.management import call_command
+from django.test import override_settings
+from django.test.client import Client, RequestFactory
+from django.urls import reverse
+from django.utils import timezone
+from pytest_mock.plugin import MockerFixture
+from rest_framework import status
+
+from api.authentication.models import Code
+from api.core.helpers import outbox
+from api.core.models import OutboundMessage
+
+User = get_user_model()
+
+
+def request_code(client: Client, email: str):
+    return client.post(
+        path=reverse("auth:reset-password-request-code"),
+        data=json.dumps({"email": email}),
+        content_type="application/json",
+    )
+
+
+@override_settings(OUTBOX_ENABLED=True, DEFAULT_MESSENGER="EMAIL")
+def test_reset_password_code_request_is_stored_in_the_outbox(
+    client: Client, user_1: User
+) -> None:
+    """Check if the code is stored in the outbox instead of being sent in the request"""
+    response = request_code(client, user_1.email)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert len(mail.outbox) == 0
+    message = OutboundMessage.objects.get()
+    assert message.messenger == "EMAIL"
+    assert message.recipient == user_1.email
+    assert message.status == OutboundMessage.PENDING_STATUS
+    assert Code.objects.get().code in message.body
+
+
+@override_settings(OUTBOX_ENABLED=True)
+def test_outbox_message_is_rolled_back_with_the_code(
+    client: Client, user_1: User, mocker: MockerFixture
+) -> None:
+    """Check if the message isn't stored when the transaction fails"""
+    mocker.patch.object(outbox, "enqueue", side_effect=RuntimeError)
+
+    with pytest.raises(RuntimeError):
+        request_code(client, user_1.email)
+
+    assert not Code.objects.exists()
+    assert not OutboundMessage.objects.exists()
+
+
+@pytest.mark.django_db(transaction=True)
+@override_settings(OUTBOX_ENABLED=True, DEFAULT_MESSENGER="EMAIL")
+def test_dispatch_outbox_sends_pending_messages(
+    client: Client, make_user: Callable
+) -> None:
+    """Check if the dispatcher sends the stored messages and records the delivery"""
+    users = [make_user(email=f"user{index}@example.com") for index in range(3)]
+    for user in users:
+        request_code(client, user.email)
+
+    call_command("dispatch_outbox", "--once", "--batch-size=2")
+
+    assert sorted(email.to[0] for email in mail.outbox) == sorted(
+        user.email for user in users
+    )
+    for message in OutboundMessage.objects.all():
+        assert message.status == OutboundMessage.SENT_STATUS
+        assert message.attempts == 1
+        assert message.sent_at is not None
+        assert message.body == ""
+
+    call_command("dispatch_outbox", "--once")
+    assert len(mail.outbox) == 3
+
+
+class FailingEmailBackend(BaseEmailBackend):
+    def send_messages(self, email_messages) -> int:
+        raise ConnectionError("timed out")
+
+
+@override_settings(
+    OUTBOX_MAX_ATTEMPTS=2, EMAIL_BACKEND=f"{__name__}.FailingEmailBackend"
+)
+def test_failed_messages_are_retried_with_backoff(db) -> None:
+    """Check if failed messages are retried later until they run out of attempts"""
+    message = outbox.enqueue("EMAIL", "john.doe@example.com", "Subject", "Body")
+
+    assert outbox.dispatch(batch_size=10) == 1
+    message.refresh_from_db()
+    assert message.status == OutboundMessage.PENDING_STATUS
+    assert message.attempts == 1
+    assert "timed out" in message.last_error
+    assert message.next_attempt_at > timezone.now() + timedelta(seconds=25)
+
+    # Not due yet
+    assert outbox.dispatch(batch_size=10) == 0
+
+    OutboundMessage.objects.update(next_attempt_at=timezone.now())
+    assert outbox.dispatch(batch_size=10) == 1
+    message.refresh_from_db()
+    assert message.status == OutboundMessage.FAILED_STATUS
+    assert message.attempts == 2
+    assert message.body == ""
+
+
+def test_claimed_messages_are_not_claimed_again(db) -> None:
+    """Check if a message being sent by a dispatcher isn't claimed by another one"""
+    outbox.enqueue("EMAIL", "john.doe@example.com", "Subject", "Body")
+
+    assert len(outbox.claim(batch_size=10)) == 1
+    assert outbox.claim(batch_size=10) == []
+
+
+@override_settings(OUTBOX_MAX_ATTEMPTS=2)
+def test_messages_whose_last_attempt_timed_out_are_failed(db) -> None:
+    """Check if a message isn't claimed past its max attempts"""
+    message = outbox.enqueue("EMAIL", "john.doe@example.com", "Subject", "Body")
+    OutboundMessage.objects.update(attempts=2)
+
+    assert outbox.claim(batch_size=10) == []
+
+    message.refresh_from_db()
+    assert message.status == OutboundMessage.FAILED_STATUS
+    assert message.attempts == 2
+    assert message.body == ""
+
+
+def test_message_body_is_left_out_of_the_admin(rf: RequestFactory) -> None:
+    """Check if the admin doesn't show or edit the message bodies"""
+    model_admin = admin.site._registry[OutboundMessage]
+
+    assert "body" not in model_admin.get_fields(rf.get("/"))
+
+
+def test_retry_delay_backoff() -> None:
+    """Check if the retry delay doubles up to the max delay"""
+    assert outbox.get_retry_delay(1) == timedelta(seconds=30)
+    assert outbox.get_retry_delay(3) == timedelta(minutes=2)
+    assert outbox.get_retry_delay(20) == timedelta(hours=1)
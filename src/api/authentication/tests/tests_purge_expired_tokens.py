@@ -0,0 +1,89 @@
+from datetime import timedelta
+from io import StringIO
+from typing import Callable
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.test import override_settings
+from django.utils import timezone
+from freezegun import freeze_time
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+
+from api.authentication.models import Code
+
+
+def test_purge_expired_tokens(
+    make_user: Callable, make_refresh_token: Callable
+) -> None:
+    """Check if only expired outstanding tokens and their blacklist entries are deleted"""
+    user = make_user()
+    with freeze_time(timezone.now() - timedelta(days=30)):
+        expired_tokens = [make_refresh_token(user) for _ in range(3)]
+    expired_tokens[0].blacklist()
+    valid_token = make_refresh_token(user)
+    valid_token.blacklist()
+
+    out = StringIO()
+    call_command(
+        "purge_expired_tokens", "--only", "tokens", "--batch-size", "2", stdout=out
+    )
+
+    assert list(OutstandingToken.objects.values_list("jti", flat=True)) == [
+        valid_token["jti"]
+    ]
+    assert BlacklistedToken.objects.get().token.jti == valid_token["jti"]
+    assert "tokens: deleted 3 rows" in out.getvalue()
+    assert "tokens: done, deleted 4 rows" in out.getvalue()
+
+
+@override_settings(FORGOT_TIME_EXPIRATION_TIME=timedelta(days=1))
+def test_purge_used_and_expired_codes(
+    user_1, make_reset_password_request: Callable
+) -> None:
+    """Check if used and expired codes are deleted"""
+    used_code = make_reset_password_request(
+        user=user_1, type=Code.RESET_PASSWORD_REQUEST_TYPE, was_used=True
+    )
+    expired_code = make_reset_password_request(
+        user=user_1, type=Code.RESET_PASSWORD_REQUEST_TYPE
+    )
+    expired_code.created = timezone.now() - timedelta(days=2)
+    expired_code.save()
+    valid_code = make_reset_password_request(
+        user=user_1, type=Code.RESET_PASSWORD_REQUEST_TYPE
+    )
+
+    call_command("purge_expired_tokens", "--only", "codes", stdout=StringIO())
+
+    assert list(Code.objects.all()) == [valid_code]
+    assert not Code.objects.filter(pk__in=(used_code.pk, expired_code.pk)).exists()
+
+
+def test_purge_resumes_after_id(user_1, make_reset_password_request: Callable) -> None:
+    """Check if the purge starts after the given primary key"""
+    codes = [
+        make_reset_password_request(
+            user=user_1, type=Code.RESET_PASSWORD_REQUEST_TYPE, was_used=True
+        )
+        for _ in range(3)
+    ]
+
+    call_command(
+        "purge_expired_tokens",
+        "--only",
+        "codes",
+        "--after-id",
+        str(codes[0].pk),
+        stdout=StringIO(),
+    )
+
+    assert list(Code.objects.all()) == [codes[0]]
+
+
+def test_purge_after_id_needs_only(db) -> None:
+    """Check if a resumed purge is refused for both tables at once"""
+    with pytest.raises(CommandError):
+        call_command("purge_expired_tokens", "--after-id", "10", stdout=StringIO())
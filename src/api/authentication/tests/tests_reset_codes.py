@@ -0,0 +1,126 @@
+import json
+import re
+import time
+from datetime import timedelta
+from typing import Callable
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.cache import cache
+from django.test import override_settings
+from django.test.client import Client
+from django.urls import reverse
+from pytest_mock.plugin import MockerFixture
+from rest_framework import status
+from rest_framework.exceptions import NotFound
+
+from api.authentication import messages
+from api.authentication.helpers.reset_codes import HMACResetCodeBackend
+from api.authentication.models import Code
+
+User = get_user_model()
+
+hmac_backend = override_settings(
+    RESET_PASSWORD_CODE_BACKEND="api.authentication.helpers.reset_codes.HMACResetCodeBackend",
+    FORGOT_TIME_EXPIRATION_TIME=timedelta(days=1),
+    DEFAULT_MESSENGER="EMAIL",
+)
+
+
+@hmac_backend
+def test_hmac_codes_are_issued_and_validated_without_writes(
+    client: Client, user_1: User, django_assert_num_queries: Callable
+) -> None:
+    """Check if HMAC codes are sent and validated without storing anything"""
+    response = client.post(
+        path=reverse("auth:reset-password-request-code"),
+        data=json.dumps({"email": user_1.email}),
+        content_type="application/json",
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert not Code.objects.exists()
+    code = re.search(r"\d{6}", mail.outbox[0].body).group()
+
+    with django_assert_num_queries(1) as context:
+        response = client.post(
+            path=reverse("auth:reset-password-validate-code"),
+            data=json.dumps({"email": user_1.email, "code": code}),
+            content_type="application/json",
+        )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert context.captured_queries[0]["sql"].startswith("SELECT")
+    assert set(response.json()) == {"uidb64", "token"}
+
+
+@hmac_backend
+def test_hmac_codes_expire(user_1: User, mocker: MockerFixture) -> None:
+    """Check if HMAC codes are accepted until they expire"""
+    backend = HMACResetCodeBackend()
+    code = backend.make_code(user_1)
+    now = time.time()
+
+    mocker.patch("time.time", return_value=now + timedelta(hours=23).total_seconds())
+    assert backend.consume_code(user_1.email, code) == user_1
+
+    mocker.patch("time.time", return_value=now + timedelta(days=2).total_seconds())
+    with pytest.raises(NotFound):
+        backend.consume_code(user_1.email, code)
+
+
+@hmac_backend
+def test_hmac_codes_are_invalidated_by_password_changes(user_1: User) -> None:
+    """Check if an HMAC code stops working once the password changes"""
+    backend = HMACResetCodeBackend()
+    code = backend.make_code(user_1)
+
+    user_1.set_password("new-password")
+    user_1.save()
+
+    with pytest.raises(NotFound) as exc_info:
+        backend.consume_code(user_1.email, code)
+    assert exc_info.value.detail == messages.RESET_PASSWORD_REQUEST_NOT_FOUND
+
+
+@hmac_backend
+def test_hmac_codes_are_bound_to_the_user(make_user: Callable) -> None:
+    """Check if a user's HMAC code is rejected for another user"""
+    backend = HMACResetCodeBackend()
+    user = make_user(email="john.doe@example.com")
+    other_user = make_user(email="jane.doe@example.com")
+
+    with pytest.raises(NotFound):
+        backend.consume_code(other_user.email, backend.make_code(user))
+    with pytest.raises(NotFound):
+        backend.consume_code("missing@example.com", backend.make_code(user))
+
+
+@hmac_backend
+def test_hmac_codes_are_single_use(user_1: User) -> None:
+    """Check if an HMAC code is rejected once it was used"""
+    backend = HMACResetCodeBackend()
+    code = backend.make_code(user_1)
+
+    assert backend.consume_code(user_1.email, code) == user_1
+    with pytest.raises(NotFound):
+        backend.consume_code(user_1.email, code)
+
+
+@hmac_backend
+def test_hmac_codes_need_an_outstanding_request(
+    user_1: User, mocker: MockerFixture
+) -> None:
+    """Check if a code is rejected once its request is replaced or forgotten"""
+    backend = HMACResetCodeBackend()
+    mocker.patch("secrets.token_hex", side_effect=("1" * 32, "2" * 32))
+    code = backend.make_code(user_1)
+    latest_code = backend.make_code(user_1)
+    assert code != latest_code
+
+    with pytest.raises(NotFound):
+        backend.consume_code(user_1.email, code)
+
+    cache.clear()
+    with pytest.raises(NotFound):
+        backend.consume_code(user_1.email, latest_code)
@@ -1,8 +1,14 @@
 import json
-from typing import Any, Callable
+import os
+import subprocess
+import sys
+from typing import Any, Callable, List
 
+import pytest
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core import mail
+from django.core.exceptions import ImproperlyConfigured
 from django.test import override_settings
 from django.test.client import Client
 from django.urls import reverse
@@ -12,6 +18,7 @@ from rest_framework.response import Response
 
 from api.authentication import messages
 from api.authentication.models import Code
+from api.core.messenger.base import BaseSender
 
 User = get_user_model()
 
@@ -39,7 +46,7 @@ def test_successful_reset_password_email_code_request(
     response = reset_password_code_request(client=client, email=user_1.email)
 
     assert response.status_code == status.HTTP_200_OK
-    assert response.data == messages.SUCCESS
+    assert response.json() == messages.SUCCESS
 
     reset_password_requests = Code.objects.all()
     assert len(reset_password_requests) == 1
@@ -55,6 +62,17 @@ def test_successful_reset_password_email_code_request(
     assert reset_password_request.user.email in mail.outbox[0].recipients()
 
 
+def test_reset_password_code_request_with_email_in_other_case(
+    client: Client, user_1: User
+) -> None:
+    """Check if the code is sent to the user whose email matches whatever its case"""
+    response = reset_password_code_request(client=client, email=user_1.email.upper())
+
+    assert response.status_code == status.HTTP_200_OK
+    assert Code.objects.get().user == user_1
+    assert mail.outbox[0].recipients() == [user_1.email]
+
+
 @override_settings(DEFAULT_MESSENGER="SMS")
 def test_successful_reset_password_sms_code_request(
     client: Client, user_1: User, mocker: MockerFixture
@@ -76,7 +94,7 @@ def test_successful_reset_password_sms_code_request(
     response = reset_password_code_request(client=client, email=user_1.email)
 
     assert response.status_code == status.HTTP_200_OK
-    assert response.data == messages.SUCCESS
+    assert response.json() == messages.SUCCESS
 
     reset_password_requests = Code.objects.all()
     assert len(reset_password_requests) == 1
@@ -91,6 +109,66 @@ def test_successful_reset_password_sms_code_request(
     assert reset_password_request.code in kwargs["Message"]
 
 
+class PigeonSender(BaseSender):
+    sent: List[dict] = []
+
+    @property
+    def service_type(self) -> str:
+        return "PIGEON"
+
+    def send(self, recipient: str, message: str, subject: str) -> None:
+        self.sent.append({"recipient": recipient, "message": message})
+
+    def get_recipient(self, user: User) -> str:
+        return user.full_name
+
+
+@override_settings(
+    DEFAULT_MESSENGER="PIGEON",
+    MESSENGERS={
+        **settings.MESSENGERS,
+        "PIGEON": f"{__name__}.PigeonSender",
+    },
+)
+def test_reset_password_code_request_with_registered_messenger(
+    client: Client, user_1: User
+) -> None:
+    """Check if messengers registered in the settings are used as the default one"""
+    PigeonSender.sent.clear()
+    response = reset_password_code_request(client=client, email=user_1.email)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert len(PigeonSender.sent) == 1
+    assert PigeonSender.sent[0]["recipient"] == user_1.full_name
+    assert Code.objects.get().code in PigeonSender.sent[0]["message"]
+
+
+@override_settings(DEFAULT_MESSENGER="PIGEON")
+def test_reset_password_code_request_with_unregistered_messenger(
+    client: Client, user_1: User
+) -> None:
+    """Check if a default messenger missing from the settings is reported"""
+    with pytest.raises(ImproperlyConfigured):
+        reset_password_code_request(client=client, email=user_1.email)
+
+
+def test_messengers_are_not_imported_at_startup() -> None:
+    """Check if loading the URLconf doesn't import the SMS messenger's SDK"""
+    script = (
+        "import sys, django; django.setup();"
+        "from django.urls import get_resolver; get_resolver().url_patterns;"
+        "print('boto3' in sys.modules)"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script],
+        check=True,
+        capture_output=True,
+        cwd=os.path.dirname(settings.BASE_DIR),
+        text=True,
+    ).stdout
+    assert output.strip() == "False"
+
+
 def test_invalid_user_reset_password_code_request(
     client: Client, make_user: Callable
 ) -> None:
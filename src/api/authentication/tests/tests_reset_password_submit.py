@@ -2,7 +2,10 @@ import json
 from datetime import timedelta
 from typing import Callable
 
+import pytest
+
 from django.contrib.auth import get_user_model
+from django.db import connection
 from django.test import override_settings
 from django.test.client import Client
 from django.urls import reverse
@@ -13,6 +16,8 @@ from rest_framework import status
 from rest_framework.response import Response
 
 from api.authentication import messages
+from api.authentication.helpers.reset_codes import ModelResetCodeBackend
+from api.authentication.use_cases import ResetPasswordValidateCodeUseCase
 
 User = get_user_model()
 
@@ -77,6 +82,25 @@ def test_successful_reset_password_code_validation(
     assert reset_password_request.was_used
 
 
+def test_reset_password_code_validation_with_email_in_other_case(
+    client: Client, user_1: User, make_reset_password_request: Callable
+) -> None:
+    """Check if the code of the user whose email matches whatever its case is used"""
+    reset_password_request = make_reset_password_request(
+        user=user_1, type=Code.RESET_PASSWORD_REQUEST_TYPE
+    )
+
+    response = reset_password_request_code_validation(
+        client=client,
+        email=user_1.email.upper(),
+        code=reset_password_request.code,
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    reset_password_request.refresh_from_db()
+    assert reset_password_request.was_used
+
+
 def test_wrong_email_reset_password_code_validation(
     client: Client, user_1: User, make_reset_password_request: Callable
 ) -> None:
@@ -157,3 +181,72 @@ def test_reset_password_code_validation_twice(
 
     assert response.status_code == status.HTTP_403_FORBIDDEN
     assert response.json()["detail"] == messages.RESET_PASSWORD_SUBMIT_INVALID_CODE
+
+
+def test_validate_code_lookup_uses_the_code_index(
+    user_1: User, make_reset_password_request: Callable
+) -> None:
+    """Check if the validate code lookup is planned with the composite index"""
+    for _ in range(3):
+        make_reset_password_request(user=user_1, type=Code.RESET_PASSWORD_REQUEST_TYPE)
+
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            # Small tables are scanned, only check that the index can serve it
+            cursor.execute("SET LOCAL enable_seqscan = off")
+        plan = (
+            ModelResetCodeBackend()
+            .filter_requests(user_1.email, "123456")[:1]
+            .explain()
+        )
+
+    assert "code_lookup_idx" in plan
+
+
+def test_validate_code_consumes_the_code_in_one_statement(
+    user_1: User,
+    make_reset_password_request: Callable,
+    django_assert_num_queries: Callable,
+) -> None:
+    """Check if the code is checked and used by one query before loading the user"""
+    reset_password_request = make_reset_password_request(
+        user=user_1, type=Code.RESET_PASSWORD_REQUEST_TYPE
+    )
+
+    with django_assert_num_queries(2) as context:
+        ResetPasswordValidateCodeUseCase().execute(
+            email=user_1.email, code=reset_password_request.code
+        )
+
+    assert context.captured_queries[0]["sql"].startswith("UPDATE")
+    reset_password_request.refresh_from_db()
+    assert reset_password_request.was_used
+
+
+@pytest.mark.parametrize("can_return_rows_from_update", (True, False))
+def test_validate_code_is_consumed_once(
+    user_1: User,
+    make_reset_password_request: Callable,
+    mocker: MockerFixture,
+    can_return_rows_from_update: bool,
+) -> None:
+    """Check if only one of the requests validating the same code uses it"""
+    mocker.patch(
+        "api.authentication.helpers.reset_codes._can_return_rows_from_update",
+        return_value=can_return_rows_from_update,
+    )
+    older_request = make_reset_password_request(
+        user=user_1, type=Code.RESET_PASSWORD_REQUEST_TYPE, code="111111"
+    )
+    reset_password_request = make_reset_password_request(
+        user=user_1, type=Code.RESET_PASSWORD_REQUEST_TYPE, code="111111"
+    )
+    backend = ModelResetCodeBackend()
+
+    assert backend.consume_request(user_1.email, "111111") == user_1.pk
+    assert backend.consume_request(user_1.email, "111111") is None
+    # Only the latest request with the code is used
+    assert dict(Code.objects.values_list("pk", "was_used")) == {
+        reset_password_request.pk: True,
+        older_request.pk: False,
+    }
@@ -140,3 +140,13 @@ def test_signin_into_an_account_with_trimmable_password_trimming_it_unsuccessful
 
     assert response.status_code == status.HTTP_401_UNAUTHORIZED
     assert response.json() == {"detail": messages.WRONG_CREDENTIALS}
+
+
+def test_signin_with_email_in_other_case(client: Client, make_user: Callable) -> None:
+    """Check if the email is matched whatever its case"""
+    user = make_user(email="John.Doe@example.com")
+
+    response = signin(client=client, email="john.doe@EXAMPLE.com", password=PASSWORD)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert set(response.json()) == {"access_token", "refresh_token"}
@@ -0,0 +1,154 @@
+from typing import Callable, List
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+from django.test import override_settings
+from django.test.client import Client
+from django.urls import reverse
+from rest_framework import status
+from rest_framework_simplejwt.exceptions import TokenError
+
+from api.authentication.helpers.jwks import JWKSVerifier
+from api.authentication.helpers.signing import get_jwks
+from api.authentication.helpers.tokens import AccessToken, RefreshToken
+
+PRIVATE_KEYS = {
+    "RS256": lambda: rsa.generate_private_key(public_exponent=65537, key_size=2048),
+    "ES256": lambda: ec.generate_private_key(ec.SECP256R1()),
+    "EdDSA": ed25519.Ed25519PrivateKey.generate,
+}
+
+
+def make_signing_key(kid: str, algorithm: str, private: bool = True) -> dict:
+    private_key = PRIVATE_KEYS[algorithm]()
+    if not private:
+        public_key = private_key.public_key().public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+        return {"kid": kid, "algorithm": algorithm, "public_key": public_key.decode()}
+
+    pem = private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    return {"kid": kid, "algorithm": algorithm, "private_key": pem.decode()}
+
+
+@pytest.mark.parametrize("algorithm", PRIVATE_KEYS)
+def test_tokens_are_signed_with_the_active_key(
+    client: Client,
+    make_user: Callable,
+    make_access_token: Callable,
+    algorithm: str,
+) -> None:
+    """Check if tokens carry the active key's id and authenticate requests"""
+    user = make_user()
+    with override_settings(JWT_SIGNING_KEYS=[make_signing_key("key-1", algorithm)]):
+        token = str(make_access_token(user))
+
+        assert jwt.get_unverified_header(token) == {
+            "alg": algorithm,
+            "kid": "key-1",
+            "typ": "JWT",
+        }
+        response = client.post(
+            reverse("auth:signout-all"), HTTP_AUTHORIZATION=f"Bearer {token}"
+        )
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+
+
+def test_rotated_out_keys_keep_verifying(make_user: Callable) -> None:
+    """Check if tokens signed by a key that was rotated out remain valid"""
+    user = make_user()
+    old_key = make_signing_key("old", "ES256")
+
+    with override_settings(JWT_SIGNING_KEYS=[old_key]):
+        token = str(RefreshToken.for_user(user))
+
+    new_key = make_signing_key("new", "ES256")
+    with override_settings(
+        JWT_SIGNING_KEYS=[old_key, new_key], JWT_ACTIVE_SIGNING_KEY_ID="new"
+    ):
+        assert RefreshToken(token)["user"]["id"] == str(user.pk)
+        assert (
+            jwt.get_unverified_header(str(RefreshToken.for_user(user)))["kid"] == "new"
+        )
+
+    with override_settings(JWT_SIGNING_KEYS=[new_key]):
+        with pytest.raises(TokenError):
+            RefreshToken(token)
+
+
+def test_hmac_tokens_are_accepted_while_switching(make_user: Callable) -> None:
+    """Check if tokens signed before the switch to keys depend on the setting"""
+    user = make_user()
+    token = str(AccessToken.for_user(user))
+    keys: List[dict] = [make_signing_key("key-1", "EdDSA")]
+
+    with override_settings(JWT_SIGNING_KEYS=keys):
+        assert AccessToken(token)["user"]["id"] == str(user.pk)
+
+    with override_settings(JWT_SIGNING_KEYS=keys, JWT_ACCEPT_HMAC_TOKENS=False):
+        with pytest.raises(TokenError):
+            AccessToken(token)
+
+
+def test_jwks_endpoint(client: Client) -> None:
+    """Check if the endpoint serves every public key with caching headers"""
+    keys = [
+        make_signing_key("key-1", "RS256"),
+        make_signing_key("key-2", "ES256", private=False),
+    ]
+    with override_settings(JWT_SIGNING_KEYS=keys):
+        response = client.get(reverse("auth:jwks"))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert "public" in response["Cache-Control"]
+    assert "max-age=" in response["Cache-Control"]
+    jwks = response.json()["keys"]
+    assert [(key["kid"], key["alg"], key["kty"]) for key in jwks] == [
+        ("key-1", "RS256", "RSA"),
+        ("key-2", "ES256", "EC"),
+    ]
+    assert not any("d" in key for key in jwks)
+
+
+def test_jwks_endpoint_without_keys(client: Client) -> None:
+    """Check if no keys are published while tokens are HMAC signed"""
+    response = client.get(reverse("auth:jwks"))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {"keys": []}
+
+
+def test_jwks_verifier_caches_keys(make_user: Callable) -> None:
+    """Check if the verifier parses the key set once and refetches on rotation"""
+    user = make_user()
+    fetches = []
+    keys = [make_signing_key("key-1", "RS256")]
+
+    def fetch(url: str) -> dict:
+        fetches.append(url)
+        return get_jwks()
+
+    verifier = JWKSVerifier("https://example.com/jwks.json", fetch=fetch)
+    verifier.min_refresh_interval = 0
+
+    with override_settings(JWT_SIGNING_KEYS=keys):
+        token = str(AccessToken.for_user(user))
+        assert verifier.verify(token)["user"]["id"] == str(user.pk)
+        assert verifier.verify(token)["user"]["id"] == str(user.pk)
+        assert len(fetches) == 1
+
+    keys.append(make_signing_key("key-2", "ES256"))
+    with override_settings(JWT_SIGNING_KEYS=keys, JWT_ACTIVE_SIGNING_KEY_ID="key-2"):
+        token = str(AccessToken.for_user(user))
+        assert verifier.verify(token)["user"]["id"] == str(user.pk)
+        assert len(fetches) == 2
+
+        with pytest.raises(jwt.InvalidTokenError):
+            verifier.verify(jwt.encode({"sub": "1"}, "secret", algorithm="HS256"))
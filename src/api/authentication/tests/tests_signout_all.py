@@ -0,0 +1,144 @@
+import json
+from datetime import timedelta
+from typing import Callable
+
+import pytest
+from django.core.cache import cache
+from django.test import override_settings
+from django.test.client import Client
+from django.urls import reverse
+from django.utils import timezone
+from freezegun import freeze_time
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, TokenError
+
+from api.authentication.checks import check_auth_cache
+from api.authentication.helpers.tokens import (
+    AccessToken,
+    ClaimsJWTAuthentication,
+    JWTAuthentication,
+    RefreshToken,
+)
+from api.authentication.use_cases import SignoutAllUseCase
+
+
+def signout_all(client: Client, access_token: str = None) -> Response:
+    """
+    Make a request to the signout-all endpoint
+    Args:
+        client: HTTP Client
+        access_token: The access token of the user that is signing out
+    Returns: Signout-all endpoint response
+    """
+    return client.post(
+        path=reverse("auth:signout-all"),
+        content_type="application/json",
+        HTTP_AUTHORIZATION=f"Bearer {access_token}" if access_token else None,
+    )
+
+
+def refresh(client: Client, refresh_token: str) -> Response:
+    return client.post(
+        path=reverse("auth:token-refresh"),
+        data=json.dumps({"refresh": refresh_token}),
+        content_type="application/json",
+    )
+
+
+def test_view_is_restricted(client: Client) -> None:
+    """Test if the signout-all gives an consistent error message for unauthenticated users"""
+    response = signout_all(client=client)
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_signout_all_revokes_every_token(
+    client: Client, make_user: Callable, make_refresh_token: Callable
+) -> None:
+    """Test if every token issued before the signout-all is rejected"""
+    user = make_user()
+    with freeze_time(timezone.now() - timedelta(minutes=1)):
+        refresh_tokens = [make_refresh_token(user) for _ in range(3)]
+        access_token = str(refresh_tokens[0].access_token)
+
+    response = signout_all(client=client, access_token=access_token)
+
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    user.refresh_from_db()
+    assert user.tokens_valid_after
+    assert signout_all(client=client, access_token=access_token).status_code == (
+        status.HTTP_401_UNAUTHORIZED
+    )
+    for refresh_token in refresh_tokens:
+        response = refresh(client=client, refresh_token=str(refresh_token))
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_tokens_issued_after_signout_all_are_valid(
+    make_user: Callable, make_refresh_token: Callable
+) -> None:
+    """Test if tokens issued after the signout-all are still accepted"""
+    user = make_user()
+    SignoutAllUseCase().execute(user_ids=[user.pk])
+
+    with freeze_time(timezone.now() + timedelta(seconds=1)):
+        refresh_token = make_refresh_token(user)
+        access_token = AccessToken(str(refresh_token.access_token))
+
+        assert RefreshToken(str(refresh_token))
+        assert JWTAuthentication().get_user(access_token) == user
+        assert ClaimsJWTAuthentication().get_user(access_token).pk == user.pk
+
+
+def test_signout_all_with_deactivation(
+    make_user: Callable, make_refresh_token: Callable
+) -> None:
+    """Test if deactivating users revokes their tokens on every authentication path"""
+    users = [make_user(email=f"user{i}@example.com") for i in range(2)]
+    with freeze_time(timezone.now() - timedelta(minutes=1)):
+        refresh_tokens = [make_refresh_token(user) for user in users]
+        access_tokens = [
+            AccessToken(str(refresh_token.access_token))
+            for refresh_token in refresh_tokens
+        ]
+
+    SignoutAllUseCase().execute(user_ids=[user.pk for user in users], deactivate=True)
+
+    for user, refresh_token, access_token in zip(users, refresh_tokens, access_tokens):
+        user.refresh_from_db()
+        assert not user.is_active
+        with pytest.raises(TokenError):
+            RefreshToken(str(refresh_token))
+        with pytest.raises(AuthenticationFailed):
+            JWTAuthentication().get_user(access_token)
+        with pytest.raises(AuthenticationFailed):
+            ClaimsJWTAuthentication().get_user(access_token)
+
+
+def test_signout_all_is_enforced_without_cached_state(
+    make_user: Callable, make_refresh_token: Callable
+) -> None:
+    """Test if revoked tokens stay rejected once the revocation state is evicted"""
+    user = make_user()
+    with freeze_time(timezone.now() - timedelta(minutes=1)):
+        refresh_token = make_refresh_token(user)
+        access_token = AccessToken(str(refresh_token.access_token))
+
+    SignoutAllUseCase().execute(user_ids=[user.pk])
+    cache.clear()
+
+    with pytest.raises(TokenError):
+        RefreshToken(str(refresh_token))
+    with pytest.raises(AuthenticationFailed):
+        ClaimsJWTAuthentication().get_user(access_token)
+
+
+def test_process_local_auth_cache_is_warned_outside_development() -> None:
+    """Test if deploying with a cache that isn't shared by the processes is warned about"""
+    assert check_auth_cache(None) == []
+
+    with override_settings(ENVIRONMENT="production"):
+        errors = check_auth_cache(None)
+
+    assert [error.id for error in errors] == ["authentication.W001"]
+    assert not any(error.is_serious() for error in errors)
@@ -2,7 +2,9 @@ import json
 from typing import Callable
 
 from django.contrib.auth import authenticate, get_user_model
+from django.db import connection
 from django.test.client import Client
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.response import Response
@@ -90,6 +92,55 @@ def test_signup_with_email_already_registered(
     assert response.json() == {"email": ["This field must be unique."]}
 
 
+def test_signup_with_email_domain_in_other_case(
+    make_user: Callable, client: Client
+) -> None:
+    """Check if an email that's registered once normalized returns the unique error"""
+    make_user()
+
+    response = signup(
+        client=client,
+        email=EMAIL.replace("example.com", "EXAMPLE.COM"),
+        password=PASSWORD,
+        full_name=FULL_NAME,
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json() == {"email": ["This field must be unique."]}
+
+
+def test_signup_with_email_in_other_case(make_user: Callable, client: Client) -> None:
+    """Check if an email registered in another case returns the unique error"""
+    make_user()
+
+    response = signup(
+        client=client,
+        email=EMAIL.upper(),
+        password=PASSWORD,
+        full_name=FULL_NAME,
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json() == {"email": ["This field must be unique."]}
+    assert User.objects.count() == 1
+
+
+def test_signup_does_not_look_up_the_email(client: Client, db) -> None:
+    """Check if the signup inserts the user without checking the email first"""
+    with CaptureQueriesContext(connection) as queries:
+        response = signup(
+            client=client,
+            email=EMAIL,
+            password=PASSWORD,
+            full_name=FULL_NAME,
+        )
+
+    assert response.status_code == status.HTTP_201_CREATED
+    statements = [query["sql"].split()[0].upper() for query in queries]
+    assert "SELECT" not in statements
+    assert statements.count("INSERT") == 1
+
+
 def test_signup_with_trimmable_password(client: Client, db) -> None:
     """
     Check if the signup with a trimmable password (starting or/and ending with a blank space)
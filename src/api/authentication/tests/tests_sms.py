@@ -0,0 +1,105 @@
+import json
+import os
+import time
+from typing import Generator
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from django.test.client import Client
+from django.urls import reverse
+from pytest_mock.plugin import MockerFixture
+from rest_framework import status
+
+from api.authentication.models import Code
+from api.core.messenger import sms
+from api.core.messenger.base import Message
+from api.core.messenger.local_sns import LocalSNSServer
+
+User = get_user_model()
+
+
+@pytest.fixture
+def sns_server() -> Generator[LocalSNSServer, None, None]:
+    server = LocalSNSServer().start()
+    with override_settings(
+        DEFAULT_MESSENGER="SMS",
+        AWS_SNS_ENDPOINT_URL=server.endpoint_url,
+        AWS_REGION="us-east-1",
+        AWS_ACCESS_KEY="testing",
+        AWS_SECRET_KEY="testing",
+    ):
+        yield server
+    server.stop()
+
+
+def test_sms_reuse_the_client_connections(
+    client: Client, user_1: User, mocker: MockerFixture, sns_server: LocalSNSServer
+) -> None:
+    """Check if every SMS is published through the same client and connection"""
+    mocked_number = "+15555550100"
+    mocker.patch("api.core.messenger.sms.SMS.get_recipient", return_value=mocked_number)
+
+    for _ in range(3):
+        response = client.post(
+            path=reverse("auth:reset-password-request-code"),
+            data=json.dumps({"email": user_1.email}),
+            content_type="application/json",
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+    assert len(sms._clients) == 1
+    assert sns_server.connections == 1
+    assert [message["PhoneNumber"] for message in sns_server.published] == [
+        mocked_number
+    ] * 3
+    messages = [message["Message"] for message in sns_server.published]
+    for code in Code.objects.values_list("code", flat=True):
+        assert any(code in message for message in messages)
+
+
+def test_clients_are_cached_per_credentials(sns_server: LocalSNSServer) -> None:
+    """Check if a client is created per region and credential set"""
+    credentials = {
+        "region_name": "us-east-1",
+        "aws_access_key_id": "testing",
+        "aws_secret_access_key": "testing",
+        "endpoint_url": sns_server.endpoint_url,
+    }
+    client = sms.get_client(**credentials)
+
+    assert sms.get_client(**credentials) is client
+    assert sms.get_client(**{**credentials, "region_name": "eu-west-1"}) is not client
+
+
+def test_clients_are_dropped_after_fork(sns_server: LocalSNSServer) -> None:
+    """Check if a forked process creates its own client"""
+    sms.SMS()
+    assert len(sms._clients) == 1
+
+    pid = os.fork()
+    if pid == 0:
+        os._exit(len(sms._clients))
+    _, exit_status = os.waitpid(pid, 0)
+
+    assert os.WEXITSTATUS(exit_status) == 0
+    assert len(sms._clients) == 1
+
+
+def test_send_many_publishes_concurrently(sns_server: LocalSNSServer) -> None:
+    """Check if a batch of SMS is published concurrently with a result per SMS"""
+    sns_server.latency = 0.2
+    messages = [
+        Message(recipient=f"+1555555010{index}", subject="Notice", message="Hi")
+        for index in range(5)
+    ]
+
+    started_at = time.perf_counter()
+    results = sms.SMS().send_many(messages)
+
+    assert time.perf_counter() - started_at < 0.2 * len(messages) / 2
+    assert [result.message for result in results] == messages
+    assert all(result.sent for result in results)
+    assert sorted(message["PhoneNumber"] for message in sns_server.published) == [
+        message.recipient for message in messages
+    ]
@@ -0,0 +1,185 @@
+import json
+from typing import Callable
+
+import pytest
+from django.test import override_settings
+from django.test.client import Client
+from django.urls import reverse
+from pytest_mock.plugin import MockerFixture
+from rest_framework import status
+from rest_framework.response import Response
+
+from api.authentication.helpers.throttling import (
+    RateLimiter,
+    TokenBucket,
+    parse_rate,
+    rate_limiter,
+)
+
+PASSWORD = "123456"
+
+RATES = {
+    "signin": {"ip": "4/min", "email": "2/min"},
+    "reset_password_request_code": {"ip": "4/hour", "email": "1/hour"},
+}
+
+
+def signin(client: Client, email: str, **kwargs) -> Response:
+    return client.post(
+        path=reverse("auth:signin"),
+        data=json.dumps({"email": email, "password": PASSWORD}),
+        content_type="application/json",
+        **kwargs,
+    )
+
+
+@pytest.mark.parametrize(
+    "rate, expected",
+    (("5/min", (5, 60)), ("100/hour", (100, 3600)), ("1/s", (1, 1))),
+)
+def test_parse_rate(rate: str, expected: tuple) -> None:
+    """Check if the rates are parsed like DRF's"""
+    assert parse_rate(rate) == expected
+
+
+def test_token_bucket_refills(mocker: MockerFixture) -> None:
+    """Check if a token bucket refuses requests until it's refilled"""
+    monotonic = mocker.patch("api.authentication.helpers.throttling.time.monotonic")
+    monotonic.return_value = 100
+    bucket = TokenBucket(limit=2, period=60)
+
+    assert bucket.take() == 0
+    assert bucket.take() == 0
+    assert bucket.take() == pytest.approx(30)
+
+    monotonic.return_value = 130
+    assert bucket.take() == 0
+    assert bucket.take() == pytest.approx(30)
+
+
+@override_settings(AUTH_THROTTLE_RATES=RATES)
+def test_signin_throttled_per_email(client: Client, make_user: Callable) -> None:
+    """Check if signin refuses an email past its rate, with a Retry-After header"""
+    user = make_user(password=PASSWORD)
+
+    for _ in range(2):
+        assert signin(client, user.email).status_code == status.HTTP_200_OK
+
+    response = signin(client, user.email.upper())
+    assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+    assert 0 < int(response["Retry-After"]) <= 60
+
+    other_user = make_user(email="other@email.com", password=PASSWORD)
+    assert signin(client, other_user.email).status_code == status.HTTP_200_OK
+
+
+@override_settings(AUTH_THROTTLE_RATES=RATES)
+def test_signin_throttled_per_ip(client: Client, db) -> None:
+    """Check if signin refuses an IP past its rate, whatever the email"""
+    for index in range(4):
+        response = signin(client, f"user{index}@email.com")
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    response = signin(client, "user5@email.com")
+    assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+
+    response = signin(client, "user5@email.com", REMOTE_ADDR="10.0.0.1")
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@override_settings(AUTH_THROTTLE_RATES=RATES)
+def test_signin_ignores_forwarded_for_without_proxies(client: Client, db) -> None:
+    """Check if a client can't dodge the IP rate by sending X-Forwarded-For"""
+    for index in range(4):
+        signin(client, f"user{index}@email.com", HTTP_X_FORWARDED_FOR=f"10.0.0.{index}")
+
+    response = signin(client, "user5@email.com", HTTP_X_FORWARDED_FOR="10.0.0.5")
+    assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+
+
+@override_settings(AUTH_THROTTLE_RATES=RATES)
+def test_signin_reads_forwarded_for_behind_proxies(
+    client: Client, db, settings
+) -> None:
+    """Check if the client IP is taken from X-Forwarded-For behind a proxy"""
+    settings.REST_FRAMEWORK = {**settings.REST_FRAMEWORK, "NUM_PROXIES": 1}
+    for index in range(4):
+        signin(client, f"user{index}@email.com", HTTP_X_FORWARDED_FOR="10.0.0.1")
+
+    response = signin(client, "user5@email.com", HTTP_X_FORWARDED_FOR="10.0.0.1")
+    assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+
+    response = signin(client, "user5@email.com", HTTP_X_FORWARDED_FOR="10.0.0.2")
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@override_settings(AUTH_THROTTLE_RATES=RATES)
+def test_throttling_shared_between_processes(client: Client, db) -> None:
+    """Check if the requests seen by other workers count through the cache"""
+    for _ in range(2):
+        signin(client, "user@email.com")
+        # Another worker has no token bucket for the email
+        rate_limiter.clear()
+
+    response = signin(client, "user@email.com")
+    assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+
+
+@override_settings(AUTH_THROTTLE_RATES={"signin": {"email": "2/min"}})
+def test_rejected_locally_without_cache(
+    client: Client, mocker: MockerFixture, db
+) -> None:
+    """Check if a key the process already refuses doesn't reach the cache"""
+    for _ in range(3):
+        signin(client, "user@email.com")
+
+    hit_window = mocker.spy(rate_limiter, "_hit_window")
+    response = signin(client, "user@email.com")
+
+    assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+    hit_window.assert_not_called()
+
+
+def test_sliding_window_weights_previous_window(mocker: MockerFixture) -> None:
+    """Check if the requests of the previous window count while it overlaps"""
+    now = mocker.patch("api.authentication.helpers.throttling.time.time")
+    limiter = RateLimiter(max_size=10)
+
+    now.return_value = 60 * 1000 + 50
+    for _ in range(4):
+        assert limiter._hit_window("key", limit=4, period=60) == 0
+
+    # A quarter of the previous window still overlaps: 4 * 0.25 + 3 > 4
+    now.return_value = 60 * 1001 + 45
+    for _ in range(3):
+        assert limiter._hit_window("key", limit=4, period=60) == 0
+    assert limiter._hit_window("key", limit=4, period=60) > 0
+
+
+@override_settings(AUTH_THROTTLE_RATES=RATES)
+def test_reset_password_request_code_throttled(
+    client: Client, make_user: Callable
+) -> None:
+    """Check if the reset password codes sent to an email are limited"""
+    user = make_user()
+
+    def request_code() -> Response:
+        return client.post(
+            path=reverse("auth:reset-password-request-code"),
+            data=json.dumps({"email": user.email}),
+            content_type="application/json",
+        )
+
+    assert request_code().status_code == status.HTTP_200_OK
+    response = request_code()
+    assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+    assert "Retry-After" in response
+
+
+@override_settings(AUTH_THROTTLE_RATES=RATES, AUTH_THROTTLE_ENABLED=False)
+def test_throttling_disabled(client: Client, db) -> None:
+    """Check if the requests aren't limited when throttling is disabled"""
+    for _ in range(5):
+        response = signin(client, "user@email.com")
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert rate_limiter.stats["buckets"] == 0
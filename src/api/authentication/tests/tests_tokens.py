@@ -1,10 +1,17 @@
+from io import StringIO
 from typing import Callable
 
 import jwt
 from django.conf import settings
+from django.core.management import call_command
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
 
 from api.authentication.helpers.settings import api_settings
-from api.authentication.helpers.tokens import AccessToken, RefreshToken
+from api.authentication.helpers.tokens import (
+    AccessToken,
+    RefreshToken,
+    get_tokens_for_user,
+)
 
 
 def test_generated_refresh_token_contains_all_user_information(
@@ -75,3 +82,58 @@ def test_generated_access_token_contains_all_user_information(
         "email": user.email,
         "full_name": user.full_name,
     }
+
+
+def decode(token: str) -> dict:
+    return jwt.decode(
+        token, settings.SIMPLE_JWT.get("SIGNING_KEY"), api_settings.ALGORITHM
+    )
+
+
+def test_token_pair_is_minted_in_a_single_pass(make_user: Callable) -> None:
+    """Check if both tokens share the issued time and the refresh is outstanding"""
+    user = make_user()
+
+    tokens = get_tokens_for_user(user)
+    refresh_data = decode(tokens["refresh_token"])
+    access_data = decode(tokens["access_token"])
+
+    assert refresh_data["token_type"] == "refresh"
+    assert access_data["token_type"] == "access"
+    assert refresh_data["iat"] == access_data["iat"]
+    assert refresh_data["user"] == access_data["user"]
+    assert refresh_data["jti"] != access_data["jti"]
+    assert access_data["exp"] - access_data["iat"] == int(
+        api_settings.ACCESS_TOKEN_LIFETIME.total_seconds()
+    )
+    assert refresh_data["exp"] - refresh_data["iat"] == int(
+        api_settings.REFRESH_TOKEN_LIFETIME.total_seconds()
+    )
+
+    outstanding = OutstandingToken.objects.get(jti=refresh_data["jti"])
+    assert outstanding.token == tokens["refresh_token"]
+    assert outstanding.user == user
+
+
+def test_changed_token_is_encoded_again(make_user: Callable) -> None:
+    """Check if changing a minted token doesn't return its former encoding"""
+    user = make_user()
+    refresh_token = RefreshToken.for_user(user)
+    encoded = str(refresh_token)
+    access_token = refresh_token.access_token
+
+    refresh_token.set_jti()
+
+    assert str(refresh_token) != encoded
+    assert decode(str(refresh_token))["jti"] == refresh_token["jti"]
+    assert refresh_token.access_token is not access_token
+
+
+def test_benchmark_tokens() -> None:
+    """Check if the benchmark reports both minting paths"""
+    output = StringIO()
+
+    call_command("benchmark_tokens", "--iterations=10", "--runs=1", stdout=output)
+
+    assert "generic:" in output.getvalue()
+    assert "factory:" in output.getvalue()
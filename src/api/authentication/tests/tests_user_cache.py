@@ -0,0 +1,134 @@
+from typing import Callable
+
+from django.core.cache import cache
+from django.test import override_settings
+
+from api.authentication.helpers import user_cache
+from api.authentication.helpers.tokens import AccessToken, JWTAuthentication
+
+
+def test_jwtauthentication_get_user_is_cached(
+    make_user: Callable,
+    make_access_token: Callable,
+    django_assert_num_queries: Callable,
+) -> None:
+    """Check if the user is only queried once for repeated authentications"""
+    user = make_user()
+    access_token = AccessToken(str(make_access_token(user)))
+    jwt_auth = JWTAuthentication()
+
+    with django_assert_num_queries(1):
+        jwt_auth.get_user(access_token)
+        token_user = jwt_auth.get_user(access_token)
+
+    assert token_user.id == user.id
+    assert token_user.email == user.email
+
+
+def test_cached_user_is_served_from_the_shared_cache(
+    make_user: Callable,
+    make_access_token: Callable,
+    django_assert_num_queries: Callable,
+) -> None:
+    """Check if a worker with an empty process cache uses the shared cache"""
+    user = make_user()
+    access_token = AccessToken(str(make_access_token(user)))
+    jwt_auth = JWTAuthentication()
+    jwt_auth.get_user(access_token)
+
+    user_cache.local_cache.clear()
+
+    with django_assert_num_queries(0):
+        token_user = jwt_auth.get_user(access_token)
+
+    assert token_user.id == user.id
+
+
+def test_cached_user_is_invalidated_on_save(
+    make_user: Callable,
+    make_access_token: Callable,
+    django_capture_on_commit_callbacks: Callable,
+) -> None:
+    """Check if changes to the user are seen by the next authentication"""
+    user = make_user()
+    access_token = AccessToken(str(make_access_token(user)))
+    jwt_auth = JWTAuthentication()
+    jwt_auth.get_user(access_token)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        user.full_name = "Jane Doe"
+        user.save()
+
+    assert jwt_auth.get_user(access_token).full_name == "Jane Doe"
+
+
+def test_cached_user_is_invalidated_on_commit(
+    make_user: Callable,
+    make_access_token: Callable,
+    django_capture_on_commit_callbacks: Callable,
+) -> None:
+    """Check if the cached user is kept until the change is committed"""
+    user = make_user()
+    access_token = AccessToken(str(make_access_token(user)))
+    JWTAuthentication().get_user(access_token)
+
+    with django_capture_on_commit_callbacks() as callbacks:
+        user.is_active = False
+        user.save()
+        # Another request would cache the committed row again right now
+        assert user_cache.get_user(user.id).is_active
+
+    for callback in callbacks:
+        callback()
+    assert user_cache.get_user(user.id) is None
+
+
+def test_cached_user_is_invalidated_on_delete(
+    make_user: Callable,
+    make_access_token: Callable,
+    django_capture_on_commit_callbacks: Callable,
+) -> None:
+    """Check if deleted users are removed from the cache"""
+    user = make_user()
+    access_token = AccessToken(str(make_access_token(user)))
+    JWTAuthentication().get_user(access_token)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        user.delete()
+
+    assert user_cache.get_user(access_token["user"]["id"]) is None
+
+
+def test_cached_user_leaves_out_the_password(
+    make_user: Callable,
+    make_access_token: Callable,
+    django_assert_num_queries: Callable,
+) -> None:
+    """Check if the password hash isn't cached and is loaded on access"""
+    user = make_user()
+    access_token = AccessToken(str(make_access_token(user)))
+    JWTAuthentication().get_user(access_token)
+
+    cached = cache.get(user_cache.USER_CACHE_KEY.format(user.id))
+    assert user.password not in cached
+
+    cached_user = user_cache.get_user(user.id)
+    assert "password" in cached_user.get_deferred_fields()
+    with django_assert_num_queries(1):
+        assert cached_user.password == user.password
+
+
+@override_settings(USER_CACHE_ENABLED=False)
+def test_jwtauthentication_get_user_without_cache(
+    make_user: Callable,
+    make_access_token: Callable,
+    django_assert_num_queries: Callable,
+) -> None:
+    """Check if the user is queried on every authentication when the cache is disabled"""
+    user = make_user()
+    access_token = AccessToken(str(make_access_token(user)))
+    jwt_auth = JWTAuthentication()
+
+    with django_assert_num_queries(2):
+        jwt_auth.get_user(access_token)
+        jwt_auth.get_user(access_token)
@@ -0,0 +1,65 @@
+from datetime import timedelta
+from typing import Callable
+
+import pytest
+from django.test import override_settings
+from freezegun import freeze_time
+from rest_framework_simplejwt import authentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+
+from api.authentication.helpers import verified_tokens
+from api.authentication.helpers.tokens import JWTAuthentication
+
+
+def test_verified_tokens_are_cached(
+    make_user: Callable, make_access_token: Callable, mocker
+) -> None:
+    """Check if a token is only verified on its first use"""
+    user = make_user()
+    raw_token = str(make_access_token(user)).encode()
+    decode = mocker.spy(authentication.JWTAuthentication, "get_validated_token")
+
+    first = JWTAuthentication().get_validated_token(raw_token)
+    second = JWTAuthentication().get_validated_token(raw_token)
+
+    assert second is first
+    assert decode.call_count == 1
+    assert verified_tokens.local_cache.stats["hits"] == 1
+    assert verified_tokens.local_cache.stats["misses"] == 1
+    assert verified_tokens.local_cache.stats["hit_rate"] == 0.5
+
+
+def test_verified_tokens_expire_with_the_token(
+    make_user: Callable, make_access_token: Callable
+) -> None:
+    """Check if a cached token isn't accepted past its expiration"""
+    user = make_user()
+    raw_token = str(make_access_token(user)).encode()
+    JWTAuthentication().get_validated_token(raw_token)
+
+    with freeze_time(timedelta(minutes=10), tick=True):
+        assert verified_tokens.get_token(raw_token) is None
+        with pytest.raises(InvalidToken):
+            JWTAuthentication().get_validated_token(raw_token)
+
+
+def test_invalid_tokens_are_not_cached() -> None:
+    """Check if a token failing validation is rejected every time"""
+    for _ in range(2):
+        with pytest.raises(InvalidToken):
+            JWTAuthentication().get_validated_token(b"not.a.token")
+
+    assert len(verified_tokens.local_cache) == 0
+
+
+@override_settings(VERIFIED_TOKEN_CACHE_ENABLED=False)
+def test_verified_token_cache_can_be_disabled(
+    make_user: Callable, make_access_token: Callable
+) -> None:
+    """Check if tokens aren't cached when the cache is disabled"""
+    user = make_user()
+    raw_token = str(make_access_token(user)).encode()
+
+    JWTAuthentication().get_validated_token(raw_token)
+
+    assert len(verified_tokens.local_cache) == 0
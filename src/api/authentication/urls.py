@@ -1,27 +1,47 @@
+from django.conf import settings
 from django.urls import path
 
-from . import views
+from . import async_views, views
 
 app_name = "auth"
 
+# Under ASGI the async views await hashing, messaging and queries without
+# holding a worker for each request
+if settings.AUTH_ASYNC_VIEWS:
+    auth_views = async_views
+    token_refresh = async_views.token_refresh
+else:
+    auth_views = views
+    token_refresh = views.TokenRefreshView.as_view()
+
+# The export streams query results, which Django 4.0 can't do under ASGI
+export_urlpatterns = (
+    []
+    if settings.AUTH_ASYNC_VIEWS
+    else [path("export/<str:dataset>", views.export_dataset, name="export")]
+)
+
 urlpatterns = [
     path("signup", views.signup, name="signup"),
-    path("signin", views.signin, name="signin"),
-    path("signout", views.signout, name="signout"),
-    path("refresh", views.TokenRefreshView.as_view(), name="token-refresh"),
+    path("signin", auth_views.signin, name="signin"),
+    path("signout", auth_views.signout, name="signout"),
+    path("signout-all", views.signout_all, name="signout-all"),
+    path(".well-known/jwks.json", views.jwks, name="jwks"),
+    *export_urlpatterns,
+    path("refresh", token_refresh, name="token-refresh"),
     path(
         "reset-password/request-code",
-        views.reset_password_request_code,
+        auth_views.reset_password_request_code,
         name="reset-password-request-code",
     ),
     path(
         "reset-password/validate-code",
-        views.reset_password_validate_code,
+        auth_views.reset_password_validate_code,
         name="reset-password-validate-code",
     ),
     path(
         "reset-password/<str:uidb64>/<str:token>",
-        views.reset_password,
+        auth_views.reset_password,
         name="reset-password",
     ),
 ]
@@ -3,4 +3,5 @@ from .reset_password_request_code import ResetPasswordRequestCodeUseCase
 from .reset_password_validate_code import ResetPasswordValidateCodeUseCase
 from .signin import SigninUseCase
 from .signout import SignoutUseCase
+from .signout_all import SignoutAllUseCase
 from .signup import SignupUseCase
@@ -1,8 +1,10 @@
+from asgiref.sync import sync_to_async
 from django.contrib.auth import get_user_model
 from django.contrib.auth.tokens import default_token_generator
 from django.utils.http import urlsafe_base64_decode
 from rest_framework.exceptions import NotFound
 
+from api.authentication.helpers import hashing
 from api.authentication.messages import USER_NOT_FOUND
 from api.core.use_cases.base import BaseUseCase
 
@@ -27,7 +29,7 @@ class ResetPasswordUseCase(BaseUseCase):
             user: The user that will have the password set
             password: The password that is going to be set to the user
         """
-        user.set_password(password)
+        hashing.set_password(user, password)
         user.save()
 
     def execute(self, uidb64: str, token: str, password: str) -> None:
@@ -42,3 +44,17 @@ class ResetPasswordUseCase(BaseUseCase):
         if default_token_generator.check_token(user, token):
             return self._set_password(user, password)
         raise NotFound(USER_NOT_FOUND)
+
+    async def aexecute(self, uidb64: str, token: str, password: str) -> None:
+        """
+        Same as `execute`, awaiting the password hashing
+        Params:
+            uidb64: Encrypted primary key
+            token: Reset password authentication token
+            password: The user's new password
+        """
+        user = await sync_to_async(self._get_user_by_uidb64)(uidb64)
+        if not default_token_generator.check_token(user, token):
+            raise NotFound(USER_NOT_FOUND)
+        await hashing.aset_password(user, password)
+        await sync_to_async(user.save)()
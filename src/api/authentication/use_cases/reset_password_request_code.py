@@ -1,8 +1,12 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.db import transaction
 from rest_framework.exceptions import NotFound
 
+from api.authentication.helpers.reset_codes import get_reset_code_backend
 from api.authentication.messages import USER_NOT_FOUND
-from api.authentication.models import Code
+from api.core.helpers import outbox
 from api.core.helpers.messenger import get_default_messenger
 from api.core.use_cases.base import BaseUseCase
 
@@ -10,19 +14,51 @@ User = get_user_model()
 
 
 class ResetPasswordRequestCodeUseCase(BaseUseCase):
-    def _notify_request(self, reset_password_request: Code) -> None:
+    def _get_notification(self, code: str) -> dict:
+        """
+        Get the message with the password request validation code
+        Params:
+            code: The reset password code
+        Returns: The message subject and body
+        """
+        return {
+            "subject": "Password reset request",
+            "message": f"Hi, This is your password reset code: {code}",
+        }
+
+    def _notify_request(self, user: User, code: str) -> None:
         """
         Send the password request validation code through the default messenger
         Params:
-            reset_password_request: The instance with the reset password request data
+            user: The user that will have its password reseted
+            code: The reset password code
         """
         sender = get_default_messenger()
         sender.send(
-            recipient=sender.get_recipient(reset_password_request.user),
-            subject="Password reset request",
-            message=f"Hi, This is your password reset code: {reset_password_request.code}",
+            recipient=sender.get_recipient(user), **self._get_notification(code)
         )
 
+    def _create_code(self, user: User) -> str:
+        """
+        Issue the reset password code through the code backend. With the outbox
+        enabled, its notification is stored in the same transaction for the
+        dispatcher to send.
+        Params:
+            user: The user that will have its password reseted
+        Returns: The reset password code
+        """
+        with transaction.atomic():
+            code = get_reset_code_backend().make_code(user)
+            if settings.OUTBOX_ENABLED:
+                notification = self._get_notification(code)
+                outbox.enqueue(
+                    messenger=settings.DEFAULT_MESSENGER,
+                    recipient=get_default_messenger().get_recipient(user),
+                    subject=notification["subject"],
+                    body=notification["message"],
+                )
+        return code
+
     def _get_user_by_email(self, email: str) -> User:
         """
         Get the user by its email
@@ -31,18 +67,31 @@ class ResetPasswordRequestCodeUseCase(BaseUseCase):
         Returns: The user with the email field
         """
         try:
-            return User.objects.get(email=email)
+            return User.objects.get_by_email(email)
         except User.DoesNotExist:
             raise NotFound(USER_NOT_FOUND)
 
     def execute(self, email: str) -> None:
         """
-        Create a reset password request instance and send its validation code to the user
+        Issue a reset password code and send it to the user
         Params:
             email: The email address of the user that will have its password reseted
         """
         user = self._get_user_by_email(email)
-        reset_password_request = Code.objects.create(
-            user=user, type=Code.RESET_PASSWORD_REQUEST_TYPE
-        )
-        self._notify_request(reset_password_request)
+        code = self._create_code(user)
+        if not settings.OUTBOX_ENABLED:
+            self._notify_request(user, code)
+
+    async def aexecute(self, email: str) -> None:
+        """
+        Same as `execute`, sending the code outside of Django's sync thread
+        Params:
+            email: The email address of the user that will have its password reseted
+        """
+        user = await sync_to_async(self._get_user_by_email)(email)
+        code = await sync_to_async(self._create_code)(user)
+        if not settings.OUTBOX_ENABLED:
+            # The messenger waits on the network without touching the database
+            await sync_to_async(self._notify_request, thread_sensitive=False)(
+                user, code
+            )
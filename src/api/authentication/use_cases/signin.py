@@ -1,6 +1,8 @@
+from asgiref.sync import sync_to_async
 from django.contrib.auth import authenticate
 from rest_framework.exceptions import AuthenticationFailed
 
+from api.authentication.backends import aauthenticate
 from api.authentication.helpers.tokens import get_tokens_for_user
 from api.core.use_cases.base import BaseUseCase
 
@@ -18,3 +20,16 @@ class SigninUseCase(BaseUseCase):
         if not user:
             raise AuthenticationFailed
         return get_tokens_for_user(user)
+
+    async def aexecute(self, email: str, password: str) -> dict:
+        """
+        Same as `execute`, awaiting the password hashing
+        Params:
+            email: The user's email
+            password: The user's password
+        Returns: The refreshed token
+        """
+        user = await aauthenticate(email=email, password=password)
+        if not user:
+            raise AuthenticationFailed
+        return await sync_to_async(get_tokens_for_user)(user)
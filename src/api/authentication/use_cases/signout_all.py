@@ -0,0 +1,31 @@
+from typing import Any, Iterable
+
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from api.authentication.helpers import revocation, user_cache
+from api.core.use_cases.base import BaseUseCase
+
+User = get_user_model()
+
+
+class SignoutAllUseCase(BaseUseCase):
+    def execute(self, user_ids: Iterable[Any], deactivate: bool = False) -> None:
+        """
+        Revoke every token issued to the users so far with a single write per user,
+        instead of blocklisting their refresh tokens one by one
+        Params:
+            user_ids: The primary keys of the users that will be signed out
+            deactivate: Whether the users are deactivated as well
+        """
+        user_ids = list(user_ids)
+        tokens_valid_after = timezone.now()
+
+        changes = {"tokens_valid_after": tokens_valid_after}
+        if deactivate:
+            changes["is_active"] = False
+        User.objects.filter(pk__in=user_ids).update(**changes)
+
+        # Bulk updates don't send signals, so the caches are synced here
+        revocation.invalidate_users(user_ids)
+        user_cache.invalidate_users(user_ids)
@@ -1,5 +1,11 @@
+from contextlib import nullcontext
+
 from django.contrib.auth import get_user_model
+from django.db import IntegrityError, connection, transaction
+from rest_framework.exceptions import ValidationError
+from rest_framework.validators import UniqueValidator
 
+from api.authentication.managers import email_iexact
 from api.core.use_cases.base import BaseUseCase
 
 User = get_user_model()
@@ -8,9 +14,22 @@ User = get_user_model()
 class SignupUseCase(BaseUseCase):
     def execute(self, **user_data: dict) -> User:
         """
-        Register a new user
+        Register a new user. The email isn't looked up first, the insert relies
+        on its unique constraint, so concurrent signups can't both get through
         Params:
             user_data: The user registration info
         Returns: The registered User instance
+        Raises: ValidationError when the email is already registered
         """
-        return User.objects.create_user(**user_data)
+        # A failed insert aborts the enclosing transaction, so it needs a
+        # savepoint in one. In autocommit it's a single statement on its own.
+        savepoint = (
+            transaction.atomic() if connection.in_atomic_block else nullcontext()
+        )
+        try:
+            with savepoint:
+                return User.objects.create_user(**user_data)
+        except IntegrityError:
+            if not User.objects.filter(email_iexact(user_data["email"])).exists():
+                raise
+            raise ValidationError({"email": [UniqueValidator.message]})
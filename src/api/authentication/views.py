@@ -1,9 +1,19 @@
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from django.views.decorators.cache import cache_control
 from django.views.decorators.csrf import csrf_exempt
 from drf_spectacular.utils import extend_schema
 from rest_framework import status
-from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.decorators import (
+    api_view,
+    authentication_classes,
+    permission_classes,
+    throttle_classes,
+)
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework_simplejwt import views
@@ -11,6 +21,13 @@ from rest_framework_simplejwt import views
 from api.authentication import messages
 
 from . import docs
+from .helpers import export, signing
+from .helpers.throttling import (
+    ResetPasswordRequestCodeThrottle,
+    ResetPasswordThrottle,
+    ResetPasswordValidateCodeThrottle,
+    SigninThrottle,
+)
 from .serializers import (
     RefreshTokenSerializer,
     ResetPasswordRequestCodeSerializer,
@@ -28,6 +45,7 @@ from .use_cases import (
     ResetPasswordUseCase,
     ResetPasswordValidateCodeUseCase,
     SigninUseCase,
+    SignoutAllUseCase,
     SignoutUseCase,
     SignupUseCase,
 )
@@ -51,6 +69,7 @@ def signup(request: Request) -> Response:
 @csrf_exempt
 @api_view(("POST",))
 @permission_classes((AllowAny,))
+@throttle_classes((SigninThrottle,))
 def signin(request: Request) -> Response:
     """Return access and refresh token for the user if the user's email and password are correct"""
     serializer = SignInSerializer(data=request.data)
@@ -66,6 +85,7 @@ def signin(request: Request) -> Response:
 @csrf_exempt
 @api_view(("POST",))
 @permission_classes((AllowAny,))
+@throttle_classes((ResetPasswordRequestCodeThrottle,))
 def reset_password_request_code(request: Request) -> Response:
     """Send a reset password code through the application default messenger (Email/SMS)"""
     serializer = ResetPasswordRequestCodeSerializer(data=request.data)
@@ -78,6 +98,7 @@ def reset_password_request_code(request: Request) -> Response:
 @csrf_exempt
 @api_view(("POST",))
 @permission_classes((AllowAny,))
+@throttle_classes((ResetPasswordValidateCodeThrottle,))
 def reset_password_validate_code(request: Request) -> Response:
     """Return a reset password authentication token if the reset password code is valid"""
     serializer = ResetPasswordValidateCodeRequestSerializer(data=request.data)
@@ -98,6 +119,7 @@ def reset_password_validate_code(request: Request) -> Response:
 @csrf_exempt
 @api_view(("POST",))
 @permission_classes((AllowAny,))
+@throttle_classes((ResetPasswordThrottle,))
 def reset_password(request: Request, uidb64: str, token: str) -> Response:
     """Set a new password to the user if the token is valid"""
     serializer = ResetPasswordSerializer(data=request.data)
@@ -130,3 +152,49 @@ def signout(request: Request) -> Response:
     refresh_token = serializer.data["refresh_token"]
     SignoutUseCase().execute(refresh_token)
     return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+@extend_schema(**docs.signout_all)
+@csrf_exempt
+@api_view(("POST",))
+@permission_classes((IsAuthenticated,))
+def signout_all(request: Request) -> Response:
+    """Revoke every access and refresh token issued to the user so far"""
+    SignoutAllUseCase().execute(user_ids=[request.user.pk])
+    return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+@extend_schema(**docs.jwks)
+@cache_control(public=True, max_age=int(settings.JWKS_MAX_AGE.total_seconds()))
+@api_view(("GET",))
+@authentication_classes(())
+@permission_classes((AllowAny,))
+def jwks(request: Request) -> Response:
+    """Return the public keys that verify the tokens, for services validating them locally"""
+    return Response(signing.get_jwks(), status=status.HTTP_200_OK)
+
+
+@extend_schema(**docs.export)
+@api_view(("GET",))
+@permission_classes((IsAdminUser,))
+def export_dataset(request: Request, dataset: str) -> StreamingHttpResponse:
+    """
+    Stream the users, reset codes or refresh tokens as NDJSON or CSV, as the
+    `output` query parameter asks. The rows are read in chunks while the
+    response is written, so memory use doesn't grow with the table. Django
+    4.0's ASGI handler iterates streaming responses in the event loop, where
+    the queries aren't allowed, so it's only served by the WSGI entry point.
+    """
+    if isinstance(request._request, ASGIRequest) or dataset not in export.DATASETS:
+        raise NotFound()
+    output = request.query_params.get("output", "ndjson")
+    if output not in export.OUTPUT_FORMATS:
+        raise ValidationError(
+            {"output": [f"Must be one of: {', '.join(export.OUTPUT_FORMATS)}."]}
+        )
+
+    response = StreamingHttpResponse(
+        export.export(dataset, output), content_type=export.CONTENT_TYPES[output]
+    )
+    response["Content-Disposition"] = f'attachment; filename="{dataset}.{output}"'
+    return response
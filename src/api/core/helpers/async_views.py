@@ -0,0 +1,152 @@
+import functools
+import json
+from typing import Awaitable, Callable, Iterable, Optional, Sequence, Type
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import AnonymousUser
+from django.core.exceptions import PermissionDenied
+from django.http import Http404, HttpRequest, HttpResponse, JsonResponse
+from rest_framework import exceptions, status
+from rest_framework.authentication import BaseAuthentication
+from rest_framework.permissions import BasePermission
+from rest_framework.throttling import BaseThrottle
+
+AsyncView = Callable[..., Awaitable[HttpResponse]]
+
+
+def _parse(request: HttpRequest) -> dict:
+    """Parse the request body like DRF's default JSON and form parsers"""
+    if request.method in ("GET", "HEAD", "OPTIONS", "DELETE") and not request.body:
+        return {}
+    if request.content_type == "application/json":
+        try:
+            return json.loads(request.body or b"{}")
+        except ValueError as exc:
+            raise exceptions.ParseError(f"JSON parse error - {exc}")
+    if request.content_type in (
+        "application/x-www-form-urlencoded",
+        "multipart/form-data",
+    ):
+        return request.POST
+    raise exceptions.UnsupportedMediaType(request.content_type)
+
+
+async def _authenticate(
+    request: HttpRequest, authentication_classes: Iterable[Type[BaseAuthentication]]
+) -> bool:
+    """
+    Set `request.user` from the first authenticator that accepts the request
+    Returns: Whether an authenticator accepted it
+    """
+    request.user = AnonymousUser()
+    for authentication_class in authentication_classes:
+        # Authenticators query the user, so they run in Django's sync thread
+        result = await sync_to_async(authentication_class().authenticate)(request)
+        if result is not None:
+            request.user, request.auth = result
+            return True
+    return False
+
+
+async def _throttle(
+    request: HttpRequest, throttle_classes: Iterable[Type[BaseThrottle]]
+) -> None:
+    """Raise `Throttled` with the longest wait of the throttles refusing the request"""
+    throttled = False
+    waits = []
+    for throttle_class in throttle_classes:
+        throttle = throttle_class()
+        # Throttles may use the shared cache
+        if not await sync_to_async(throttle.allow_request)(request, None):
+            throttled = True
+            if throttle.wait() is not None:
+                waits.append(throttle.wait())
+    if throttled:
+        raise exceptions.Throttled(max(waits, default=None))
+
+
+def _handle_exception(
+    exc: Exception,
+    authentication_classes: Sequence[Type[BaseAuthentication]],
+    authenticate_header: Optional[str] = None,
+) -> HttpResponse:
+    """
+    Build the same error response as DRF's default exception handler
+    Params:
+        exc: The raised exception
+        authentication_classes: The view's authenticators
+        authenticate_header: The view's `WWW-Authenticate` challenge, the first
+            authenticator's by default
+    """
+    if isinstance(exc, Http404):
+        exc = exceptions.NotFound()
+    elif isinstance(exc, PermissionDenied):
+        exc = exceptions.PermissionDenied()
+    if not isinstance(exc, exceptions.APIException):
+        raise exc
+
+    headers = {}
+    if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+        if authenticate_header is None and authentication_classes:
+            authenticate_header = authentication_classes[0]().authenticate_header(None)
+        if authenticate_header:
+            headers["WWW-Authenticate"] = authenticate_header
+        else:
+            exc.status_code = status.HTTP_403_FORBIDDEN
+    if getattr(exc, "wait", None):
+        headers["Retry-After"] = "%d" % exc.wait
+
+    if isinstance(exc.detail, (list, dict)):
+        data = exc.detail
+    else:
+        data = {"detail": exc.detail}
+    return JsonResponse(data, status=exc.status_code, headers=headers, safe=False)
+
+
+def async_api_view(
+    http_method_names: Sequence[str],
+    authentication_classes: Sequence[Type[BaseAuthentication]] = (),
+    permission_classes: Sequence[Type[BasePermission]] = (),
+    throttle_classes: Sequence[Type[BaseThrottle]] = (),
+    authenticate_header: Optional[str] = None,
+) -> Callable[[AsyncView], AsyncView]:
+    """
+    Async counterpart of DRF's `api_view`, which DRF 3.13 doesn't support.
+    The parsed body is set as `request.data` and errors are rendered as DRF
+    would. The view is CSRF exempt.
+    Params:
+        http_method_names: The allowed methods
+        authentication_classes: The authenticators tried in order
+        permission_classes: The permissions the request must have
+        throttle_classes: The throttles the request must pass
+        authenticate_header: The `WWW-Authenticate` challenge of 401 responses,
+            for views that check credentials without an authenticator
+    """
+
+    def decorator(view: AsyncView) -> AsyncView:
+        @functools.wraps(view)
+        async def wrapped_view(request: HttpRequest, *args, **kwargs) -> HttpResponse:
+            try:
+                if request.method not in http_method_names:
+                    raise exceptions.MethodNotAllowed(request.method)
+
+                is_authenticated = await _authenticate(request, authentication_classes)
+                for permission_class in permission_classes:
+                    if not permission_class().has_permission(request, None):
+                        if authentication_classes and not is_authenticated:
+                            raise exceptions.NotAuthenticated()
+                        raise exceptions.PermissionDenied()
+
+                request.data = _parse(request)
+                await _throttle(request, throttle_classes)
+                return await view(request, *args, **kwargs)
+            except Exception as exc:
+                return _handle_exception(
+                    exc, authentication_classes, authenticate_header
+                )
+
+        # Django 4.0's csrf_exempt would turn the view into a sync one
+        wrapped_view.csrf_exempt = True
+        return wrapped_view
+
+    return decorator
@@ -1,14 +1,40 @@
-from typing import Any
+import functools
+from typing import Any, Type
 
 from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
 
-from api.core.messenger.base import EMAIL_TYPE, SMS_TYPE, BaseSender
-from api.core.messenger.email import Email
-from api.core.messenger.sms import SMS
+from api.core.messenger.base import BaseSender
 
-MESSENGER_MAP = {SMS_TYPE: SMS, EMAIL_TYPE: Email}
+
+@functools.lru_cache()
+def get_messenger_class(service_type: str) -> Type[BaseSender]:
+    """
+    Import the messenger registered for the service type in `MESSENGERS`.
+    Messengers are only imported on first use, so the SDKs of the ones the
+    application doesn't use (e.g. boto3 for SMS) are never loaded.
+    Params:
+        service_type: The messenger service name (e.g. "EMAIL")
+    Returns: The messenger class
+    """
+    try:
+        path = settings.MESSENGERS[service_type]
+    except KeyError:
+        raise ImproperlyConfigured(
+            f"No messenger is registered for {service_type!r} in MESSENGERS"
+        )
+    return import_string(path)
 
 
 def get_default_messenger(*args: Any, **kwargs: Any) -> BaseSender:
     """Get the default messenger service"""
-    return MESSENGER_MAP[settings.DEFAULT_MESSENGER](*args, **kwargs)
+    return get_messenger_class(settings.DEFAULT_MESSENGER)(*args, **kwargs)
+
+
+@receiver(setting_changed)
+def _reset_messengers(setting: str, **kwargs: Any) -> None:
+    if setting == "MESSENGERS":
+        get_messenger_class.cache_clear()
@@ -0,0 +1,18 @@
+from typing import Callable, Dict
+
+_collectors: Dict[str, Callable[[], dict]] = {}
+
+
+def register(name: str, collector: Callable[[], dict]) -> None:
+    """
+    Register a group of process-local metrics
+    Params:
+        name: The name of the metrics group
+        collector: Returns the group's current values
+    """
+    _collectors[name] = collector
+
+
+def collect() -> dict:
+    """Get the current values of every registered metrics group"""
+    return {name: collector() for name, collector in _collectors.items()}
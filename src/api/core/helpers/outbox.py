@@ -0,0 +1,156 @@
+import logging
+from datetime import timedelta
+from itertools import groupby
+from typing import List
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from api.core.helpers.messenger import get_messenger_class
+from api.core.messenger.base import Message
+from api.core.models import OutboundMessage
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue(messenger: str, recipient: str, subject: str, body: str) -> OutboundMessage:
+    """
+    Store a message for the dispatcher to send. Call it in the transaction
+    that writes the data the message is about, so both are saved or neither.
+    Params:
+        messenger: The service type of the messenger that sends it (e.g. "EMAIL")
+        recipient: The address that will receive the message
+        subject: The message subject
+        body: The message body
+    Returns: The stored message
+    """
+    return OutboundMessage.objects.create(
+        messenger=messenger, recipient=recipient, subject=subject, body=body
+    )
+
+
+def claim(batch_size: int) -> List[OutboundMessage]:
+    """
+    Claim the pending messages that are due. Rows locked by another
+    dispatcher are skipped, and the claimed ones aren't due again until the
+    claim times out, so no lock is held while they're sent. Messages whose last
+    attempt timed out, e.g. as their dispatcher died, are failed instead.
+    Params:
+        batch_size: The most messages claimed
+    Returns: The claimed messages
+    """
+    now = timezone.now()
+    due = OutboundMessage.objects.filter(
+        status=OutboundMessage.PENDING_STATUS, next_attempt_at__lte=now
+    )
+    due.filter(attempts__gte=settings.OUTBOX_MAX_ATTEMPTS).update(
+        status=OutboundMessage.FAILED_STATUS,
+        body="",
+        last_error="The last attempt timed out",
+        modified=now,
+    )
+    with transaction.atomic():
+        messages = list(
+            due.select_for_update(skip_locked=True)
+            .filter(attempts__lt=settings.OUTBOX_MAX_ATTEMPTS)
+            .order_by("next_attempt_at")[:batch_size]
+        )
+        OutboundMessage.objects.filter(
+            pk__in=[message.pk for message in messages]
+        ).update(
+            attempts=F("attempts") + 1,
+            next_attempt_at=now + settings.OUTBOX_CLAIM_TIMEOUT,
+        )
+    for message in messages:
+        message.attempts += 1
+    return messages
+
+
+def get_retry_delay(attempts: int) -> timedelta:
+    """
+    Get how long to wait before sending a message again
+    Params:
+        attempts: How many times the message was tried
+    Returns: The exponential backoff, capped at `OUTBOX_MAX_RETRY_DELAY`
+    """
+    delay = settings.OUTBOX_RETRY_DELAY * 2 ** (attempts - 1)
+    return min(delay, settings.OUTBOX_MAX_RETRY_DELAY)
+
+
+def _record_failure(message: OutboundMessage, error: Exception) -> None:
+    logger.warning(
+        "Sending outbound message %s failed (attempt %s)",
+        message.pk,
+        message.attempts,
+        exc_info=error,
+    )
+    message.last_error = repr(error)
+    if message.attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+        message.status = OutboundMessage.FAILED_STATUS
+        message.body = ""
+    else:
+        message.next_attempt_at = timezone.now() + get_retry_delay(message.attempts)
+    message.save(
+        update_fields=("status", "body", "next_attempt_at", "last_error", "modified")
+    )
+
+
+def send(messages: List[OutboundMessage]) -> int:
+    """
+    Send the claimed messages in a batch per messenger and record whether
+    each one was delivered. The bodies of delivered messages are blanked, they
+    hold secrets such as reset password codes.
+    Params:
+        messages: The claimed messages
+    Returns: How many messages were sent
+    """
+    sent = []
+    messages = sorted(messages, key=lambda message: message.messenger)
+    for messenger, group in groupby(messages, key=lambda message: message.messenger):
+        group = list(group)
+        try:
+            sender = get_messenger_class(messenger)()
+        except Exception as error:
+            for message in group:
+                _record_failure(message, error)
+            continue
+
+        results = sender.send_many(
+            [
+                Message(
+                    recipient=message.recipient,
+                    subject=message.subject,
+                    message=message.body,
+                )
+                for message in group
+            ]
+        )
+        for message, result in zip(group, results):
+            if result.sent:
+                sent.append(message.pk)
+            else:
+                _record_failure(message, result.error)
+
+    OutboundMessage.objects.filter(pk__in=sent).update(
+        status=OutboundMessage.SENT_STATUS,
+        body="",
+        sent_at=timezone.now(),
+        last_error="",
+        modified=timezone.now(),
+    )
+    return len(sent)
+
+
+def dispatch(batch_size: int) -> int:
+    """
+    Claim and send a batch of due messages
+    Params:
+        batch_size: The most messages sent
+    Returns: How many messages were claimed
+    """
+    messages = claim(batch_size)
+    if messages:
+        send(messages)
+    return len(messages)
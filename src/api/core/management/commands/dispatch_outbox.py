@@ -0,0 +1,61 @@
+import signal
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from api.core.helpers import outbox
+
+
+class Command(BaseCommand):
+    help = (
+        "Send the messages stored in the outbox, retrying failed ones with "
+        "backoff. Several dispatchers can run side by side."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.OUTBOX_BATCH_SIZE,
+            help="Messages claimed at a time (default: OUTBOX_BATCH_SIZE)",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=1,
+            help="Seconds to wait when no message is due (default: 1)",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Send the due messages and exit instead of polling",
+        )
+
+    def handle(self, *args, batch_size, poll_interval, once, **options):
+        self.stopping = False
+        handlers = {
+            signum: signal.signal(signum, self._stop)
+            for signum in (signal.SIGTERM, signal.SIGINT)
+        }
+
+        total = 0
+        try:
+            while not self.stopping:
+                close_old_connections()
+                claimed = outbox.dispatch(batch_size)
+                total += claimed
+                if claimed < batch_size:
+                    if once:
+                        break
+                    time.sleep(poll_interval)
+        finally:
+            for signum, handler in handlers.items():
+                signal.signal(signum, handler)
+
+        self.stdout.write(f"Dispatched {total} outbound messages")
+
+    def _stop(self, *args) -> None:
+        """Finish the current batch before exiting"""
+        self.stopping = True
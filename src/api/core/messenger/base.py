@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, List, NamedTuple, Optional, Sequence
 
 from django.contrib.auth import get_user_model
 
@@ -9,6 +9,22 @@ EMAIL_TYPE = "EMAIL"
 SMS_TYPE = "SMS"
 
 
+class Message(NamedTuple):
+    recipient: str
+    subject: str
+    message: str
+
+
+class SendResult(NamedTuple):
+    message: Message
+    error: Optional[Exception] = None
+
+    @property
+    def sent(self) -> bool:
+        """Was the message sent?"""
+        return self.error is None
+
+
 class BaseSender(ABC):
     @property
     @abstractmethod
@@ -27,3 +43,20 @@ class BaseSender(ABC):
     def get_recipient(self, user: User, *args: Any, **kwargs: Any) -> str:
         """Get the address that will receive the message"""
         pass
+
+    def send_many(self, messages: Sequence[Message]) -> List[SendResult]:
+        """
+        Send the messages, one at a time unless the messenger batches them
+        Params:
+            messages: The messages to send
+        Returns: The result of each message, in the same order
+        """
+        results = []
+        for message in messages:
+            try:
+                self.send(**message._asdict())
+            except Exception as error:
+                results.append(SendResult(message, error))
+            else:
+                results.append(SendResult(message))
+        return results
@@ -1,9 +1,11 @@
-from typing import Any
+from typing import Any, List, Optional, Sequence
+
 from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.core.mail import send_mail
+from django.core.mail import EmailMultiAlternatives
 
-from api.core.messenger.base import EMAIL_TYPE, BaseSender
+from api.core.messenger.base import EMAIL_TYPE, BaseSender, Message, SendResult
+from api.core.messenger.smtp_pool import pool
 
 User = get_user_model()
 
@@ -20,19 +22,40 @@ class Email(BaseSender):
         message: str,
         subject: str,
         from_email: str = settings.DEFAULT_FROM_EMAIL,
+        html_message: Optional[str] = None,
         *args: Any,
         **kwargs: Any
     ):
-        """Send the email"""
-        send_mail(
+        """Send the email through the process' pooled connections"""
+        email = EmailMultiAlternatives(
             subject=subject,
-            message=message,
+            body=message,
             from_email=from_email,
-            recipient_list=[recipient],
-            fail_silently=False,
-            *args,
+            to=[recipient],
             **kwargs
         )
+        if html_message:
+            email.attach_alternative(html_message, "text/html")
+        pool.send_messages([email])
+
+    def send_many(
+        self,
+        messages: Sequence[Message],
+        from_email: str = settings.DEFAULT_FROM_EMAIL,
+    ) -> List[SendResult]:
+        """Send the emails one after the other over a single pooled connection"""
+        errors = pool.send_many(
+            [
+                EmailMultiAlternatives(
+                    subject=message.subject,
+                    body=message.message,
+                    from_email=from_email,
+                    to=[message.recipient],
+                )
+                for message in messages
+            ]
+        )
+        return [SendResult(message, error) for message, error in zip(messages, errors)]
 
     def get_recipient(self, user: User) -> str:
         """Get the email address of the user that will recieve the email"""
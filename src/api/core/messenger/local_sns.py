@@ -0,0 +1,77 @@
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List
+from urllib.parse import parse_qs
+
+PUBLISH_RESPONSE = """<PublishResponse xmlns="http://sns.amazonaws.com/doc/2010-03-31/">
+  <PublishResult><MessageId>{message_id}</MessageId></PublishResult>
+  <ResponseMetadata><RequestId>{request_id}</RequestId></ResponseMetadata>
+</PublishResponse>"""
+
+
+class LocalSNSHandler(BaseHTTPRequestHandler):
+    # Keeps connections open between requests, as SNS does
+    protocol_version = "HTTP/1.1"
+    # Headers and body are separate writes, Nagle would delay the body until
+    # the client acknowledges the headers
+    disable_nagle_algorithm = True
+
+    def setup(self) -> None:
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_POST(self) -> None:
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        params = {key: values[0] for key, values in parse_qs(body.decode()).items()}
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        with self.server.lock:
+            self.server.published.append(params)
+
+        response = PUBLISH_RESPONSE.format(
+            message_id=uuid.uuid4(), request_id=uuid.uuid4()
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/xml")
+        self.send_header("Content-Length", str(len(response)))
+        self.end_headers()
+        self.wfile.write(response)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+class LocalSNSServer(ThreadingHTTPServer):
+    """
+    Stand-in for the SNS API that accepts `Publish` calls, to send SMS without
+    an AWS account. Point `AWS_SNS_ENDPOINT_URL` at `endpoint_url`.
+    Params:
+        port: The port to listen on, a free one by default
+        latency: Seconds each call takes, to mimic the network round trip
+    """
+
+    daemon_threads = True
+
+    def __init__(self, port: int = 0, latency: float = 0):
+        super().__init__(("127.0.0.1", port), LocalSNSHandler)
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.published: List[dict] = []
+
+    @property
+    def endpoint_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "LocalSNSServer":
+        """Serve the calls from a background thread"""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
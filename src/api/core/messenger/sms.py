@@ -1,11 +1,70 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
 import boto3
+from botocore.config import Config
 from django.conf import settings
 from django.contrib.auth import get_user_model
 
-from api.core.messenger.base import SMS_TYPE, BaseSender
+from api.core.messenger.base import SMS_TYPE, BaseSender, Message, SendResult
 
 User = get_user_model()
 
+_clients: Dict[Tuple[Optional[str], ...], Any] = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(
+    region_name: str,
+    aws_access_key_id: str,
+    aws_secret_access_key: str,
+    endpoint_url: Optional[str] = None,
+) -> Any:
+    """
+    Get the process' SNS client of a region and credential set. Creating a
+    client resolves the credentials and endpoint and opens a new connection
+    pool, so it's done once and the client, which is thread-safe, is shared.
+    Params:
+        region_name: The AWS region
+        aws_access_key_id: The access key
+        aws_secret_access_key: The secret key
+        endpoint_url: Overrides the region's SNS endpoint (e.g. a local stand-in)
+    Returns: The SNS client
+    """
+    key = (region_name, aws_access_key_id, aws_secret_access_key, endpoint_url)
+    client = _clients.get(key)
+    if client is None:
+        # boto3's default session isn't thread-safe, so clients are created
+        # one at a time
+        with _clients_lock:
+            client = _clients.get(key)
+            if client is None:
+                client = _clients[key] = boto3.client(
+                    "sns",
+                    aws_access_key_id=aws_access_key_id,
+                    aws_secret_access_key=aws_secret_access_key,
+                    region_name=region_name,
+                    endpoint_url=endpoint_url,
+                    config=Config(
+                        max_pool_connections=settings.AWS_SNS_MAX_POOL_CONNECTIONS
+                    ),
+                )
+    return client
+
+
+def clear_clients() -> None:
+    """Drop the cached clients, they're created again on next use"""
+    global _clients_lock
+    _clients.clear()
+    _clients_lock = threading.Lock()
+
+
+# A forked worker must not share the parent's sockets or a lock held by one of
+# its threads
+os.register_at_fork(after_in_child=clear_clients)
+
 
 class SMS(BaseSender):
     @property
@@ -14,11 +73,11 @@ class SMS(BaseSender):
         return SMS_TYPE
 
     def __init__(self):
-        self.client = boto3.client(
-            "sns",
+        self.client = get_client(
+            region_name=settings.AWS_REGION,
             aws_access_key_id=settings.AWS_ACCESS_KEY,
             aws_secret_access_key=settings.AWS_SECRET_KEY,
-            region_name=settings.AWS_REGION,
+            endpoint_url=settings.AWS_SNS_ENDPOINT_URL,
         )
 
     def send(self, recipient: str, message: str, subject: str, *args, **kwargs):
@@ -27,6 +86,27 @@ class SMS(BaseSender):
             PhoneNumber=recipient, Message=message, Subject=subject, *args, **kwargs
         )
 
+    def send_many(self, messages: Sequence[Message]) -> List[SendResult]:
+        """
+        Publish the SMS concurrently through the shared client, as many at a
+        time as it keeps connections
+        """
+        if len(messages) < 2:
+            return super().send_many(messages)
+
+        def publish(message: Message) -> SendResult:
+            try:
+                self.send(**message._asdict())
+            except Exception as error:
+                return SendResult(message, error)
+            return SendResult(message)
+
+        max_workers = min(settings.AWS_SNS_MAX_POOL_CONNECTIONS, len(messages))
+        with ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="sms"
+        ) as executor:
+            return list(executor.map(publish, messages))
+
     def get_recipient(self, user: User) -> str:
         """Get the phone number of the user that will receive the SMS"""
         return user.phone_number
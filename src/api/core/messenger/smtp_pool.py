@@ -0,0 +1,230 @@
+import os
+import smtplib
+import threading
+import time
+from contextlib import suppress
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+from api.core.helpers import metrics
+
+
+class PooledConnection:
+    """An open email backend connection and how much it was used"""
+
+    def __init__(self, backend: BaseEmailBackend):
+        self.backend = backend
+        self.messages_sent = 0
+        self.created_at = self.last_used_at = time.monotonic()
+
+    def is_alive(self) -> bool:
+        """Check if the SMTP server still answers on the connection"""
+        connection = getattr(self.backend, "connection", None)
+        if connection is None:
+            # Backends that don't hold a socket (e.g. console, locmem)
+            return True
+        try:
+            return connection.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    def close(self) -> None:
+        """Close the connection, ignoring a server that's already gone"""
+        with suppress(smtplib.SMTPException, OSError):
+            self.backend.close()
+
+
+class SMTPConnectionPool:
+    """
+    Keeps open, authenticated connections of the email backend to send
+    messages without a TLS and AUTH handshake each time. Idle connections are
+    closed when they aren't used for `idle_timeout` seconds and are checked
+    with a NOOP before being reused after `health_check_interval` seconds.
+    Params:
+        max_size: The most idle connections kept open
+        idle_timeout: Seconds after which an idle connection is closed
+        health_check_interval: Seconds after which an idle connection is
+            checked before being reused
+    """
+
+    def __init__(
+        self, max_size: int, idle_timeout: float, health_check_interval: float
+    ):
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Forget every connection without closing them, e.g. in a forked
+        process where they're the parent's
+        """
+        self._lock = threading.Lock()
+        # Most recently used last, so the warmest connection is reused
+        self._idle: List[PooledConnection] = []
+        self._connections: Dict[int, PooledConnection] = {}
+        self.opened = 0
+        self.reconnects = 0
+
+    def _connect(self) -> PooledConnection:
+        backend = get_connection(fail_silently=False)
+        backend.open()
+        connection = PooledConnection(backend)
+        with self._lock:
+            self._connections[id(connection)] = connection
+            self.opened += 1
+        return connection
+
+    def _discard(self, connection: PooledConnection) -> None:
+        with self._lock:
+            self._connections.pop(id(connection), None)
+        connection.close()
+
+    def _acquire(self) -> PooledConnection:
+        now = time.monotonic()
+        expired = []
+        connection = None
+        with self._lock:
+            while self._idle:
+                candidate = self._idle.pop()
+                if now - candidate.last_used_at > self.idle_timeout:
+                    expired.append(candidate)
+                else:
+                    connection = candidate
+                    break
+        for candidate in expired:
+            self._discard(candidate)
+
+        if (
+            connection is not None
+            and now - connection.last_used_at > self.health_check_interval
+            and not connection.is_alive()
+        ):
+            self._discard(connection)
+            connection = None
+        return connection or self._connect()
+
+    def _release(self, connection: PooledConnection) -> None:
+        connection.last_used_at = time.monotonic()
+        with self._lock:
+            if len(self._idle) < self.max_size:
+                self._idle.append(connection)
+                return
+        self._discard(connection)
+
+    def _send(
+        self, connection: PooledConnection, email_messages: Sequence[EmailMessage]
+    ) -> Tuple[PooledConnection, int]:
+        """
+        Send the messages, reconnecting once when the server dropped the
+        connection. The connection is discarded when sending fails.
+        Returns: The connection the messages were sent through and how many were sent
+        """
+        try:
+            try:
+                sent = connection.backend.send_messages(email_messages)
+            except smtplib.SMTPServerDisconnected:
+                self._discard(connection)
+                with self._lock:
+                    self.reconnects += 1
+                connection = self._connect()
+                sent = connection.backend.send_messages(email_messages)
+        except BaseException:
+            self._discard(connection)
+            raise
+
+        connection.messages_sent += sent or 0
+        return connection, sent or 0
+
+    def send_messages(self, email_messages: Sequence[EmailMessage]) -> int:
+        """
+        Send the messages through a pooled connection
+        Params:
+            email_messages: The messages to send
+        Returns: How many messages were sent
+        """
+        connection, sent = self._send(self._acquire(), email_messages)
+        self._release(connection)
+        return sent
+
+    def send_many(
+        self, email_messages: Sequence[EmailMessage]
+    ) -> List[Optional[Exception]]:
+        """
+        Send the messages one by one through the same pooled connection, so a
+        failing message doesn't stop the others
+        Params:
+            email_messages: The messages to send
+        Returns: The error of each message, None for the ones that were sent
+        """
+        errors: List[Optional[Exception]] = []
+        connection = None
+        for email_message in email_messages:
+            try:
+                connection, _ = self._send(
+                    connection or self._acquire(), [email_message]
+                )
+            except Exception as error:
+                connection = None
+                errors.append(error)
+            else:
+                errors.append(None)
+        if connection is not None:
+            self._release(connection)
+        return errors
+
+    def close(self) -> None:
+        """Close every connection"""
+        with self._lock:
+            connections = list(self._connections.values())
+        for connection in connections:
+            connection.close()
+        self.reset()
+
+    @property
+    def stats(self) -> dict:
+        """Get the pool's connections and how many messages each one sent"""
+        now = time.monotonic()
+        with self._lock:
+            return {
+                "max_size": self.max_size,
+                "open": len(self._connections),
+                "idle": len(self._idle),
+                "opened": self.opened,
+                "reconnects": self.reconnects,
+                "connections": [
+                    {
+                        "messages_sent": connection.messages_sent,
+                        "age_s": round(now - connection.created_at, 3),
+                        "idle_s": round(now - connection.last_used_at, 3),
+                    }
+                    for connection in self._connections.values()
+                ],
+            }
+
+
+pool = SMTPConnectionPool(
+    max_size=settings.EMAIL_POOL_MAX_SIZE,
+    idle_timeout=settings.EMAIL_POOL_IDLE_TIMEOUT,
+    health_check_interval=settings.EMAIL_POOL_HEALTH_CHECK_INTERVAL,
+)
+
+# The parent's sockets must not be shared, e.g. with gunicorn's --preload
+os.register_at_fork(after_in_child=pool.reset)
+metrics.register("smtp_connections", lambda: pool.stats)
+
+
+@receiver(setting_changed)
+def _reset_pool(setting: str, **kwargs: Any) -> None:
+    if setting.startswith("EMAIL_"):
+        pool.close()
+        if setting.startswith("EMAIL_POOL_"):
+            pool.max_size = settings.EMAIL_POOL_MAX_SIZE
+            pool.idle_timeout = settings.EMAIL_POOL_IDLE_TIMEOUT
+            pool.health_check_interval = settings.EMAIL_POOL_HEALTH_CHECK_INTERVAL
@@ -0,0 +1,19 @@
+from django.db import migrations
+
+
+def blank_bodies(apps, schema_editor):
+    OutboundMessage = apps.get_model("core", "OutboundMessage")
+    OutboundMessage.objects.filter(status__in=("SENT", "FAILED")).exclude(
+        body=""
+    ).update(body="")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(blank_bodies, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,42 @@
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from django_extensions.db.models import TimeStampedModel
+
+
+class OutboundMessage(TimeStampedModel):
+    PENDING_STATUS = "PENDING"
+    SENT_STATUS = "SENT"
+    FAILED_STATUS = "FAILED"
+    STATUSES = (
+        (PENDING_STATUS, PENDING_STATUS),
+        (SENT_STATUS, SENT_STATUS),
+        (FAILED_STATUS, FAILED_STATUS),
+    )
+
+    messenger = models.CharField(_("Messenger"), max_length=25)
+    recipient = models.CharField(_("Recipient"), max_length=255)
+    subject = models.CharField(_("Subject"), max_length=255)
+    body = models.TextField(_("Body"))
+    status = models.CharField(
+        _("Status"), max_length=10, choices=STATUSES, default=PENDING_STATUS
+    )
+    attempts = models.PositiveSmallIntegerField(_("Attempts"), default=0)
+    next_attempt_at = models.DateTimeField(_("Next attempt at"), default=timezone.now)
+    sent_at = models.DateTimeField(_("Sent at"), null=True, blank=True)
+    last_error = models.TextField(_("Last error"), blank=True)
+
+    def __str__(self):
+        return f"{self.messenger} to {self.recipient}"
+
+    class Meta:
+        verbose_name = _("Outbound message")
+        ordering = ("-created",)
+        indexes = [
+            # The dispatcher only looks for the pending messages that are due
+            models.Index(
+                fields=("next_attempt_at",),
+                condition=models.Q(status="PENDING"),
+                name="outbound_message_due_idx",
+            )
+        ]
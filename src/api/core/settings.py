@@ -153,6 +153,15 @@ if ENVIRONMENT in ("development", "testing"):
     EMAIL_BACKEND = "django.core.mail.backends.console.EmailBackend"
     DEFAULT_FROM_EMAIL = "no-reply@localhost"
 
+# Open SMTP connections each process keeps to send emails without a new TLS
+# and AUTH handshake. Idle ones are closed after the timeout and checked with
+# a NOOP before being reused after the health check interval (in seconds).
+EMAIL_POOL_MAX_SIZE = env.int("EMAIL_POOL_MAX_SIZE", default=4)
+EMAIL_POOL_IDLE_TIMEOUT = env.float("EMAIL_POOL_IDLE_TIMEOUT", default=60)
+EMAIL_POOL_HEALTH_CHECK_INTERVAL = env.float(
+    "EMAIL_POOL_HEALTH_CHECK_INTERVAL", default=10
+)
+
 # Django Rest Framework Settings
 
 REST_FRAMEWORK = {
@@ -164,12 +173,48 @@ REST_FRAMEWORK = {
         "rest_framework.authentication.SessionAuthentication",
     ],
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    # Proxies in front of the app that append to X-Forwarded-For. Throttles key
+    # on REMOTE_ADDR without any, since clients can send the header themselves
+    "NUM_PROXIES": env.int("NUM_PROXIES", default=0),
 }
 
 # Auth
 
 AUTH_USER_MODEL = "authentication.User"
+AUTHENTICATION_BACKENDS = ["api.authentication.backends.ModelBackend"]
 FORGOT_TIME_EXPIRATION_TIME = timedelta(days=1)
+# Issues and checks the reset password codes. The default stores a Code row
+# per request. HMACResetCodeBackend derives the codes from the user, the time
+# and a nonce kept in the auth cache instead, without database writes; its
+# codes also stop working when the password changes.
+RESET_PASSWORD_CODE_BACKEND = env.str(
+    "RESET_PASSWORD_CODE_BACKEND",
+    default="api.authentication.helpers.reset_codes.ModelResetCodeBackend",
+)
+# Serve signin, refresh, signout and reset password with async views, for
+# ASGI deployments (api.core.asgi)
+AUTH_ASYNC_VIEWS = env.bool("AUTH_ASYNC_VIEWS", default=False)
+
+# At most PASSWORD_HASHING_WORKERS password hashes run at once per process,
+# in a thread pool for the async views and in the request's thread for the
+# sync ones; requests are rejected with a 503 once PASSWORD_HASHING_QUEUE_SIZE
+# more hashes are waiting.
+PASSWORD_HASHING_WORKERS = env.int("PASSWORD_HASHING_WORKERS", default=2)
+PASSWORD_HASHING_QUEUE_SIZE = env.int("PASSWORD_HASHING_QUEUE_SIZE", default=16)
+
+# Hasher parameters are calibrated for the host with the
+# calibrate_password_hashers command and written to PASSWORD_HASHERS_CONFIG
+PASSWORD_HASHERS_CONFIG = env.str(
+    "PASSWORD_HASHERS_CONFIG",
+    default=join(dirname(BASE_DIR), "config", "password_hashers.json"),
+)
+PASSWORD_HASHERS = [
+    "api.authentication.hashers.CalibratedPBKDF2PasswordHasher",
+    "api.authentication.hashers.CalibratedScryptPasswordHasher",
+    "api.authentication.hashers.CalibratedArgon2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+]
 
 #
 
@@ -218,14 +263,113 @@ SIMPLE_JWT = {
     "BLACKLIST_AFTER_ROTATION": True,
     "SIGNING_KEY": env.str("JWT_SECRET_KEY", default=SECRET_KEY),
     "AUTH_HEADER_TYPES": ("Bearer", "Token"),
+    "AUTH_TOKEN_CLASSES": ("api.authentication.helpers.tokens.AccessToken",),
 }
 
+# Asymmetric signing keys, a JSON list of {"kid", "algorithm" (RS256, ES256,
+# EdDSA...), "private_key" and/or "public_key"} in PEM. Tokens are signed with
+# JWT_ACTIVE_SIGNING_KEY_ID, or the first private key, and keys kept with only
+# their public part still verify the tokens they signed. Without keys, tokens
+# are signed with the HMAC SIGNING_KEY.
+JWT_SIGNING_KEYS = env.json("JWT_SIGNING_KEYS", default=[])
+JWT_ACTIVE_SIGNING_KEY_ID = env.str("JWT_ACTIVE_SIGNING_KEY_ID", default=None)
+# Keep accepting tokens signed with SIGNING_KEY, e.g. while switching to keys
+JWT_ACCEPT_HMAC_TOKENS = env.bool("JWT_ACCEPT_HMAC_TOKENS", default=True)
+JWKS_MAX_AGE = timedelta(minutes=10)
+
+# Cache
+
+# Token revocation and the auth throttling rely on this cache, so it must be
+# shared by every process outside development and testing, e.g. Redis.
+CACHES = {"default": env.cache("CACHE_URL", default="locmemcache://")}
+# django-environ maps redis:// to django-redis, Django ships its own backend
+if CACHES["default"]["BACKEND"] == "django_redis.cache.RedisCache":
+    CACHES["default"]["BACKEND"] = "django.core.cache.backends.redis.RedisCache"
+
+AUTH_CACHE_ALIAS = "default"
+
+# Resolved users are kept in a per-process LRU in front of the shared cache.
+# The shared tier is invalidated on every user change and never outlives half
+# of the access token lifetime; the process tier can't be invalidated from
+# other workers, so it's kept short.
+USER_CACHE_ENABLED = env.bool("USER_CACHE_ENABLED", default=True)
+USER_CACHE_TIMEOUT = timedelta(minutes=2)
+USER_CACHE_LOCAL_TIMEOUT = timedelta(seconds=10)
+USER_CACHE_LOCAL_MAX_SIZE = 1024
+
+# Blacklisted refresh tokens are indexed in a per-process Bloom filter, so
+# only possible hits are checked against the blacklist table. Tokens
+# blacklisted by other workers are picked up on the next poll.
+BLACKLIST_INDEX_ENABLED = env.bool("BLACKLIST_INDEX_ENABLED", default=True)
+BLACKLIST_INDEX_POLL_INTERVAL = timedelta(seconds=1)
+BLACKLIST_INDEX_CAPACITY = 100000
+BLACKLIST_INDEX_ERROR_RATE = 0.001
+
+# Access tokens verified by a process are kept in a per-process LRU, keyed by
+# a digest of the encoded token, until they expire, so their signature isn't
+# checked on every request. Revocation is still checked on each request, but
+# a token signed with a key removed from JWT_SIGNING_KEYS keeps authenticating
+# on the processes that already verified it until it expires.
+VERIFIED_TOKEN_CACHE_ENABLED = env.bool("VERIFIED_TOKEN_CACHE_ENABLED", default=True)
+VERIFIED_TOKEN_CACHE_MAX_SIZE = 10000
+
+# Requests allowed to the signin and reset password endpoints per client IP
+# and per email in the payload, as "<requests>/<period>". Each process refuses
+# what its own token buckets already exceed, the rest is counted in a sliding
+# window shared through the cache so the limits hold across workers; with a
+# per-process cache, each limit is multiplied by the number of processes. The
+# client IP is read as REST_FRAMEWORK["NUM_PROXIES"] says.
+AUTH_THROTTLE_ENABLED = env.bool("AUTH_THROTTLE_ENABLED", default=True)
+AUTH_THROTTLE_RATES = {
+    "signin": {"ip": "30/min", "email": "10/min"},
+    "reset_password_request_code": {"ip": "20/hour", "email": "5/hour"},
+    "reset_password_validate_code": {"ip": "30/hour", "email": "10/hour"},
+    "reset_password": {"ip": "30/hour"},
+}
+AUTH_THROTTLE_CACHE_ALIAS = AUTH_CACHE_ALIAS
+AUTH_THROTTLE_LOCAL_MAX_SIZE = 10000
+
+# Admin changelists of tables with at least this many rows show PostgreSQL's
+# estimate of the row count instead of running a COUNT(*)
+ADMIN_ESTIMATED_COUNT_THRESHOLD = 100000
+# Page the user and code changelists by key, with next page links only,
+# instead of by page number
+ADMIN_KEYSET_PAGINATION = env.bool("ADMIN_KEYSET_PAGINATION", default=False)
+
+# Rows the export_users command and endpoint fetch at a time, through a
+# server-side cursor on PostgreSQL
+EXPORT_CHUNK_SIZE = 2000
+
 # AWS
 
 AWS_ACCESS_KEY = env.str("AWS_ACCESS_KEY", default="")
 AWS_SECRET_KEY = env.str("AWS_SECRET_KEY", default="")
 AWS_REGION = env.str("AWS_REGION", default="")
+# Overrides the region's SNS endpoint, e.g. to send SMS to a local stand-in
+AWS_SNS_ENDPOINT_URL = env.str("AWS_SNS_ENDPOINT_URL", default=None)
+# Kept-alive connections of each process' SNS client
+AWS_SNS_MAX_POOL_CONNECTIONS = env.int("AWS_SNS_MAX_POOL_CONNECTIONS", default=10)
 
 # Messenger
 
 DEFAULT_MESSENGER = "EMAIL"
+# Dotted path of the messenger class of each service type. They're imported
+# on first use, so new backends are registered here without loading the SDKs
+# of the ones that aren't used.
+MESSENGERS = {
+    "EMAIL": "api.core.messenger.email.Email",
+    "SMS": "api.core.messenger.sms.SMS",
+}
+# Store outgoing messages in the outbox, in the transaction of the data they're
+# about, for the `dispatch_outbox` worker to send them outside of the request
+OUTBOX_ENABLED = env.bool("OUTBOX_ENABLED", default=False)
+# Messages each dispatcher claims at a time
+OUTBOX_BATCH_SIZE = 100
+# Claimed messages are due again if their dispatcher didn't finish by then
+OUTBOX_CLAIM_TIMEOUT = timedelta(minutes=5)
+# Failed messages are retried with an exponential backoff from the delay,
+# until they were tried the max attempts. Message bodies are blanked once
+# they're sent or failed.
+OUTBOX_MAX_ATTEMPTS = 5
+OUTBOX_RETRY_DELAY = timedelta(seconds=30)
+OUTBOX_MAX_RETRY_DELAY = timedelta(hours=1)
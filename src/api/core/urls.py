@@ -4,6 +4,7 @@ from django.urls import include, path
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
 
 from api.authentication import urls as auth_urls
+from api.core import views
 
 urlpatterns = [
     path("admin/", admin.site.urls),
@@ -12,6 +13,7 @@ urlpatterns = [
     path("docs/", SpectacularSwaggerView.as_view(url_name="schema"), name="swagger-ui"),
     path("docs/schema/", SpectacularAPIView.as_view(), name="schema"),
     path("auth/", include(auth_urls)),
+    path("metrics/", views.metrics, name="metrics"),
 ]
 
 if settings.ENVIRONMENT == "development":
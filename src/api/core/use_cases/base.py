@@ -1,9 +1,19 @@
 from abc import ABC, abstractmethod
 from typing import Any
 
+from asgiref.sync import sync_to_async
+
 
 class BaseUseCase(ABC):
     @abstractmethod
     def execute(self, *args, **kwargs) -> Any:
         """Execute the use case"""
         pass
+
+    async def aexecute(self, *args, **kwargs) -> Any:
+        """
+        Execute the use case from async code. Django 4.0 has no async ORM, so
+        by default `execute` runs in Django's sync thread, use cases override it
+        to await their blocking work elsewhere.
+        """
+        return await sync_to_async(self.execute)(*args, **kwargs)
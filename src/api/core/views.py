@@ -1,5 +1,20 @@
 from django.views.decorators.csrf import csrf_exempt
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import AllowAny
+from rest_framework.permissions import AllowAny, IsAdminUser
+from rest_framework.request import Request
 from rest_framework.response import Response
+
+from api.core.helpers.metrics import collect
+
+
+@extend_schema(
+    responses={status.HTTP_200_OK: OpenApiTypes.OBJECT}, summary="Worker metrics"
+)
+@api_view(("GET",))
+@permission_classes((IsAdminUser,))
+def metrics(request: Request) -> Response:
+    """Return the process-local metrics of the worker handling the request"""
+    return Response(collect(), status=status.HTTP_200_OK)
@@ -1 +1,2 @@
 from .auth import UserAdmin
+from .core import OutboundMessageAdmin
@@ -3,9 +3,12 @@ from django.contrib.auth.admin import UserAdmin as DjangoUserAdmin
 
 from api.authentication.forms import UserChangeForm, UserCreationForm
 from api.authentication.models import Code, User
+from api.authentication.use_cases import SignoutAllUseCase
 
+from .pagination import ScalableAdminMixin
 
-class UserAdmin(DjangoUserAdmin):
+
+class UserAdmin(ScalableAdminMixin, DjangoUserAdmin):
     form = UserChangeForm
     add_form = UserCreationForm
 
@@ -22,20 +25,38 @@ class UserAdmin(DjangoUserAdmin):
         (None, {"fields": ("email", "password")}),
         ("Personal info", {"fields": ("full_name",)}),
         ("Permissions", {"fields": ("is_active", "is_staff", "is_superuser")}),
-        ("Meta", {"fields": ("date_joined",)}),
+        ("Meta", {"fields": ("date_joined", "tokens_valid_after")}),
     )
     add_fieldsets = (
         (None, {"classes": ("wide",), "fields": ("email", "password1", "password2")}),
     )
-    readonly_fields = ("date_joined",)
+    readonly_fields = ("date_joined", "tokens_valid_after")
+    # Backed by trigram indexes on PostgreSQL
     search_fields = ("email", "full_name")
     ordering = ("email",)
+    keyset_field = "email"
     filter_horizontal = ()
+    actions = ("sign_out_everywhere", "deactivate_and_sign_out_everywhere")
+
+    @admin.action(description="Sign out selected users everywhere")
+    def sign_out_everywhere(self, request, queryset):
+        SignoutAllUseCase().execute(user_ids=queryset.values_list("pk", flat=True))
+
+    @admin.action(description="Deactivate and sign out selected users everywhere")
+    def deactivate_and_sign_out_everywhere(self, request, queryset):
+        SignoutAllUseCase().execute(
+            user_ids=queryset.values_list("pk", flat=True), deactivate=True
+        )
 
 
 admin.site.register(User, UserAdmin)
 
 
 @admin.register(Code)
-class CodeAdmin(admin.ModelAdmin):
-    pass
+class CodeAdmin(ScalableAdminMixin, admin.ModelAdmin):
+    list_display = ("__str__", "type", "was_used", "created")
+    list_filter = ("type", "was_used")
+    # The rows are listed by their user's email
+    list_select_related = ("user",)
+    raw_id_fields = ("user",)
+    readonly_fields = ("created", "modified")
@@ -0,0 +1,21 @@
+from django.contrib import admin
+
+from api.core.models import OutboundMessage
+
+
+@admin.register(OutboundMessage)
+class OutboundMessageAdmin(admin.ModelAdmin):
+    list_display = (
+        "messenger",
+        "recipient",
+        "subject",
+        "status",
+        "attempts",
+        "next_attempt_at",
+        "sent_at",
+    )
+    list_filter = ("status", "messenger")
+    search_fields = ("recipient",)
+    readonly_fields = ("created", "modified", "sent_at", "last_error")
+    # Bodies hold secrets such as reset password codes until they're sent
+    exclude = ("body",)
@@ -0,0 +1,118 @@
+from typing import List, Optional
+
+from django.conf import settings
+from django.contrib.admin.views.main import ChangeList
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
+
+# Query string parameter holding the key of the last row of the previous page
+AFTER_VAR = "after"
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Counts an unfiltered changelist with PostgreSQL's row estimate of the table,
+    kept up to date by autovacuum, instead of a COUNT(*) that scans it. Small
+    tables and filtered changelists are still counted exactly.
+    """
+
+    def _get_estimate(self) -> Optional[int]:
+        queryset = self.object_list
+        if not isinstance(queryset, QuerySet) or queryset.query.where:
+            return None
+        connection = connections[queryset.db]
+        if connection.vendor != "postgresql":
+            return None
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples FROM pg_class WHERE oid = %s::regclass",
+                (connection.ops.quote_name(queryset.model._meta.db_table),),
+            )
+            row = cursor.fetchone()
+        # It's negative, or 0 before PostgreSQL 14, until the table is analyzed
+        return int(row[0]) if row and row[0] > 0 else None
+
+    @cached_property
+    def count(self) -> int:
+        estimate = self._get_estimate()
+        if (
+            estimate is not None
+            and estimate >= settings.ADMIN_ESTIMATED_COUNT_THRESHOLD
+        ):
+            return estimate
+        return super().count
+
+
+class KeysetChangeList(ChangeList):
+    """
+    Pages through the rows by the model admin's `keyset_field`, starting after
+    the key given in the query string, so a page is an index range scan with
+    neither a COUNT(*) nor an OFFSET. Rows can't be sorted by other columns and
+    only links to the first and next pages are shown.
+    """
+
+    paginated_by_key = True
+
+    def get_filters_params(self, params: dict = None) -> dict:
+        lookup_params = super().get_filters_params(params)
+        lookup_params.pop(AFTER_VAR, None)
+        return lookup_params
+
+    def get_ordering(self, request, queryset: QuerySet) -> List[str]:
+        return [self.model_admin.keyset_field]
+
+    def get_results(self, request) -> None:
+        field = self.model_admin.keyset_field
+        name = field.lstrip("-")
+        queryset = self.queryset
+        after = request.GET.get(AFTER_VAR)
+        if after:
+            lookup = "lt" if field.startswith("-") else "gt"
+            queryset = queryset.filter(**{f"{name}__{lookup}": after})
+
+        # One more row than shown tells if there's a next page
+        rows = list(queryset[: self.list_per_page + 1])
+        self.result_list = rows[: self.list_per_page]
+        self.next_page_url = (
+            self.get_query_string({AFTER_VAR: getattr(self.result_list[-1], name)})
+            if len(rows) > self.list_per_page
+            else None
+        )
+        self.first_page_url = (
+            self.get_query_string(remove=[AFTER_VAR]) if after else None
+        )
+        self.result_count = len(self.result_list)
+        self.show_full_result_count = False
+        self.show_admin_actions = True
+        self.full_result_count = None
+        self.can_show_all = False
+        self.multi_page = False
+        self.paginator = self.model_admin.get_paginator(
+            request, self.queryset, self.list_per_page
+        )
+
+
+class ScalableAdminMixin:
+    """
+    Changelists for large tables: counted with `EstimatedCountPaginator`,
+    without a second COUNT(*) of the unfiltered table, and paginated by
+    `keyset_field` instead when `ADMIN_KEYSET_PAGINATION` is on
+    """
+
+    # A unique field, "-" for descending
+    keyset_field = "-pk"
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    change_list_template = "dashboard/change_list.html"
+
+    def get_changelist(self, request, **kwargs):
+        if settings.ADMIN_KEYSET_PAGINATION:
+            return KeysetChangeList
+        return super().get_changelist(request, **kwargs)
+
+    def get_sortable_by(self, request):
+        if settings.ADMIN_KEYSET_PAGINATION:
+            return ()
+        return super().get_sortable_by(request)